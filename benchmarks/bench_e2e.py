@@ -0,0 +1,272 @@
+"""
+End-to-end benchmarks: the real cogs against the offline Discord stand-in
+(benchmarks/fake_discord.py) — no bot token or guild needed.
+
+  burst    N concurrent /create-new-war calls until every war is on the billboard
+  sync     cold, warm-restart and reconcile passes of a billboard showing N wars
+  uploads  N concurrent /submit_pen uploads of SIZE MB through the penalty queue
+
+Each scenario reports throughput, p50/p99 latency, Discord calls by route,
+429s hit, event loop lag and peak RSS. Rate-limit periods are multiplied by --time-scale so
+a 10k-war billboard finishes in seconds; use 1.0 for Discord's real pacing.
+Peak RSS is per process, so run one scenario at a time to compare it.
+Needs the bot's dependencies installed (interactions.py etc.).
+
+    python -m benchmarks.bench_e2e [burst|sync|uploads|all] [--wars N] [--uploads N] [--size MB]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import contextlib
+from typing import Dict, List
+
+from benchmarks.fake_discord import (
+    FakeAttachment,
+    FakeBot,
+    FakeCdnSession,
+    FakeContext,
+    FakeDiscord,
+    FakeGuild,
+    FakeHttpClient,
+    snowflake,
+)
+from classes.billboard_outbox import DEFAULT_BUCKET_PERIOD
+from classes.cache_policy import rss_bytes
+from classes.lineup_index import LineupIndex
+from classes.loop_monitor import LoopLagMonitor
+from classes.sharding import ShardPlan
+from classes.war import War
+from classes.war_events import WarEventBus
+from classes.war_store import WarStore
+from classes.war_time import to_timestamp, utc_now
+from cogs.create_new_war import CreateNewWar
+from cogs.post_war_billboard import Billboard, PostWarBillboard
+from cogs.submit_pen import PenSubmit
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:
+        return rss_bytes() / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def report(name: str, items: int, seconds: float, latencies: List[float], harness: "Harness", unit: str = "ops"):
+    discord = harness.discord
+    print(f"\n{name}")
+    print(f"  {items} {unit} in {seconds:.2f}s ({items / seconds if seconds else 0:.1f} {unit}/s)")
+    if latencies:
+        print(f"  latency p50 {percentile(latencies, 50) * 1000:.1f} ms, p99 {percentile(latencies, 99) * 1000:.1f} ms")
+    routes = ", ".join(f"{route}={count}" for route, count in sorted(discord.calls.items()))
+    print(f"  discord calls {discord.total_calls()} ({routes or 'none'}), 429s {discord.rate_limited}")
+    lag = harness.loop_monitor.stats()
+    print(f"  event loop lag p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms")
+    print(f"  peak RSS {peak_rss_mb():.1f} MB")
+
+
+def extension(cls, *args):
+    """Builds a cog without registering its commands on a real client."""
+    cog = object.__new__(cls)
+    cls.__init__(cog, *args)
+    return cog
+
+
+@contextlib.contextmanager
+def quiet():
+    """The cogs log every war; keep the report readable."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class Harness:
+    def __init__(self, workdir: str, time_scale: float, latency: float, layout: str):
+        self.workdir = workdir
+        self.time_scale = time_scale
+        self.layout = layout
+        self.discord = FakeDiscord(latency=latency, period=DEFAULT_BUCKET_PERIOD * time_scale)
+        self.bot = FakeBot(self.discord)
+        self.guild = FakeGuild(snowflake(), "Benchmark Guild")
+        self.events = WarEventBus()
+        self.store = WarStore(os.path.join(workdir, "wars.db"), self.events)
+        self.loop_monitor = LoopLagMonitor(interval=0.005, warn_after=60)
+
+    def reset_stats(self):
+        self.discord.reset_stats()
+        self.loop_monitor.reset()
+
+    def billboard(self, channel_id: int) -> PostWarBillboard:
+        cog = extension(PostWarBillboard, self.bot, self.store, self.events, ShardPlan())
+        cog.outbox.bucket_period = DEFAULT_BUCKET_PERIOD * self.time_scale
+        cog.digest = self.layout == "digest"
+        cog.billboards[channel_id] = Billboard(self.guild.id, "RT", channel_id)
+        return cog
+
+    def context(self, name: str) -> FakeContext:
+        return FakeContext(self.discord.add_user(name), self.guild)
+
+    async def retire(self, cog: PostWarBillboard):
+        if cog.event_consumer is not None:
+            cog.event_consumer.cancel()
+        self.events.unsubscribe(cog.events)
+        await cog.outbox.close()
+
+    async def close(self, *cogs):
+        for cog in cogs:
+            await self.retire(cog)
+        await self.loop_monitor.stop()
+        await self.store.close()
+
+
+# ---------------------------
+# Scenarios
+# ---------------------------
+async def bench_burst(harness: Harness, wars: int):
+    channel = harness.discord.add_channel("rt-wars")
+    lineups = LineupIndex()
+    creator = extension(CreateNewWar, harness.bot, harness.store, lineups)
+    billboard = harness.billboard(channel.id)
+    board = billboard.billboards[channel.id]
+
+    with quiet():
+        await billboard.initial_sync(board, await harness.store.changes_since("rt", None))
+    billboard.ready = True
+    billboard.event_consumer = asyncio.create_task(billboard.consume_events())
+    harness.reset_stats()
+
+    create = CreateNewWar.create_new_war.callback
+    latencies = []
+
+    async def one(n: int):
+        ctx = harness.context(f"player{n}")
+        started = time.perf_counter()
+        await create(creator, ctx, track_type="RT", team_name=f"Team {n}")
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with quiet():
+        await asyncio.gather(*(one(n) for n in range(wars)))
+        commands_done = time.perf_counter() - started
+        while len(board.wars) < wars:
+            await asyncio.sleep(0.01)
+        await billboard.outbox.join(channel.id)
+    elapsed = time.perf_counter() - started
+
+    report(f"burst: {wars} × /create-new-war", wars, commands_done, latencies, harness, "commands")
+    print(f"  all {wars} wars live on the billboard after {elapsed:.2f}s ({len(channel.messages)} messages)")
+    await harness.close(billboard)
+
+
+async def bench_sync(harness: Harness, wars: int):
+    channel = harness.discord.add_channel("rt-wars")
+    now = utc_now()
+    for n in range(wars):
+        await harness.store.insert(War("RT", f"Team {n}", start_time=to_timestamp(now), search_label="ASAP"))
+
+    async def initial(label: str) -> PostWarBillboard:
+        cog = harness.billboard(channel.id)
+        board = cog.billboards[channel.id]
+        harness.reset_stats()
+        started = time.perf_counter()
+        with quiet():
+            await cog.initial_sync(board, await harness.store.changes_since("rt", None))
+        cog.ready = True
+        calls = harness.discord.latencies.get("send_message", []) + harness.discord.latencies.get("edit_message", [])
+        report(f"sync: {label} ({wars} wars, {harness.layout} layout)", wars, time.perf_counter() - started,
+               calls, harness, "wars")
+        return cog
+
+    cold = await initial("cold start")
+    await harness.retire(cold)
+    warm = await initial("warm restart")
+
+    # Touch 1% of the wars, then one reconcile pass picks them up
+    changed = max(1, wars // 100)
+    def rename(war) -> bool:
+        war.team_name += "*"
+        return True
+
+    for war_id in list(warm.billboards[channel.id].wars)[:changed]:
+        await harness.store.modify(war_id, rename)
+
+    harness.reset_stats()
+    started = time.perf_counter()
+    with quiet():
+        await warm.sync_type("rt")
+    report(f"sync: reconcile pass ({changed} of {wars} wars changed)", changed, time.perf_counter() - started,
+           harness.discord.latencies.get("edit_message", []), harness, "wars")
+    await harness.close(warm)
+
+
+async def bench_uploads(harness: Harness, uploads: int, size_mb: float):
+    channel = harness.discord.add_channel("scrim-pens")
+    os.environ["SCRIM_PEN_CHANNEL"] = str(channel.id)
+    os.environ.setdefault("REF_ID", str(snowflake()))
+    os.environ["PEN_QUEUE_DIR"] = os.path.join(harness.workdir, "pen-queue")
+
+    cdn = FakeCdnSession()
+    cog = extension(PenSubmit, harness.bot, FakeHttpClient(cdn))
+    await cog.queue.start()
+    harness.reset_stats()
+
+    size = int(size_mb * 1024 * 1024)
+    submit = PenSubmit.submitpen.callback
+    contexts: Dict[FakeContext, float] = {}
+
+    async def one(n: int):
+        ctx = harness.context(f"submitter{n}")
+        filename = f"pen{n}.mp4"
+        contexts[ctx] = time.perf_counter()
+        await submit(cog, ctx, "scrim", f"Team A v Team B - pen {n}", FakeAttachment(filename, size, cdn.add_file(filename, size)))
+
+    started = time.perf_counter()
+    with quiet():
+        await asyncio.gather(*(one(n) for n in range(uploads)))
+        while sum(cog.queue.counters[k] for k in ("delivered", "failed", "duplicates")) < uploads:
+            await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    latencies = [ctx.replied_at - queued for ctx, queued in contexts.items()]
+    report(f"uploads: {uploads} × {size_mb:g} MB /submit_pen ({cog.queue.workers} workers)", uploads, elapsed,
+           latencies, harness, "uploads")
+    print(f"  {channel.uploaded_bytes / (1024 * 1024):.0f} MB delivered, queue {cog.queue.stats()}")
+    await cog.queue.close()
+    await harness.close()
+
+
+async def main(args):
+    scenarios = ("burst", "sync", "uploads") if args.scenario == "all" else (args.scenario,)
+    print(f"fake Discord: {args.latency * 1000:.0f} ms per call, rate-limit periods × {args.time_scale}")
+    for scenario in scenarios:
+        with tempfile.TemporaryDirectory(prefix="warbot-bench-") as workdir:
+            harness = Harness(workdir, args.time_scale, args.latency, args.layout)
+            harness.loop_monitor.start()
+            if scenario == "burst":
+                await bench_burst(harness, args.wars or 1000)
+            elif scenario == "sync":
+                await bench_sync(harness, args.wars or 10000)
+            else:
+                await bench_uploads(harness, args.uploads, args.size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scenario", nargs="?", default="all", choices=("burst", "sync", "uploads", "all"))
+    parser.add_argument("--wars", type=int, default=None, help="wars per scenario (burst 1000, sync 10000)")
+    parser.add_argument("--uploads", type=int, default=20)
+    parser.add_argument("--size", type=float, default=25, help="upload size in MB")
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds per fake Discord call")
+    parser.add_argument("--time-scale", type=float, default=0.001)
+    parser.add_argument("--layout", choices=("single", "digest"), default="single")
+    asyncio.run(main(parser.parse_args()))
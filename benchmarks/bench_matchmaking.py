@@ -0,0 +1,77 @@
+"""
+Synthetic matchmaking benchmark: index build and best-match latency
+against a linear scan of the open-war list, at 1k–50k open wars.
+
+    python -m benchmarks.bench_matchmaking [queries]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from classes.matchmaking import MatchmakingIndex, start_bucket
+from classes.player import Player
+from classes.war import War
+from classes.war_time import to_timestamp
+
+BASE = datetime(2025, 12, 7, tzinfo=timezone.utc)
+BASE_BUCKET = start_bucket(to_timestamp(BASE))
+
+SIZES = (1_000, 5_000, 10_000, 50_000)
+
+
+def make_wars(count: int, rng: random.Random):
+    wars = []
+    for i in range(count):
+        wars.append(War(
+            war_type=rng.choice(("RT", "CT")),
+            team_name=f"Team {i}",
+            start_time=to_timestamp(BASE + timedelta(hours=rng.randrange(24))),
+            last_updated="2025-12-07T17:39:39",
+            lineup=[Player(f"p{i}-{n}", "Runner") for n in range(rng.randint(1, 6))],
+        ))
+    return wars
+
+
+def linear_best_match(wars, war_type, hour, size):
+    best, best_score = None, None
+    for war in wars:
+        if war.war_type != war_type:
+            continue
+        distance = abs(start_bucket(war.start_time) - hour)
+        if distance > 2:
+            continue
+        score = (distance, abs(len(war.lineup) - size))
+        if best_score is None or score < best_score:
+            best, best_score = war.war_id, score
+    return best
+
+
+def main(queries: int = 1_000):
+    rng = random.Random(42)
+    print(f"{'wars':>8} {'build ms':>10} {'index µs/q':>12} {'scan µs/q':>12}")
+    for count in SIZES:
+        wars = make_wars(count, rng)
+        probes = [(rng.choice(("RT", "CT")), BASE_BUCKET + rng.randrange(24), rng.randint(1, 6)) for _ in range(queries)]
+
+        started = time.perf_counter()
+        index = MatchmakingIndex()
+        for war in wars:
+            index.add(war)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for probe in probes:
+            index.best_match(*probe)
+        index_us = (time.perf_counter() - started) / queries * 1_000_000
+
+        scan_queries = max(1, queries // 50)
+        started = time.perf_counter()
+        for probe in probes[:scan_queries]:
+            linear_best_match(wars, *probe)
+        scan_us = (time.perf_counter() - started) / scan_queries * 1_000_000
+
+        print(f"{count:>8} {build_ms:>10.1f} {index_us:>12.2f} {scan_us:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
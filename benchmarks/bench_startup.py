@@ -0,0 +1,31 @@
+"""
+Cold-start benchmark for secret resolution.
+
+Runs fully offline against the stub backend and checks that the Google SDK
+is never imported unless the Secret Manager backend is actually used.
+
+    python -m benchmarks.bench_startup [iterations]
+"""
+import sys
+import time
+
+started = time.perf_counter()
+from classes.secret_provider import SecretProvider, StubSecretBackend  # noqa: E402
+import_ms = (time.perf_counter() - started) * 1000
+
+
+def main(iterations: int = 1000):
+    provider = SecretProvider([StubSecretBackend()])
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        provider.get("discord_key_local")
+    per_lookup_us = (time.perf_counter() - started) / iterations * 1_000_000
+
+    print(f"import classes.secret_provider: {import_ms:.2f} ms")
+    print(f"stub token lookup:              {per_lookup_us:.2f} µs ({iterations} iterations)")
+    print(f"google.cloud imported:          {'google.cloud.secretmanager' in sys.modules}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,103 @@
+"""
+Synthetic /list-wars benchmark: first-page and deep-page latency of the
+listing index against filtering and sorting the open-war list, at
+1k–50k open wars.
+
+    python -m benchmarks.bench_war_listing [queries]
+"""
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from classes.matchmaking import MAX_LINEUP
+from classes.player import Player
+from classes.war import War
+from classes.war_listing import WarListIndex
+from classes.war_time import to_timestamp
+
+BASE = datetime(2025, 12, 7, tzinfo=timezone.utc)
+BASE_TS = int(BASE.timestamp())
+
+SIZES = (1_000, 5_000, 10_000, 50_000)
+PAGE = 10
+
+
+def make_wars(count: int, rng: random.Random):
+    wars = []
+    for i in range(count):
+        wars.append(War(
+            war_type=rng.choice(("RT", "CT")),
+            team_name=f"{rng.choice(('Alpha', 'Bravo', 'Charlie', 'Delta'))} {i}",
+            start_time=to_timestamp(BASE + timedelta(minutes=rng.randrange(24 * 60))),
+            last_updated="2025-12-07T17:39:39",
+            lineup=[Player(f"p{i}-{n}", "Runner") for n in range(rng.randint(1, 6))],
+        ))
+    return wars
+
+
+def make_query(rng: random.Random) -> dict:
+    start_after = BASE_TS + rng.randrange(20) * 3600
+    return {
+        "war_type": rng.choice(("RT", "CT", None)),
+        "start_after": start_after,
+        "start_before": start_after + 4 * 3600,
+        "team_prefix": rng.choice((None, None, "bravo 1")),
+        "min_open_slots": rng.choice((0, 2, 4)),
+    }
+
+
+def scan_page(wars, war_type=None, start_after=None, start_before=None, team_prefix=None, min_open_slots=0):
+    matches = []
+    for war in wars:
+        start = int(war.start_datetime().timestamp())
+        if war_type and war.war_type != war_type:
+            continue
+        if not start_after <= start < start_before:
+            continue
+        if team_prefix and not war.team_name.lower().startswith(team_prefix):
+            continue
+        if MAX_LINEUP - len(war.lineup) < min_open_slots:
+            continue
+        matches.append((start, war.war_id))
+    return sorted(matches)[:PAGE]
+
+
+def main(queries: int = 1_000):
+    rng = random.Random(42)
+    print(f"{'wars':>8} {'build ms':>10} {'page 1 µs':>10} {'page 5 µs':>10} {'scan µs':>10}")
+    for count in SIZES:
+        wars = make_wars(count, rng)
+        probes = [make_query(rng) for _ in range(queries)]
+
+        started = time.perf_counter()
+        index = WarListIndex()
+        for war in wars:
+            index.add(war)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for probe in probes:
+            index.query(**probe, limit=PAGE)
+        first_us = (time.perf_counter() - started) / queries * 1_000_000
+
+        started = time.perf_counter()
+        for probe in probes:
+            cursor = None
+            for _ in range(5):
+                page, cursor = index.query(**probe, after=cursor, limit=PAGE)
+                if cursor is None:
+                    break
+        deep_us = (time.perf_counter() - started) / queries * 1_000_000
+
+        scan_queries = max(1, queries // 50)
+        started = time.perf_counter()
+        for probe in probes[:scan_queries]:
+            expected = scan_page(wars, **probe)
+            assert [war.cursor for war in index.query(**probe, limit=PAGE)[0]] == expected
+        scan_us = (time.perf_counter() - started) / scan_queries * 1_000_000
+
+        print(f"{count:>8} {build_ms:>10.1f} {first_us:>10.2f} {deep_us:>10.2f} {scan_us:>10.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
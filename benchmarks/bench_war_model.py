@@ -0,0 +1,52 @@
+"""
+War model microbenchmark: per-war encode/decode cost and per-object memory.
+
+    python -m benchmarks.bench_war_model [wars]
+"""
+import sys
+import time
+import tracemalloc
+from classes.player import Player
+from classes.war import War
+from classes.war_codec import JSON_BACKEND, decode_war, encode_war
+
+
+def make_wars(count: int):
+    return [
+        War(
+            war_type="RT" if i % 2 else "CT",
+            team_name=f"Team {i}",
+            start_time="2025-12-07T19:00:00",
+            last_updated="2025-12-07T17:39:39.098689",
+            lineup=[Player(f"player{i}-{p}", "Runner" if p else "Bagger") for p in range(6)],
+        )
+        for i in range(count)
+    ]
+
+
+def main(count: int = 10_000):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    wars = make_wars(count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    encoded = [encode_war(w) for w in wars]
+    encode_us = (time.perf_counter() - started) / count * 1_000_000
+
+    started = time.perf_counter()
+    for raw in encoded:
+        decode_war(raw)
+    decode_us = (time.perf_counter() - started) / count * 1_000_000
+
+    print(f"JSON backend:        {JSON_BACKEND}")
+    print(f"wars:                {count} (6 players each)")
+    print(f"encode per war:      {encode_us:.2f} µs")
+    print(f"decode per war:      {decode_us:.2f} µs")
+    print(f"memory per war:      {(after - before) / count:.0f} bytes (incl. lineup)")
+    print(f"encoded size:        {sum(len(e) for e in encoded) / count:.0f} bytes avg")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
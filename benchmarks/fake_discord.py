@@ -0,0 +1,296 @@
+"""
+Offline stand-in for the parts of Discord the cogs touch.
+
+FakeBot answers fetch_channel / fetch_user like interactions.Client;
+FakeChannel / FakeMessage implement the REST calls the billboard and
+penalty cogs make; FakeCdnSession serves attachment downloads in place of
+the shared aiohttp session. Every call costs ``latency`` seconds and goes
+through a per-channel bucket (``limit`` calls per ``period``): once it's
+empty the call is counted as a 429 and waits for the reset, the same way
+interactions.py retries rate limits internally.
+"""
+import os
+import time
+import asyncio
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+
+DISCORD_EPOCH_MS = 1420070400000
+
+# Minimal MP4 header (ftyp box) so uploads pass the media sniffing
+MP4_HEADER = b"\x00\x00\x00\x18ftypmp42\x00\x00\x00\x00mp42isom"
+
+_sequence = 0
+
+
+def snowflake() -> int:
+    global _sequence
+    _sequence = (_sequence + 1) & 0x3FFFFF
+    return ((int(time.time() * 1000) - DISCORD_EPOCH_MS) << 22) | _sequence
+
+
+class FakeDiscord:
+    def __init__(self, latency: float = 0.005, limit: int = 5, period: float = 5.0):
+        self.latency = latency
+        self.limit = limit
+        self.period = period
+        self.calls: Counter = Counter()
+        self.latencies: Dict[str, list] = {}  # route -> seconds per call, including 429 waits
+        self.rate_limited = 0
+        self.channels: Dict[int, "FakeChannel"] = {}
+        self.users: Dict[int, "FakeUser"] = {}
+        self.bot_user: Optional["FakeUser"] = None  # author of everything sent through a channel
+        self._buckets: Dict[int, list] = {}  # channel_id -> [remaining, reset_at]
+
+    async def call(self, route: str, channel_id: Optional[int] = None):
+        self.calls[route] += 1
+        started = time.perf_counter()
+        if channel_id is not None:
+            bucket = self._buckets.setdefault(channel_id, [self.limit, 0.0])
+            limited = False
+            while True:
+                now = time.monotonic()
+                if now >= bucket[1]:
+                    bucket[0], bucket[1] = self.limit, now + self.period
+                if bucket[0] > 0:
+                    bucket[0] -= 1
+                    break
+                if not limited:
+                    limited = True
+                    self.rate_limited += 1
+                await asyncio.sleep(bucket[1] - now)
+        await asyncio.sleep(self.latency)
+        self.latencies.setdefault(route, []).append(time.perf_counter() - started)
+
+    def add_channel(self, name: str, channel_id: Optional[int] = None) -> "FakeChannel":
+        channel = FakeChannel(self, channel_id or snowflake(), name)
+        self.channels[channel.id] = channel
+        return channel
+
+    def add_user(self, name: str, user_id: Optional[int] = None) -> "FakeUser":
+        user = FakeUser(self, user_id or snowflake(), name)
+        self.users[user.id] = user
+        return user
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_stats(self):
+        self.calls.clear()
+        self.latencies.clear()
+        self.rate_limited = 0
+
+
+class FakeUser:
+    def __init__(self, discord: FakeDiscord, user_id: int, name: str):
+        self.discord = discord
+        self.id = user_id
+        self.username = name
+        self.display_name = name
+        self.discriminator = "0"
+        self.dms = []
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    async def send(self, content: str = None, **kwargs):
+        await self.discord.call("dm")
+        self.dms.append(content)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int, name: str):
+        self.id = guild_id
+        self.name = name
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", payload: dict):
+        self.channel = channel
+        self.id = snowflake()
+        self.payload = payload
+        self.author = channel.discord.bot_user
+
+    async def edit(self, **payload):
+        await self.channel.discord.call("edit_message", self.channel.id)
+        self.payload = payload
+
+    async def delete(self):
+        await self.channel.delete_message(self.id)
+
+
+class FakeChannel:
+    def __init__(self, discord: FakeDiscord, channel_id: int, name: str):
+        self.discord = discord
+        self.id = channel_id
+        self.name = name
+        self.messages: "OrderedDict[int, FakeMessage]" = OrderedDict()
+        self.uploaded_bytes = 0
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    async def send(self, content: str = None, embeds=None, components=None, files=None, **kwargs):
+        await self.discord.call("send_message", self.id)
+        for file in files or ():
+            # interactions.File keeps the path (or file object) it was given
+            source = getattr(file, "file", file)
+            self.uploaded_bytes += os.path.getsize(source) if isinstance(source, str) else 0
+        message = FakeMessage(self, {"content": content, "embeds": embeds, "components": components})
+        self.messages[message.id] = message
+        return message
+
+    async def fetch_message(self, message_id: int) -> Optional[FakeMessage]:
+        await self.discord.call("get_message", self.id)
+        return self.messages.get(int(message_id))
+
+    async def fetch_messages(self, limit: int = 50):
+        await self.discord.call("get_messages", self.id)
+        return list(reversed(self.messages.values()))[:limit]
+
+    async def delete_message(self, message_id: int):
+        await self.discord.call("delete_message", self.id)
+        self.messages.pop(int(message_id), None)
+
+    async def delete_messages(self, messages):
+        await self.discord.call("bulk_delete", self.id)
+        for message in messages:
+            self.messages.pop(int(getattr(message, "id", message)), None)
+
+
+class FakeBucket:
+    """The fields of interactions' BucketLock that DiscordTransport reads."""
+
+    def __init__(self, bucket_hash: Optional[str], limit: int, remaining: int, delta: float):
+        self.bucket_hash = bucket_hash
+        self.limit = limit
+        self.remaining = remaining
+        self.delta = delta
+
+
+class FakeHttp:
+    """The raw HTTP routes the cogs call directly (interactions.Client.http)."""
+
+    def __init__(self, discord: FakeDiscord):
+        self.discord = discord
+
+    def get_ratelimit(self, route) -> FakeBucket:
+        bucket = self.discord._buckets.get(int(route.channel_id or 0))
+        if bucket is None:
+            return FakeBucket(None, 1, 1, 0.0)
+        return FakeBucket(f"channel-{route.channel_id}", self.discord.limit, bucket[0], max(bucket[1] - time.monotonic(), 0.0))
+
+    async def edit_message(self, payload: dict, channel_id, message_id):
+        await self.discord.call("edit_message", int(channel_id))
+        channel = self.discord.channels.get(int(channel_id))
+        message = channel.messages.get(int(message_id)) if channel else None
+        if message is None:
+            raise LookupError(message_id)  # what DiscordTransport turns NotFound into
+        message.payload = payload
+        return payload
+
+
+class FakeBot:
+    """Just enough of interactions.Client for the cogs' own calls."""
+
+    def __init__(self, discord: FakeDiscord):
+        self.discord = discord
+        self.user = discord.bot_user = discord.add_user("war-bot")
+        self.http = FakeHttp(discord)
+        self.guilds = []
+
+    async def fetch_channel(self, channel_id):
+        await self.discord.call("get_channel")
+        return self.discord.channels.get(int(channel_id)) if channel_id else None
+
+    async def fetch_user(self, user_id):
+        await self.discord.call("get_user")
+        return self.discord.users.get(int(user_id))
+
+
+class FakeContext:
+    """A slash command invocation; records every reply."""
+
+    def __init__(self, author: FakeUser, guild: FakeGuild):
+        self.author = author
+        self.guild = guild
+        self.guild_id = guild.id
+        self.replies = []
+        self.replied_at = None  # perf_counter of the latest reply
+
+    async def defer(self, ephemeral: bool = False):
+        await self.author.discord.call("interaction_defer")
+
+    async def send(self, content: str = None, ephemeral: bool = False, **kwargs):
+        await self.author.discord.call("interaction_reply")
+        self.replies.append(content)
+        self.replied_at = time.perf_counter()
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, size: int, url: str):
+        self.filename = filename
+        self.size = size
+        self.url = url
+
+
+# ---------------------------
+# CDN (stands in for SharedHttpClient)
+# ---------------------------
+class _FakeContent:
+    def __init__(self, size: int, seed: bytes, bytes_per_second: Optional[float]):
+        self.size = size
+        self.seed = seed
+        self.bytes_per_second = bytes_per_second
+
+    async def iter_chunked(self, chunk_size: int):
+        block = (self.seed * (chunk_size // len(self.seed) + 1))[:chunk_size]
+        sent = 0
+        while sent < self.size:
+            chunk = (MP4_HEADER + block)[:chunk_size] if sent == 0 else block
+            chunk = chunk[: self.size - sent]
+            sent += len(chunk)
+            if self.bytes_per_second:
+                await asyncio.sleep(len(chunk) / self.bytes_per_second)
+            else:
+                await asyncio.sleep(0)
+            yield chunk
+
+
+class _FakeResponse:
+    def __init__(self, status: int, content: Optional[_FakeContent]):
+        self.status = status
+        self.content = content
+        self.content_length = content.size if content else 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeCdnSession:
+    def __init__(self, bytes_per_second: Optional[float] = None):
+        self.bytes_per_second = bytes_per_second
+        self.files: Dict[str, tuple] = {}
+        self.requests = 0
+
+    def add_file(self, name: str, size: int) -> str:
+        url = f"https://cdn.example/attachments/{snowflake()}/{name}"
+        self.files[url] = (size, name.encode("utf-8"))  # distinct seed -> distinct content hash
+        return url
+
+    def get(self, url: str) -> _FakeResponse:
+        self.requests += 1
+        if url not in self.files:
+            return _FakeResponse(404, None)
+        size, seed = self.files[url]
+        return _FakeResponse(200, _FakeContent(size, seed, self.bytes_per_second))
+
+
+class FakeHttpClient:
+    def __init__(self, session: FakeCdnSession):
+        self.session = session
@@ -0,0 +1,438 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Handed to on_message as the tag when an op for a key has run out of retries
+FAILED = "failed"
+
+# Discord's documented per-channel message budget: 5 writes every 5 seconds
+DEFAULT_BUCKET_LIMIT = 5
+DEFAULT_BUCKET_PERIOD = 5.0
+
+# Failed sends/edits/deletes (5xx, network errors, timeouts) are retried with
+# exponential backoff before being reported back as FAILED
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_RETRY_BASE = 1.0
+DEFAULT_RETRY_MAX = 30.0
+
+
+class RateLimited(Exception):
+    """Raised by a transport when Discord answers 429."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"rate limited, retry after {retry_after:.2f}s")
+        self.retry_after = retry_after
+
+
+class RateLimitBucket:
+    """
+    Fixed-window budget for one channel.
+
+    Starts from the documented defaults and is corrected from the
+    X-RateLimit-* headers whenever the transport can see them.
+    """
+
+    def __init__(self, limit: int = DEFAULT_BUCKET_LIMIT, period: float = DEFAULT_BUCKET_PERIOD):
+        self.limit = limit
+        self.period = period
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def delay(self, now: float) -> float:
+        """Seconds to wait before the next request may go out."""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.period
+        if self.remaining > 0:
+            return 0.0
+        return self.reset_at - now
+
+    def consume(self):
+        self.remaining -= 1
+
+    def update_from_headers(self, headers: Optional[Dict[str, str]], now: float):
+        if not headers:
+            return
+        try:
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Reset-After" in headers:
+                self.reset_at = now + float(headers["X-RateLimit-Reset-After"])
+        except ValueError:
+            pass
+
+    def rate_limited(self, retry_after: float, now: float):
+        self.remaining = 0
+        self.reset_at = now + retry_after
+
+
+class _Op:
+    __slots__ = ("key", "kind", "payload", "tag", "enqueued_at", "attempts", "retry_at")
+
+    def __init__(self, key: str, kind: str, payload: Optional[Dict[str, Any]], tag: Any, enqueued_at: float):
+        self.key = key
+        self.kind = kind
+        self.payload = payload
+        self.tag = tag
+        self.enqueued_at = enqueued_at
+        self.attempts = 0  # failed dispatches so far (429s don't count)
+        self.retry_at = 0.0  # not dispatched before this (monotonic) time
+
+
+class _ChannelQueue:
+    def __init__(self, channel_id: int, bucket: RateLimitBucket):
+        self.channel_id = channel_id
+        self.bucket = bucket
+        self.pending: "OrderedDict[str, _Op]" = OrderedDict()
+        self.message_ids: Dict[str, int] = {}
+        self.in_flight: Set[str] = set()  # keys currently being dispatched
+        self.wakeup = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.workers: List[asyncio.Task] = []
+
+
+class BillboardOutbox:
+    """
+    Per-channel outbound queue for billboard messages.
+
+    Callers describe the desired state of one message per key (normally a
+    war_id): ``upsert`` with a payload, or ``delete``. Pending operations for
+    the same key are coalesced, so several updates become one edit and an
+    update followed by a delete never reaches Discord. Each channel drains on
+    a small pool of workers (``concurrency``), paced by its rate-limit
+    bucket; ops for the same key are never in flight twice.
+
+    An op that fails for any other reason than a 429 is retried with
+    exponential backoff (``retry_base`` doubling up to ``retry_max``). After
+    ``max_retries`` retries it's dropped and reported to on_message with
+    ``tag=FAILED``, so the caller can forget what it thinks is live and
+    send it again on its next pass.
+    """
+
+    def __init__(
+        self,
+        transport,
+        bucket_limit: int = DEFAULT_BUCKET_LIMIT,
+        bucket_period: float = DEFAULT_BUCKET_PERIOD,
+        on_message: Optional[Callable[[int, str, Optional[int], Any], Any]] = None,
+        concurrency: int = 1,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_base: float = DEFAULT_RETRY_BASE,
+        retry_max: float = DEFAULT_RETRY_MAX,
+    ):
+        self.transport = transport
+        self.concurrency = max(1, concurrency)
+        self.bucket_limit = bucket_limit
+        self.bucket_period = bucket_period
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        # Called as on_message(channel_id, key, message_id, tag) after every send/edit,
+        # with message_id=None, tag=None after a delete, and with tag=FAILED (message_id
+        # is whatever is still tracked for the key) once an op has run out of retries
+        self.on_message = on_message
+        self.channels: Dict[int, _ChannelQueue] = {}
+
+        self.counters = {
+            "sent": 0,
+            "edited": 0,
+            "deleted": 0,
+            "coalesced": 0,
+            "dropped": 0,
+            "rate_limited": 0,
+            "errors": 0,
+            "retried": 0,
+            "failed": 0,
+        }
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.dispatched = 0
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def upsert(self, channel_id: int, key: str, payload: Dict[str, Any], tag: Any = None):
+        """
+        Create the message for ``key`` or edit it if it already exists.
+        ``tag`` is handed back to on_message once the payload is live.
+        """
+        queue = self._queue(channel_id)
+        op = queue.pending.get(key)
+        if op is not None:
+            # Keep the queue position and original wait time, just swap in the newest payload
+            op.kind = UPSERT
+            op.payload = payload
+            op.tag = tag
+            self.counters["coalesced"] += 1
+            return
+        self._enqueue(queue, _Op(key, UPSERT, payload, tag, time.monotonic()))
+
+    def delete(self, channel_id: int, key: str):
+        """Remove the message for ``key``, cancelling any edit still waiting to go out."""
+        queue = self._queue(channel_id)
+        op = queue.pending.get(key)
+        if op is not None:
+            if op.kind == DELETE:
+                return
+            self.counters["dropped"] += 1
+            if key not in queue.message_ids and key not in queue.in_flight:
+                # Never posted: nothing to delete either
+                del queue.pending[key]
+                self._mark_idle(queue)
+                return
+            op.kind = DELETE
+            op.payload = None
+            op.tag = None
+            return
+        if key not in queue.message_ids and key not in queue.in_flight:
+            return
+        self._enqueue(queue, _Op(key, DELETE, None, None, time.monotonic()))
+
+    def message_id(self, channel_id: int, key: str) -> Optional[int]:
+        queue = self.channels.get(channel_id)
+        return queue.message_ids.get(key) if queue else None
+
+    def track(self, channel_id: int, key: str, message_id: int):
+        """Registers an already-posted message so later upserts edit it."""
+        self._queue(channel_id).message_ids[key] = message_id
+
+    def tracked(self, channel_id: int) -> Dict[str, int]:
+        queue = self.channels.get(channel_id)
+        return dict(queue.message_ids) if queue else {}
+
+    async def join(self, channel_id: Optional[int] = None):
+        """Waits until one channel queue (or every queue) has drained."""
+        if channel_id is not None:
+            if channel_id in self.channels:
+                await self.channels[channel_id].idle.wait()
+            return
+        for queue in list(self.channels.values()):
+            await queue.idle.wait()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "queue_depth": {cid: len(q.pending) for cid, q in self.channels.items()},
+            "wait_avg": self.wait_total / self.dispatched if self.dispatched else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+    async def close(self):
+        for queue in self.channels.values():
+            for worker in queue.workers:
+                worker.cancel()
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _queue(self, channel_id: int) -> _ChannelQueue:
+        queue = self.channels.get(channel_id)
+        if queue is None:
+            queue = _ChannelQueue(channel_id, RateLimitBucket(self.bucket_limit, self.bucket_period))
+            self.channels[channel_id] = queue
+        return queue
+
+    def _enqueue(self, queue: _ChannelQueue, op: _Op, front: bool = False):
+        queue.pending[op.key] = op
+        if front:
+            queue.pending.move_to_end(op.key, last=False)
+        queue.idle.clear()
+        queue.wakeup.set()
+        queue.workers = [w for w in queue.workers if not w.done()]
+        while len(queue.workers) < self.concurrency:
+            queue.workers.append(asyncio.create_task(self._drain(queue)))
+
+    def _mark_idle(self, queue: _ChannelQueue):
+        if not queue.pending and not queue.in_flight:
+            queue.idle.set()
+
+    @staticmethod
+    def _next_op(queue: _ChannelQueue, now: float) -> Optional[_Op]:
+        for op in queue.pending.values():
+            if op.key not in queue.in_flight and op.retry_at <= now:
+                return op
+        return None
+
+    @staticmethod
+    def _backoff_wait(queue: _ChannelQueue, now: float) -> Optional[float]:
+        """Seconds until the earliest op still backing off may go out (None if none is)."""
+        waits = [op.retry_at - now for op in queue.pending.values() if op.key not in queue.in_flight]
+        return max(0.0, min(waits)) if waits else None
+
+    async def _drain(self, queue: _ChannelQueue):
+        while True:
+            now = time.monotonic()
+            if self._next_op(queue, now) is None:
+                self._mark_idle(queue)
+                queue.wakeup.clear()
+                try:
+                    await asyncio.wait_for(queue.wakeup.wait(), timeout=self._backoff_wait(queue, now))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Pace on the bucket before choosing the op, so late coalescing still applies
+            delay = queue.bucket.delay(time.monotonic())
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            op = self._next_op(queue, time.monotonic())
+            if op is None:
+                continue
+            del queue.pending[op.key]
+            waited = time.monotonic() - op.enqueued_at
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+            self.dispatched += 1
+
+            queue.bucket.consume()
+            queue.in_flight.add(op.key)
+            try:
+                headers = await self._dispatch(queue, op)
+                queue.bucket.update_from_headers(headers, time.monotonic())
+            except RateLimited as e:
+                self.counters["rate_limited"] += 1
+                queue.bucket.rate_limited(e.retry_after, time.monotonic())
+                # Retry first unless a newer op for this key has replaced it meanwhile
+                if op.key not in queue.pending:
+                    self._enqueue(queue, op, front=True)
+            except Exception as e:
+                self.counters["errors"] += 1
+                self._retry_or_fail(queue, op, e)
+            finally:
+                queue.in_flight.discard(op.key)
+                if op.key in queue.pending:
+                    # A newer op for this key was held back while we were busy
+                    queue.wakeup.set()
+
+    def _retry_or_fail(self, queue: _ChannelQueue, op: _Op, error: Exception):
+        if op.key in queue.pending:
+            return  # superseded by a newer op for this key, which goes out instead
+
+        op.attempts += 1
+        if op.attempts <= self.max_retries:
+            backoff = min(self.retry_max, self.retry_base * 2 ** (op.attempts - 1))
+            op.retry_at = time.monotonic() + backoff
+            self.counters["retried"] += 1
+            print(
+                f"⚠️ Billboard outbox {op.kind} failed for {op.key} in {queue.channel_id} "
+                f"(attempt {op.attempts}), retrying in {backoff:.1f}s: {error}"
+            )
+            self._enqueue(queue, op)
+            return
+
+        self.counters["failed"] += 1
+        print(f"❌ Billboard outbox {op.kind} gave up on {op.key} in {queue.channel_id}: {error}")
+        self._notify(queue.channel_id, op.key, queue.message_ids.get(op.key), FAILED)
+
+    async def _dispatch(self, queue: _ChannelQueue, op: _Op) -> Optional[Dict[str, str]]:
+        channel_id = queue.channel_id
+
+        if op.kind == DELETE:
+            message_id = queue.message_ids.pop(op.key, None)
+            if message_id is None:
+                return None
+            try:
+                headers = await self.transport.delete(channel_id, message_id)
+            except LookupError:
+                headers = None  # already gone
+            except Exception:
+                queue.message_ids[op.key] = message_id
+                raise
+            self.counters["deleted"] += 1
+            self._notify(channel_id, op.key, None, None)
+            return headers
+
+        message_id = queue.message_ids.get(op.key)
+        if message_id is not None:
+            try:
+                headers = await self.transport.edit(channel_id, message_id, op.payload)
+                self.counters["edited"] += 1
+                self._notify(channel_id, op.key, message_id, op.tag)
+                return headers
+            except LookupError:
+                # Message was removed by hand; fall through and post a fresh one
+                queue.message_ids.pop(op.key, None)
+
+        message_id, headers = await self.transport.send(channel_id, op.payload)
+        queue.message_ids[op.key] = message_id
+        self.counters["sent"] += 1
+        self._notify(channel_id, op.key, message_id, op.tag)
+        return headers
+
+    def _notify(self, channel_id: int, key: str, message_id: Optional[int], tag: Any):
+        if self.on_message is None:
+            return
+        result = self.on_message(channel_id, key, message_id, tag)
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
+
+
+class FakeTransport:
+    """
+    Offline stand-in for Discord's message endpoints.
+
+    Simulates per-channel buckets (answering 429 with rate-limit headers like
+    Discord does), optional latency, and keeps every message in memory so
+    outbox behaviour can be checked without a bot token.
+    """
+
+    def __init__(self, latency: float = 0.0, limit: int = DEFAULT_BUCKET_LIMIT, period: float = DEFAULT_BUCKET_PERIOD):
+        self.latency = latency
+        self.limit = limit
+        self.period = period
+        self.messages: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.calls = []
+        self._windows: Dict[int, Tuple[float, int]] = {}
+        self._next_id = 1
+
+    def _hit(self, channel_id: int) -> Dict[str, str]:
+        now = time.monotonic()
+        start, used = self._windows.get(channel_id, (now, 0))
+        if now - start >= self.period:
+            start, used = now, 0
+        reset_after = self.period - (now - start)
+        if used >= self.limit:
+            raise RateLimited(reset_after)
+        used += 1
+        self._windows[channel_id] = (start, used)
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.limit - used),
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+        }
+
+    async def _call(self, method: str, channel_id: int) -> Dict[str, str]:
+        self.calls.append((method, channel_id))
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._hit(channel_id)
+
+    async def send(self, channel_id: int, payload: Dict[str, Any]):
+        headers = await self._call("send", channel_id)
+        message_id = self._next_id
+        self._next_id += 1
+        self.messages.setdefault(channel_id, {})[message_id] = payload
+        return message_id, headers
+
+    async def edit(self, channel_id: int, message_id: int, payload: Dict[str, Any]):
+        headers = await self._call("edit", channel_id)
+        channel = self.messages.setdefault(channel_id, {})
+        if message_id not in channel:
+            raise LookupError(message_id)
+        channel[message_id] = payload
+        return headers
+
+    async def delete(self, channel_id: int, message_id: int):
+        headers = await self._call("delete", channel_id)
+        if self.messages.setdefault(channel_id, {}).pop(message_id, None) is None:
+            raise LookupError(message_id)
+        return headers
@@ -0,0 +1,82 @@
+import os
+import sys
+from typing import Any, Dict
+import interactions
+from interactions.client.utils.cache import NullCache, TTLCache
+
+# Caches the cogs never read: voice state (no voice features)
+DISABLED_CACHES = ("voice_state_cache", "bot_voice_state_cache")
+
+# Caches the cogs touch only briefly (ctx.author, billboard channels and messages);
+# bounded by count and age instead of growing with every guild the bot joins
+BOUNDED_CACHES = {
+    "message_cache": "CACHE_MESSAGE_LIMIT",
+    "member_cache": "CACHE_MEMBER_LIMIT",
+    "user_cache": "CACHE_USER_LIMIT",
+    "channel_cache": "CACHE_CHANNEL_LIMIT",
+    "role_cache": "CACHE_ROLE_LIMIT",
+}
+
+# Everything reported by cache_report (guild_cache stays unbounded: ctx.guild reads it)
+REPORTED_CACHES = ("guild_cache",) + tuple(BOUNDED_CACHES) + DISABLED_CACHES
+
+
+def gateway_intents() -> interactions.Intents:
+    """
+    Intents from BOT_INTENTS (comma-separated Intents names, default "GUILDS").
+    Slash commands and buttons arrive as interactions and need no intent;
+    GUILDS keeps ctx.guild and channel lookups working.
+    """
+    names = [n.strip().upper() for n in os.getenv("BOT_INTENTS", "GUILDS").split(",") if n.strip()]
+    intents = interactions.Intents(0)
+    for name in names:
+        try:
+            intents |= interactions.Intents[name]
+        except KeyError:
+            raise RuntimeError(f"Unknown intent '{name}' in BOT_INTENTS.")
+    return intents
+
+
+def cache_kwargs() -> Dict[str, Any]:
+    """
+    interactions.Client cache overrides for CACHE_POLICY:
+      minimal (default)  bounded TTL caches, voice caches disabled
+      default            the library's unbounded caches
+    Limits: CACHE_<NAME>_LIMIT entries (default 500), CACHE_TTL_SECONDS (default 600).
+    """
+    policy = os.getenv("CACHE_POLICY", "minimal").lower()
+    if policy == "default":
+        return {}
+    if policy != "minimal":
+        raise RuntimeError(f"Unknown CACHE_POLICY '{policy}' (expected 'minimal' or 'default').")
+
+    ttl = int(os.getenv("CACHE_TTL_SECONDS", "600"))
+    kwargs: Dict[str, Any] = {name: NullCache() for name in DISABLED_CACHES}
+    for name, env in BOUNDED_CACHES.items():
+        limit = int(os.getenv(env, "500"))
+        kwargs[name] = TTLCache(ttl=ttl, soft_limit=max(1, limit // 4), hard_limit=limit)
+    return kwargs
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc isn't available)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        import resource  # not available on Windows
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def cache_report(bot: interactions.Client) -> Dict[str, int]:
+    """Entry counts for each gateway cache, plus guild count and RSS."""
+    report = {name: len(getattr(bot.cache, name, None) or ()) for name in REPORTED_CACHES}
+    report["guilds"] = len(bot.guilds)
+    report["rss_mb"] = rss_bytes() // (1024 * 1024)
+    return report
@@ -0,0 +1,100 @@
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+# Discord allows at most 10 embeds per message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+# ...and at most 6000 characters of embed text across all of them
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+DIGEST_KEY_PREFIX = "digest:"
+
+
+def digest_key(page: int) -> str:
+    return f"{DIGEST_KEY_PREFIX}{page}"
+
+
+class DigestSlots:
+    """
+    Stable war -> slot assignment for digest billboards.
+
+    Each page is one Discord message holding up to ``page_size`` wars whose
+    rendered embeds add up to at most ``page_chars`` characters. A war
+    keeps its page and slot until it's released (or grows past what its
+    page has room for), so a change only touches the one page that holds
+    it. New wars go to the lowest page with room, which keeps the earliest
+    pages full and lets trailing pages empty out and be deleted.
+    """
+
+    def __init__(self, page_size: int = MAX_EMBEDS_PER_MESSAGE, page_chars: int = MAX_EMBED_CHARS_PER_MESSAGE):
+        if not 1 <= page_size <= MAX_EMBEDS_PER_MESSAGE:
+            raise ValueError(f"page_size must be 1-{MAX_EMBEDS_PER_MESSAGE}, got {page_size}")
+        self.page_size = page_size
+        self.page_chars = page_chars
+        self._slots: Dict[str, Tuple[int, int]] = {}  # war_id -> (page, slot on the page)
+        self._sizes: Dict[str, int] = {}  # war_id -> rendered characters
+        self._pages: Dict[int, Dict[int, str]] = {}  # page -> {slot: war_id}
+        self._used: Dict[int, int] = {}  # page -> rendered characters
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, war_id: str) -> bool:
+        return war_id in self._slots
+
+    def page_of(self, war_id: str) -> Optional[int]:
+        placed = self._slots.get(war_id)
+        return None if placed is None else placed[0]
+
+    def _has_room(self, page: int, size: int) -> bool:
+        slots = self._pages.get(page)
+        if not slots:
+            return True  # an oversized war still gets a page of its own
+        return len(slots) < self.page_size and self._used[page] + size <= self.page_chars
+
+    def assign(self, war_id: str, size: int = 0) -> int:
+        """
+        Gives a war a slot and returns its page. A war that already has one
+        keeps it while its page still has room for its new ``size``;
+        otherwise it moves to the lowest page that does.
+        """
+        placed = self._slots.get(war_id)
+        if placed is not None:
+            page = placed[0]
+            grown = size - self._sizes[war_id]
+            if len(self._pages[page]) == 1 or self._used[page] + grown <= self.page_chars:
+                self._sizes[war_id] = size
+                self._used[page] += grown
+                return page
+            self.release(war_id)
+
+        page = next(p for p in itertools.count() if self._has_room(p, size))
+        slots = self._pages.setdefault(page, {})
+        slot = next(s for s in itertools.count() if s not in slots)
+        slots[slot] = war_id
+        self._slots[war_id] = (page, slot)
+        self._sizes[war_id] = size
+        self._used[page] = self._used.get(page, 0) + size
+        return page
+
+    def release(self, war_id: str) -> Optional[int]:
+        """Frees a war's slot and returns the page it was on (None if it had none)."""
+        placed = self._slots.pop(war_id, None)
+        if placed is None:
+            return None
+
+        page, slot = placed
+        del self._pages[page][slot]
+        self._used[page] -= self._sizes.pop(war_id)
+        if not self._pages[page]:
+            del self._pages[page]
+            del self._used[page]
+        return page
+
+    def wars_on(self, page: int) -> List[str]:
+        """War ids on a page, in slot order."""
+        slots = self._pages.get(page, {})
+        return [slots[slot] for slot in sorted(slots)]
+
+    def pages(self) -> List[int]:
+        return sorted(self._pages)
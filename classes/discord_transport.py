@@ -0,0 +1,115 @@
+from collections import Counter
+from typing import Any, Dict, Optional
+import interactions
+from interactions.api.http.route import Route
+from interactions.client.errors import HTTPException, NotFound
+from interactions.models.discord.message import process_message_payload
+from classes.billboard_outbox import RateLimited
+from classes.metrics import DISCORD_CALLS, DISCORD_ERRORS
+
+
+def _headers(error: HTTPException) -> Dict[str, str]:
+    response = getattr(error, "response", None)
+    return dict(getattr(response, "headers", None) or {})
+
+
+class DiscordTransport:
+    """
+    BillboardOutbox transport backed by interactions.py.
+
+    interactions.py already retries 429s internally, so RateLimited is only
+    raised when one still escapes; missing messages surface as LookupError.
+    After each call the route's rate-limit state (which interactions.py
+    ingests from the X-RateLimit-* response headers) is handed back as
+    headers, so the outbox paces on Discord's real budget.
+
+    Resolved channel objects are kept and reused until a call on that
+    channel fails, so steady-state syncs don't look the channel up again.
+    Edits go straight to the message by ID (no fetch first), so every
+    outbox op is exactly one request against the channel's budget.
+    Every Discord call is counted per channel (see ``api_calls``).
+    """
+
+    def __init__(self, bot: interactions.Client):
+        self.bot = bot
+        self._channels: Dict[int, Any] = {}
+        self.calls: Dict[int, Counter] = {}
+
+    def record(self, channel_id: int, call: str, count: int = 1):
+        self.calls.setdefault(channel_id, Counter())[call] += count
+        DISCORD_CALLS.inc(count, route=call)
+
+    def record_error(self, channel_id: int, call: str, error: Exception):
+        DISCORD_ERRORS.inc(route=call, status=getattr(error, "status", "unknown"))
+        self.forget(channel_id)
+
+    def api_calls(self, channel_id: int) -> Dict[str, int]:
+        return dict(self.calls.get(channel_id, {}))
+
+    def forget(self, channel_id: int):
+        """Drops the cached channel so the next call resolves it again."""
+        self._channels.pop(channel_id, None)
+
+    async def channel(self, channel_id: int):
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            self.record(channel_id, "fetch_channel")
+            channel = await self.bot.fetch_channel(channel_id)
+            if channel is None:
+                raise RuntimeError(f"Channel {channel_id} not found — check permissions.")
+            self._channels[channel_id] = channel
+        return channel
+
+    def bucket_headers(self, route: Route) -> Optional[Dict[str, str]]:
+        """The rate-limit headers last seen on a route, or None before any were (or for unlimited routes)."""
+        bucket = self.bot.http.get_ratelimit(route)
+        if not bucket.bucket_hash:
+            return None
+        return {
+            "X-RateLimit-Limit": str(bucket.limit),
+            "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset-After": str(bucket.delta),
+        }
+
+    @staticmethod
+    def _translate(error: HTTPException):
+        if isinstance(error, NotFound):
+            return LookupError(str(error))
+        if getattr(error, "status", None) == 429:
+            headers = _headers(error)
+            retry_after = headers.get("Retry-After") or headers.get("X-RateLimit-Reset-After") or 1
+            return RateLimited(float(retry_after))
+        return error
+
+    async def send(self, channel_id: int, payload: Dict[str, Any]):
+        channel = await self.channel(channel_id)
+        self.record(channel_id, "send")
+        try:
+            msg = await channel.send(**payload)
+        except HTTPException as e:
+            self.record_error(channel_id, "send", e)
+            raise self._translate(e) from e
+        return msg.id, self.bucket_headers(Route("POST", "/channels/{channel_id}/messages", channel_id=channel_id))
+
+    async def edit(self, channel_id: int, message_id: int, payload: Dict[str, Any]) -> Optional[Dict[str, str]]:
+        self.record(channel_id, "edit")
+        try:
+            await self.bot.http.edit_message(process_message_payload(**payload), channel_id, message_id)
+        except HTTPException as e:
+            self.record_error(channel_id, "edit", e)
+            raise self._translate(e) from e
+        return self.bucket_headers(
+            Route("PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id=channel_id, message_id=message_id)
+        )
+
+    async def delete(self, channel_id: int, message_id: int) -> Optional[Dict[str, str]]:
+        channel = await self.channel(channel_id)
+        self.record(channel_id, "delete")
+        try:
+            await channel.delete_message(message_id)
+        except HTTPException as e:
+            self.record_error(channel_id, "delete", e)
+            raise self._translate(e) from e
+        return self.bucket_headers(
+            Route("DELETE", "/channels/{channel_id}/messages/{message_id}", channel_id=channel_id, message_id=message_id)
+        )
@@ -0,0 +1,79 @@
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+
+class ExpiryScheduler:
+    """
+    Min-heap of (deadline, war_id) drained by a single task.
+
+    The task sleeps until exactly the earliest deadline (or until an earlier
+    one is scheduled), so there is no periodic scan over every war.
+    Rescheduling or cancelling leaves the old heap entry behind; it's
+    skipped when popped because it no longer matches ``_deadlines``.
+    """
+
+    def __init__(self, on_expire: Callable[[str], Awaitable], clock: Callable[[], float] = time.time):
+        self.on_expire = on_expire
+        self.clock = clock
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+        self._task = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, war_id: str, deadline: float):
+        """Sets (or moves) the unix-time deadline for a war."""
+        if self._deadlines.get(war_id) == deadline:
+            return
+        self._deadlines[war_id] = deadline
+        heapq.heappush(self._heap, (deadline, war_id))
+        if self._heap[0] == (deadline, war_id):
+            self._wakeup.set()  # new earliest deadline: re-arm the timer
+
+        # Compact when stale entries dominate, so the heap stays O(live wars)
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(d, w) for w, d in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, war_id: str):
+        self._deadlines.pop(war_id, None)
+
+    def next_deadline(self):
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def _discard_stale(self):
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - self.clock())
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, war_id = heapq.heappop(self._heap)
+            del self._deadlines[war_id]
+            try:
+                await self.on_expire(war_id)
+            except Exception as e:
+                print(f"❌ Failed to expire war {war_id}: {e}")
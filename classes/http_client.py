@@ -0,0 +1,89 @@
+import os
+import aiohttp
+from typing import Dict, Optional
+
+
+class SharedHttpClient:
+    """
+    One pooled aiohttp session for the whole bot.
+
+    Created once in main.py and handed to every extension that makes
+    outbound HTTP calls, so CDN downloads reuse warm keep-alive connections
+    and cached DNS instead of a fresh TCP+TLS handshake per command.
+
+    Tunables (env):
+      HTTP_POOL_LIMIT           total open connections (default 100)
+      HTTP_POOL_LIMIT_PER_HOST  connections per host (default 10)
+      HTTP_DNS_CACHE_TTL        seconds to cache DNS lookups (default 300)
+      HTTP_KEEPALIVE_SECONDS    idle keep-alive per connection (default 30)
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_cache_ttl: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+    ):
+        self.limit = limit or int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = limit_per_host or int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+        self.dns_cache_ttl = dns_cache_ttl or int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.counters = {
+            "requests": 0,
+            "new_connections": 0,
+            "reused_connections": 0,
+        }
+
+    # ---------------------------
+    # Connection counters
+    # ---------------------------
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            self.counters["requests"] += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            self.counters["new_connections"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self.counters["reused_connections"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                trace_configs=[self._trace_config()],
+            )
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("SharedHttpClient used before start() or after close().")
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self.counters)
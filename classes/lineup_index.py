@@ -0,0 +1,96 @@
+import os
+from typing import Dict, FrozenSet, Optional, Set, Tuple
+from classes.matchmaking import SECONDS_PER_HOUR
+from classes.war import War
+from classes.war_events import WarEvent
+
+# Two wars closer together than this (by start time) count as overlapping
+WAR_DURATION_SECONDS = int(os.getenv("WAR_DURATION_MINUTES", "60")) * 60
+
+# (player key, absolute hour bucket)
+BookingKey = Tuple[str, int]
+
+
+class LineupIndex:
+    """
+    Player -> wars index for double-booking checks.
+
+    Each lineup entry is filed under (player, start hour). An overlapping
+    war has to start within WAR_DURATION_SECONDS, i.e. in one of a fixed
+    number of neighbouring hours, so ``conflict`` looks at a few tiny
+    buckets instead of scanning every lineup.
+    Updated incrementally from war events; a war's previous entries are
+    replaced whenever its lineup changes.
+
+    Commands that book a player (/join-war, /create-new-war) ``reserve``
+    the player key before checking ``conflict`` and ``release`` it once the
+    booking is indexed, so two concurrent commands can't both pass the check.
+    """
+
+    def __init__(self):
+        self._bookings: Dict[BookingKey, Set[str]] = {}
+        self._wars: Dict[str, Tuple[float, FrozenSet[str]]] = {}  # war_id -> (start, player keys)
+        self._player_wars: Dict[str, Set[str]] = {}
+        self._reserved: Set[str] = set()  # players with a booking in progress
+
+    def __len__(self) -> int:
+        return len(self._wars)
+
+    def add(self, war: War):
+        self.remove(war.war_id)
+        start = war.start_datetime().timestamp()
+        keys = frozenset(player.key for player in war.lineup)
+        if not keys:
+            return
+
+        bucket = int(start // SECONDS_PER_HOUR)
+        self._wars[war.war_id] = (start, keys)
+        for key in keys:
+            self._bookings.setdefault((key, bucket), set()).add(war.war_id)
+            self._player_wars.setdefault(key, set()).add(war.war_id)
+
+    def remove(self, war_id: str):
+        entry = self._wars.pop(war_id, None)
+        if entry is None:
+            return
+
+        start, keys = entry
+        bucket = int(start // SECONDS_PER_HOUR)
+        for key in keys:
+            booked = self._bookings[(key, bucket)]
+            booked.discard(war_id)
+            if not booked:
+                del self._bookings[(key, bucket)]
+            wars = self._player_wars[key]
+            wars.discard(war_id)
+            if not wars:
+                del self._player_wars[key]
+
+    def apply_event(self, event: WarEvent):
+        if event.kind == WarEvent.DELETED:
+            self.remove(event.war_id)
+        else:
+            self.add(War.from_dict(event.war))
+
+    def reserve(self, player_key: str) -> bool:
+        """Claims a player for one booking; False if another is still in progress."""
+        if player_key in self._reserved:
+            return False
+        self._reserved.add(player_key)
+        return True
+
+    def release(self, player_key: str):
+        self._reserved.discard(player_key)
+
+    def wars_for(self, player_key: str) -> Set[str]:
+        return set(self._player_wars.get(player_key, ()))
+
+    def conflict(self, player_key: str, start: float, exclude_war: Optional[str] = None) -> Optional[str]:
+        """war_id of a war this player is already in that overlaps ``start`` (unix time), or None."""
+        bucket = int(start // SECONDS_PER_HOUR)
+        span = -(-WAR_DURATION_SECONDS // SECONDS_PER_HOUR)  # buckets either side that could overlap
+        for probe in range(bucket - span, bucket + span + 1):
+            for war_id in self._bookings.get((player_key, probe), ()):
+                if war_id != exclude_war and abs(self._wars[war_id][0] - start) < WAR_DURATION_SECONDS:
+                    return war_id
+        return None
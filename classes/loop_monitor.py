@@ -0,0 +1,63 @@
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Optional
+from classes.metrics import LOOP_LAG_SECONDS
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how much later than asked a sleeping task wakes.
+    Anything that blocks the loop (sync file I/O, heavy CPU in a handler)
+    shows up here before it shows up as a missed gateway heartbeat.
+
+    Tunables (env):
+      LOOP_LAG_INTERVAL_MS  how often to sample (default 500)
+      LOOP_LAG_WARN_MS      log a warning when one sample exceeds this (default 250)
+    """
+
+    def __init__(self, interval: Optional[float] = None, warn_after: Optional[float] = None, window: int = 1024):
+        self.interval = interval or int(os.getenv("LOOP_LAG_INTERVAL_MS", "500")) / 1000
+        self.warn_after = warn_after or int(os.getenv("LOOP_LAG_WARN_MS", "250")) / 1000
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - expected)
+
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag > self.warn_after:
+                print(f"⚠️ Event loop blocked for {lag * 1000:.0f} ms")
+
+    def reset(self):
+        self.samples.clear()
+        self.max_lag = 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Lag over the recent window (and the worst ever seen), in milliseconds."""
+        ordered = sorted(self.samples)
+        if not ordered:
+            return {"samples": 0, "p50_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+        return {
+            "samples": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+            "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+        }
@@ -0,0 +1,93 @@
+from typing import Dict, Optional, Tuple
+from classes.war import War
+from classes.war_events import WarEvent
+from classes.war_time import parse_start_time
+
+MAX_LINEUP = 6
+SECONDS_PER_HOUR = 3600
+
+# (war_type, start hour bucket, lineup size)
+IndexKey = Tuple[str, int, int]
+
+
+def start_bucket(start_time: Optional[str]) -> int:
+    """
+    Normalises a stored (UTC) start time to an absolute hour bucket:
+    whole hours since the Unix epoch, so 23:00 and 00:00 the next day are
+    neighbours and wars a day apart never collide.
+    """
+    return int(parse_start_time(start_time).timestamp() // SECONDS_PER_HOUR)
+
+
+class MatchmakingIndex:
+    """
+    Open wars bucketed by (war_type, start hour, lineup size).
+
+    Each bucket is an insertion-ordered dict, so the longest-waiting war
+    comes first. best_match only probes a constant number of neighbouring
+    buckets, so lookups don't grow with the number of open wars.
+    """
+
+    def __init__(self, max_hour_distance: int = 2):
+        self.max_hour_distance = max_hour_distance
+        self._buckets: Dict[IndexKey, Dict[str, str]] = {}  # key -> {war_id: team_name (lower)}
+        self._keys: Dict[str, IndexKey] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, war_id: str) -> bool:
+        return war_id in self._keys
+
+    def add(self, war: War):
+        """Indexes a war, or drops it from the index if it's no longer open."""
+        self.remove(war.war_id)
+        if not war.is_open:
+            return
+
+        key = (war.war_type, start_bucket(war.start_time), min(len(war.lineup), MAX_LINEUP))
+        self._buckets.setdefault(key, {})[war.war_id] = (war.team_name or "").lower()
+        self._keys[war.war_id] = key
+
+    def remove(self, war_id: str):
+        key = self._keys.pop(war_id, None)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+        del bucket[war_id]
+        if not bucket:
+            del self._buckets[key]
+
+    def apply_event(self, event: WarEvent):
+        if event.kind == WarEvent.DELETED:
+            self.remove(event.war_id)
+        else:
+            self.add(War.from_dict(event.war))
+
+    def best_match(
+        self,
+        war_type: str,
+        hour: int,
+        lineup_size: int,
+        exclude_team: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        war_id of the best open war for a team, or None.
+        Closest start hour wins, then closest lineup size, then longest waiting.
+        """
+        war_type = war_type.upper()
+        exclude = (exclude_team or "").lower()
+
+        for distance in range(self.max_hour_distance + 1):
+            for probe_hour in sorted({hour - distance, hour + distance}):
+                for gap in range(MAX_LINEUP + 1):
+                    for size in sorted({lineup_size - gap, lineup_size + gap}):
+                        if not 0 <= size <= MAX_LINEUP:
+                            continue
+                        bucket = self._buckets.get((war_type, probe_hour, size))
+                        if not bucket:
+                            continue
+                        for war_id, team in bucket.items():
+                            if team != exclude:
+                                return war_id
+        return None
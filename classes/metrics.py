@@ -0,0 +1,298 @@
+import os
+import time
+import asyncio
+import functools
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# Latency buckets in seconds: interaction handlers, store calls and Discord round trips
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(_Metric):
+    """A value read when metrics are collected: set directly, or pulled from a callback."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._functions: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, fn: Callable[[], float], **labels: str):
+        self._functions[self._key(labels)] = fn
+
+    def samples(self) -> Iterable[str]:
+        values = dict(self._values)
+        for key, fn in self._functions.items():
+            try:
+                values[key] = fn()
+            except Exception:
+                continue  # a broken callback shouldn't take the whole scrape down
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._series: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self) -> Iterable[str]:
+        for key, series in self._series.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {series[-1]}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics in Prometheus text format.
+
+    Recording is a dict lookup and an add, so instruments stay on in
+    production; formatting only happens when the endpoint is scraped or
+    the textfile is written.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, help: str, labelnames: Tuple[str, ...], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"Metric {name} is already registered as a {metric.kind}.")
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ---------------------------
+# Shared instruments
+# ---------------------------
+COMMAND_SECONDS = REGISTRY.histogram(
+    "warbot_command_seconds", "Slash command / component handler latency.", ("command",)
+)
+COMMAND_ERRORS = REGISTRY.counter(
+    "warbot_command_errors_total", "Slash command / component handlers that raised.", ("command",)
+)
+DISCORD_CALLS = REGISTRY.counter(
+    "warbot_discord_calls_total", "Discord API calls made by the bot's own code, by route.", ("route",)
+)
+DISCORD_ERRORS = REGISTRY.counter(
+    "warbot_discord_errors_total", "Discord API calls that failed, by route and HTTP status.", ("route", "status")
+)
+SYNC_SECONDS = REGISTRY.histogram(
+    "warbot_billboard_sync_seconds", "Billboard sync pass duration, queueing through last Discord call.",
+    ("war_type", "phase"),
+)
+SYNC_INTERVAL_SECONDS = REGISTRY.gauge(
+    "warbot_billboard_sync_interval_seconds", "Current gap between billboard reconcile passes."
+)
+STORE_SECONDS = REGISTRY.histogram(
+    "warbot_store_seconds", "War store call latency, including executor queueing.", ("op",)
+)
+STORE_BATCH_SIZE = REGISTRY.histogram(
+    "warbot_store_write_batch_size", "Writes committed together per war store transaction.",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 256),
+)
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "warbot_event_loop_lag_seconds", "How late the event loop woke a sleeping task.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+QUEUE_DEPTH = REGISTRY.gauge(
+    "warbot_queue_depth", "Items waiting in an internal queue.", ("queue",)
+)
+
+
+def timed(command: str):
+    """Records a handler's latency (and whether it raised) under ``command``."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            except Exception:
+                COMMAND_ERRORS.inc(command=command)
+                raise
+            finally:
+                COMMAND_SECONDS.observe(time.perf_counter() - started, command=command)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------
+# Exporter
+# ---------------------------
+def _write_textfile(path: str, body: str):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp_path, path)  # node_exporter never sees a half-written file
+
+
+class MetricsExporter:
+    """
+    Publishes the registry, if configured (env):
+      METRICS_PORT              serve /metrics on METRICS_HOST (default 127.0.0.1)
+      METRICS_TEXTFILE          or write this file (node_exporter textfile collector)
+      METRICS_TEXTFILE_SECONDS  how often to rewrite it (default 15)
+    With neither set, metrics are still recorded but not exported.
+    """
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.registry = registry
+        self.port = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+        self.host = os.getenv("METRICS_HOST", "127.0.0.1")
+        self.textfile = os.getenv("METRICS_TEXTFILE")
+        self.interval = float(os.getenv("METRICS_TEXTFILE_SECONDS", "15"))
+        self._runner = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.port:
+            from aiohttp import web
+
+            async def handle(request):
+                return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+            app = web.Application()
+            app.router.add_get("/metrics", handle)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.host, self.port).start()
+            print(f"📈 Metrics on http://{self.host}:{self.port}/metrics")
+
+        if self.textfile and self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+            print(f"📈 Metrics written to {self.textfile} every {self.interval:.0f}s")
+
+    async def _write_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(_write_textfile, self.textfile, self.registry.render())
+            except OSError as e:
+                print(f"⚠️ Could not write metrics textfile: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,337 @@
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_QUEUE_DIR = os.path.join(BASE_DIR, "temp", "pen-queue")
+
+
+class PermanentJobError(Exception):
+    """Retrying won't help (bad file, expired link); the message is shown to the submitter."""
+
+
+class DuplicateJobError(PermanentJobError):
+    """The same file was already submitted to the same channel."""
+
+
+class PenaltyJob:
+    """One /submit_pen submission, persisted as JSON until it's delivered or gives up."""
+
+    __slots__ = (
+        "job_id",
+        "match_type",
+        "title",
+        "channel_id",
+        "user_id",
+        "filename",
+        "url",
+        "attempts",
+        "content_hash",
+        "created_at",
+        "last_error",
+    )
+
+    def __init__(
+        self,
+        match_type: str,
+        title: str,
+        channel_id: int,
+        user_id: int,
+        filename: str,
+        url: str,
+        attempts: int = 0,
+        content_hash: Optional[str] = None,
+        created_at: Optional[float] = None,
+        last_error: Optional[str] = None,
+        job_id: Optional[str] = None,
+    ):
+        self.job_id = job_id or str(uuid.uuid4())
+        self.match_type = match_type
+        self.title = title
+        self.channel_id = channel_id
+        self.user_id = user_id
+        self.filename = filename
+        self.url = url
+        self.attempts = attempts
+        self.content_hash = content_hash
+        self.created_at = created_at or time.time()
+        self.last_error = last_error
+
+    @property
+    def dedup_key(self) -> Optional[str]:
+        return f"{self.channel_id}-{self.content_hash}" if self.content_hash else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PenaltyJob":
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class PenaltyQueue:
+    """
+    Durable on-disk queue for penalty submissions.
+
+    Jobs are written to ``jobs/`` before the user is acknowledged and
+    removed only once delivered (or given up on), so a crash or restart
+    resumes them. A fixed pool of workers processes jobs; failures are
+    retried with exponential backoff and jitter up to ``max_attempts``.
+    Delivered content is remembered in ``seen/`` (one marker file per
+    channel + content hash) for ``dedup_ttl`` seconds.
+
+    ``process(job)`` does the work and raises to retry (or
+    PermanentJobError to stop); ``on_finished(job, error)`` is told how it
+    ended (error is None on success).
+
+    Tunables (env):
+      PEN_QUEUE_DIR             spool directory (default temp/pen-queue)
+      PEN_QUEUE_WORKERS         concurrent submissions (default 2)
+      PEN_QUEUE_MAX_ATTEMPTS    tries per job (default 6)
+      PEN_QUEUE_BACKOFF_SECONDS first retry delay, doubled each time (default 2, capped at 300)
+      PEN_QUEUE_DEDUP_HOURS     how long delivered content is remembered (default 24)
+    """
+
+    def __init__(
+        self,
+        process: Callable[[PenaltyJob], Awaitable],
+        on_finished: Callable[[PenaltyJob, Optional[str]], Awaitable],
+        directory: Optional[str] = None,
+        workers: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        backoff_base: Optional[float] = None,
+        backoff_max: float = 300.0,
+        dedup_ttl: Optional[float] = None,
+    ):
+        self.process = process
+        self.on_finished = on_finished
+        self.directory = directory or os.getenv("PEN_QUEUE_DIR") or DEFAULT_QUEUE_DIR
+        self.workers = workers or int(os.getenv("PEN_QUEUE_WORKERS", "2"))
+        self.max_attempts = max_attempts or int(os.getenv("PEN_QUEUE_MAX_ATTEMPTS", "6"))
+        self.backoff_base = backoff_base or float(os.getenv("PEN_QUEUE_BACKOFF_SECONDS", "2"))
+        self.backoff_max = backoff_max
+        self.dedup_ttl = dedup_ttl or float(os.getenv("PEN_QUEUE_DEDUP_HOURS", "24")) * 3600
+
+        self.jobs_dir = os.path.join(self.directory, "jobs")
+        self.blobs_dir = os.path.join(self.directory, "blobs")
+        self.seen_dir = os.path.join(self.directory, "seen")
+
+        self._ready: "asyncio.Queue[PenaltyJob]" = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._claimed: Dict[str, str] = {}  # dedup key -> job_id still being delivered
+        self._live: Set[str] = set()  # job_ids queued or in flight in this process
+        self.counters = {
+            "submitted": 0,
+            "delivered": 0,
+            "retried": 0,
+            "duplicates": 0,
+            "failed": 0,
+        }
+
+    # ---------------------------
+    # Disk layout
+    # ---------------------------
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.jobs_dir, f"{job_id}.json")
+
+    def blob_path(self, job: PenaltyJob) -> str:
+        """Where ``process`` should keep the downloaded file, so retries don't download again."""
+        return os.path.join(self.blobs_dir, f"{job.job_id}.bin")
+
+    def _seen_path(self, key: str) -> str:
+        return os.path.join(self.seen_dir, key)
+
+    def _save(self, job: PenaltyJob):
+        os.makedirs(self.jobs_dir, exist_ok=True)  # submissions can arrive before start()
+        _write_atomic(self._job_path(job.job_id), json.dumps(job.to_dict()).encode("utf-8"))
+
+    def _discard(self, job: PenaltyJob):
+        for path in (self._job_path(job.job_id), self.blob_path(job)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _load_pending(self) -> List[PenaltyJob]:
+        for directory in (self.jobs_dir, self.blobs_dir, self.seen_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        jobs = []
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith(".json"):
+                continue  # leftover .tmp from an interrupted write
+            try:
+                with open(os.path.join(self.jobs_dir, name), "rb") as f:
+                    jobs.append(PenaltyJob.from_dict(json.loads(f.read())))
+            except (OSError, ValueError, TypeError) as e:
+                print(f"⚠️ Skipping unreadable penalty job {name}: {e}")
+        return sorted(jobs, key=lambda job: job.created_at)
+
+    def _prune_seen(self):
+        cutoff = time.time() - self.dedup_ttl
+        for name in os.listdir(self.seen_dir):
+            path = self._seen_path(name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _check_duplicate(self, job: PenaltyJob) -> Optional[str]:
+        path = self._seen_path(job.dedup_key)
+        try:
+            if os.path.getmtime(path) >= time.time() - self.dedup_ttl:
+                with open(path, "r", encoding="utf-8") as f:
+                    return f.read().strip() or "unknown"
+        except OSError:
+            pass
+        return None
+
+    def _mark_seen(self, job: PenaltyJob):
+        _write_atomic(self._seen_path(job.dedup_key), job.job_id.encode("utf-8"))
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    async def start(self):
+        """Resumes jobs left on disk and starts the workers."""
+        pending = await asyncio.to_thread(self._load_pending)
+        await asyncio.to_thread(self._prune_seen)
+        pending = [job for job in pending if job.job_id not in self._live]  # submitted before start()
+        for job in pending:
+            self._live.add(job.job_id)
+            self._ready.put_nowait(job)
+        if pending:
+            print(f"📨 Resuming {len(pending)} queued penalty submission(s)")
+
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+
+    async def close(self):
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, job: PenaltyJob):
+        """Persists a job, then queues it. Once this returns the submission survives a restart."""
+        await asyncio.to_thread(self._save, job)
+        self.counters["submitted"] += 1
+        self._live.add(job.job_id)
+        self._ready.put_nowait(job)
+
+    async def claim(self, job: PenaltyJob) -> Optional[str]:
+        """
+        Reserves the job's content for its channel. Returns the ID of a job that
+        already delivered (or is delivering) the same content there, or None.
+        """
+        key = job.dedup_key
+        holder = self._claimed.setdefault(key, job.job_id)  # claimed before the disk check awaits
+        if holder != job.job_id:
+            return holder
+
+        delivered = await asyncio.to_thread(self._check_duplicate, job)
+        if delivered is not None:
+            del self._claimed[key]
+            return delivered
+        return None
+
+    async def save(self, job: PenaltyJob):
+        """Persists progress (e.g. the content hash once the file is downloaded)."""
+        await asyncio.to_thread(self._save, job)
+
+    def backlog(self) -> int:
+        return self._ready.qsize() + len(self._retry_handles)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "backlog": self.backlog()}
+
+    # ---------------------------
+    # Workers
+    # ---------------------------
+    def backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max)
+        return delay * random.uniform(0.5, 1.0)  # jitter so a burst of failures doesn't retry in lockstep
+
+    def _requeue(self, job: PenaltyJob):
+        self._retry_handles.pop(job.job_id, None)
+        self._ready.put_nowait(job)
+
+    async def _worker(self, number: int):
+        while True:
+            job = await self._ready.get()
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Bookkeeping around the job failed; the job stays on disk, the worker keeps going
+                print(f"❌ Penalty worker {number} failed handling job {job.job_id}: {e!r}")
+
+    async def _run(self, job: PenaltyJob):
+        job.attempts += 1
+        try:
+            await self.process(job)
+        except asyncio.CancelledError:
+            raise
+        except PermanentJobError as e:
+            self.counters["duplicates" if isinstance(e, DuplicateJobError) else "failed"] += 1
+            await self._finish(job, str(e))
+        except Exception as e:
+            job.last_error = repr(e)
+            if job.attempts >= self.max_attempts:
+                print(f"❌ Penalty job {job.job_id} gave up after {job.attempts} attempts: {e!r}")
+                self.counters["failed"] += 1
+                await self._finish(job, "Delivery kept failing; please try submitting again.")
+                return
+
+            delay = self.backoff(job.attempts)
+            print(f"⚠️ Penalty job {job.job_id} attempt {job.attempts} failed ({e!r}); retrying in {delay:.1f}s")
+            self.counters["retried"] += 1
+            try:
+                await asyncio.to_thread(self._save, job)
+            except OSError as save_error:
+                # The retry still happens; only the attempt count is lost if we restart meanwhile
+                print(f"⚠️ Couldn't save penalty job {job.job_id} before retrying: {save_error!r}")
+            self._retry_handles[job.job_id] = asyncio.get_running_loop().call_later(delay, self._requeue, job)
+        else:
+            self.counters["delivered"] += 1
+            if job.content_hash:
+                try:
+                    await asyncio.to_thread(self._mark_seen, job)
+                except OSError as e:
+                    print(f"⚠️ Couldn't record penalty job {job.job_id} as delivered: {e!r}")
+            await self._finish(job, None)
+
+    async def _finish(self, job: PenaltyJob, error: Optional[str]):
+        self._live.discard(job.job_id)
+        if self._claimed.get(job.dedup_key) == job.job_id:
+            del self._claimed[job.dedup_key]
+        try:
+            await asyncio.to_thread(self._discard, job)
+        except OSError as e:
+            print(f"⚠️ Couldn't remove finished penalty job {job.job_id}: {e!r}")
+        try:
+            await self.on_finished(job, error)
+        except Exception as e:
+            print(f"⚠️ Couldn't report penalty job {job.job_id}: {e!r}")
@@ -1,18 +1,27 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Player:
     """Represents a single player in a war lineup."""
 
-    def __init__(self, player: str, role: str, ally: bool = False):
+    __slots__ = ("player", "role", "ally", "user_id")
+
+    def __init__(self, player: str, role: str, ally: bool = False, user_id: Optional[int] = None):
         self.player = player
         self.role = role
         self.ally = ally
+        self.user_id = user_id  # Discord user ID; None for players saved before it was recorded
+
+    @property
+    def key(self) -> str:
+        """Identity used for booking checks: the Discord ID, falling back to the name."""
+        return str(self.user_id) if self.user_id else (self.player or "").lower()
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "player": self.player,
             "role": self.role,
             "ally": self.ally,
+            "user_id": self.user_id,
         }
 
     @classmethod
@@ -21,5 +30,5 @@ class Player:
             player=data.get("player"),
             role=data.get("role"),
             ally=data.get("ally", False),
-            
-        )
\ No newline at end of file
+            user_id=data.get("user_id"),
+        )
@@ -0,0 +1,56 @@
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+from classes.war_codec import dumps
+
+
+def content_hash(war: Dict[str, Any], version: int = 0) -> str:
+    """
+    Digest of everything a billboard message is rendered from.
+    ``version`` is mixed in so a layout change invalidates every hash.
+    """
+    raw = dumps(war).encode("utf-8")
+    return hashlib.blake2b(b"%d:" % version + raw, digest_size=16).hexdigest()
+
+
+class RenderCache:
+    """
+    LRU of rendered billboard payloads keyed by content hash.
+
+    An unchanged war maps to the same hash and reuses its Embed/ActionRow;
+    a changed war gets a new hash (a miss) and its old entry is dropped via
+    invalidate() or ages out of the LRU.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_render(self, key: str, render: Callable[[], Any]) -> Any:
+        payload = self._entries.get(key)
+        if payload is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+        self.misses += 1
+        payload = render()
+        self._entries[key] = payload
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return payload
+
+    def invalidate(self, key: str):
+        self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,208 @@
+import os
+import time
+from typing import Dict, List, Optional
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECRET_CACHE_DIR = os.path.join(BASE_DIR, "temp", "secret-cache")
+
+
+def decode_and_normalise_secret(raw: bytes) -> str:
+    """
+    Try UTF-8 first, then UTF-16 (handles BOM), then 'latin-1'.
+    Strip BOM, nulls, and trailing whitespace/newlines.
+    """
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        try:
+            text = raw.decode("utf-16")
+        except UnicodeDecodeError:
+            text = raw.decode("latin-1")
+
+    text = text.replace("\ufeff", "").replace("\x00", "")
+    return text.strip()
+
+
+# ---------------------------
+# Backends
+#   get() returns the secret, or None if this backend doesn't have it
+# ---------------------------
+class EnvSecretBackend:
+    """Reads secrets from env vars named after the secret (discord_key_prod -> DISCORD_KEY_PROD)."""
+
+    name = "env"
+
+    def get(self, secret_id: str, version_id: str = "latest") -> Optional[str]:
+        value = os.getenv(secret_id.upper())
+        return value.strip() if value else None
+
+
+class StubSecretBackend:
+    """Offline backend for tests and benchmarks. Never touches the network."""
+
+    name = "stub"
+
+    def __init__(self, values: Optional[Dict[str, str]] = None):
+        self.values = values or {}
+
+    def get(self, secret_id: str, version_id: str = "latest") -> Optional[str]:
+        # Three dot-separated parts so it passes the Discord token sanity check
+        return self.values.get(secret_id, f"stub.{secret_id}.token")
+
+
+class SecretManagerBackend:
+    """
+    Google Secret Manager. The SDK is imported and the client (gRPC channel)
+    built on first use only, so other backends never pay for it.
+    """
+
+    name = "secret-manager"
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self._client = None
+
+    def get(self, secret_id: str, version_id: str = "latest") -> Optional[str]:
+        from google.cloud import secretmanager
+        from google.api_core.exceptions import NotFound, PermissionDenied
+
+        if self._client is None:
+            self._client = secretmanager.SecretManagerServiceClient()
+
+        name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version_id}"
+        try:
+            resp = self._client.access_secret_version(request={"name": name})
+            return decode_and_normalise_secret(resp.payload.data)
+        except PermissionDenied:
+            raise RuntimeError(f"No access to secret '{secret_id}'. Check IAM permissions.")
+        except NotFound:
+            raise RuntimeError(f"Secret or version not found: {name}")
+
+
+class EncryptedFileCache:
+    """
+    Read-through cache in front of a slower backend.
+
+    Values are stored Fernet-encrypted (key from SECRET_CACHE_KEY) under
+    temp/secret-cache and expire after ``ttl`` seconds via Fernet's own
+    timestamp. Without a key, or without the cryptography package, the
+    cache steps aside and every lookup goes to the wrapped backend.
+    """
+
+    def __init__(self, backend, key: Optional[str], ttl: int, directory: str = SECRET_CACHE_DIR):
+        self.backend = backend
+        self.name = f"cache({backend.name})"
+        self.ttl = ttl
+        self.directory = directory
+        self._fernet = None
+
+        if key:
+            try:
+                from cryptography.fernet import Fernet
+                self._fernet = Fernet(key.encode("utf-8"))
+            except ImportError:
+                print("⚠️ cryptography not installed — secret cache disabled.")
+            except ValueError:
+                print("⚠️ SECRET_CACHE_KEY is not a valid Fernet key — secret cache disabled.")
+
+    def _path(self, secret_id: str, version_id: str) -> str:
+        return os.path.join(self.directory, f"{secret_id}-{version_id}.fernet")
+
+    def _read(self, path: str) -> Optional[str]:
+        from cryptography.fernet import InvalidToken
+
+        try:
+            with open(path, "rb") as f:
+                return self._fernet.decrypt(f.read(), ttl=self.ttl).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except InvalidToken:
+            return None  # expired or written with a different key
+
+    def _write(self, path: str, value: str):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(self._fernet.encrypt(value.encode("utf-8")))
+        os.replace(tmp_path, path)
+
+    def get(self, secret_id: str, version_id: str = "latest") -> Optional[str]:
+        if self._fernet is None:
+            return self.backend.get(secret_id, version_id)
+
+        path = self._path(secret_id, version_id)
+        cached = self._read(path)
+        if cached is not None:
+            return cached
+
+        value = self.backend.get(secret_id, version_id)
+        if value is not None:
+            try:
+                self._write(path, value)
+            except OSError as e:
+                print(f"⚠️ Could not write secret cache {path}: {e}")
+        return value
+
+
+# ---------------------------
+# Provider
+# ---------------------------
+class SecretProvider:
+    """
+    Asks each backend in order and returns the first hit.
+
+    Configure with SECRET_BACKENDS (comma-separated, default "env,secret-manager").
+    "stub" gives an offline provider. Secret Manager is wrapped by the
+    encrypted file cache when SECRET_CACHE_KEY is set (TTL: SECRET_CACHE_TTL
+    seconds, default one day).
+    """
+
+    def __init__(self, backends: List):
+        self.backends = backends
+        self.last_backend: Optional[str] = None
+        self.last_duration = 0.0
+
+    @classmethod
+    def from_env(cls, project_id: str) -> "SecretProvider":
+        names = [n.strip() for n in os.getenv("SECRET_BACKENDS", "env,secret-manager").split(",") if n.strip()]
+        cache_key = os.getenv("SECRET_CACHE_KEY")
+        cache_ttl = int(os.getenv("SECRET_CACHE_TTL", str(24 * 60 * 60)))
+
+        backends = []
+        for name in names:
+            if name == "env":
+                backends.append(EnvSecretBackend())
+            elif name == "stub":
+                backends.append(StubSecretBackend())
+            elif name == "secret-manager":
+                backends.append(EncryptedFileCache(SecretManagerBackend(project_id), cache_key, cache_ttl))
+            else:
+                raise RuntimeError(f"Unknown secret backend '{name}' in SECRET_BACKENDS.")
+        return cls(backends)
+
+    def get(self, secret_id: str, version_id: str = "latest") -> str:
+        started = time.perf_counter()
+        for backend in self.backends:
+            secret_text = backend.get(secret_id, version_id)
+            if not secret_text:
+                continue
+
+            # sanity check: Discord bot tokens are three dot-separated parts.
+            if secret_id.startswith("discord_"):
+                if secret_text.count(".") != 2:
+                    raise RuntimeError(
+                        f"Secret '{secret_id}' does not look like a Discord bot token "
+                        "(expected three dot-separated parts)."
+                    )
+
+            self.last_backend = backend.name
+            self.last_duration = time.perf_counter() - started
+            return secret_text
+
+        raise RuntimeError(
+            f"Secret '{secret_id}' not found in any backend ({', '.join(b.name for b in self.backends)})."
+        )
@@ -0,0 +1,45 @@
+import os
+from typing import Optional
+
+
+class ShardPlan:
+    """
+    How the gateway is sharded. Every shard runs in this one process, which
+    owns every guild.
+
+    Configure with env:
+      BOT_SHARDING=auto   interactions' AutoShardedClient
+                          (BOT_SHARD_COUNT optional, else Discord's recommendation)
+    Unset: a single unsharded client.
+
+    One shard per process is not supported: the war event bus, the indexes
+    fed from it and the war history log live inside one process, so another
+    process would never see the wars this one creates.
+    """
+
+    def __init__(self, auto: bool = False, shard_count: Optional[int] = None):
+        self.auto = auto
+        self.shard_count = shard_count
+
+    @classmethod
+    def from_env(cls) -> "ShardPlan":
+        if os.getenv("BOT_SHARD_ID"):
+            raise RuntimeError(
+                "BOT_SHARD_ID (one shard per process) is not supported; "
+                "use BOT_SHARDING=auto to run every shard in one process."
+            )
+        count = os.getenv("BOT_SHARD_COUNT")
+        return cls(
+            auto=os.getenv("BOT_SHARDING", "").lower() == "auto",
+            shard_count=int(count) if count else None,
+        )
+
+    def client_kwargs(self) -> dict:
+        if self.auto and self.shard_count:
+            return {"total_shards": self.shard_count}
+        return {}
+
+    def __str__(self) -> str:
+        if self.auto:
+            return f"auto-sharded ({self.shard_count or 'recommended'} shards)"
+        return "unsharded"
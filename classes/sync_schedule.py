@@ -0,0 +1,93 @@
+import os
+import time
+from typing import Dict, Optional
+
+# Event rates are averaged over at least this long, so a couple of events
+# right after a pass don't read as a burst
+RATE_WINDOW_SECONDS = 60.0
+
+
+class SyncSchedule:
+    """
+    Picks the gap before the next billboard reconcile pass.
+
+    Idle passes (nothing changed, nothing queued, no events since the last
+    one) double the gap up to ``max_seconds``; a busy period (event rate or
+    outbox depth over its threshold) drops it straight to ``min_seconds``,
+    and anything in between halves it. ``busy`` lets the event consumer
+    cut a long idle wait short once changes start piling up.
+
+    ``avoided`` counts the passes a fixed ``min_seconds`` interval would
+    have run that this schedule skipped.
+
+    Tunables (env):
+      BILLBOARD_SYNC_MIN_SECONDS   shortest gap between passes (default 30)
+      BILLBOARD_SYNC_BUSY_EVENTS   war events per minute that count as busy (default 30)
+      BILLBOARD_SYNC_BUSY_PENDING  queued billboard calls that count as busy (default 50)
+    """
+
+    def __init__(
+        self,
+        max_seconds: float,
+        min_seconds: Optional[float] = None,
+        busy_events: Optional[float] = None,
+        busy_pending: Optional[int] = None,
+    ):
+        self.min_seconds = min_seconds or float(os.getenv("BILLBOARD_SYNC_MIN_SECONDS", "30"))
+        self.max_seconds = max(self.min_seconds, max_seconds)
+        self.busy_events = busy_events or float(os.getenv("BILLBOARD_SYNC_BUSY_EVENTS", "30"))
+        self.busy_pending = busy_pending or int(os.getenv("BILLBOARD_SYNC_BUSY_PENDING", "50"))
+
+        self.interval = self.min_seconds
+        self.last_pass = time.monotonic()
+        self.events = 0  # war events since the last pass
+
+        self.passes = 0
+        self.idle_passes = 0
+        self.avoided = 0.0
+
+    def note_event(self):
+        self.events += 1
+
+    def event_rate(self, now: float) -> float:
+        """War events per minute since the last pass (over at least RATE_WINDOW_SECONDS)."""
+        return self.events / max(now - self.last_pass, RATE_WINDOW_SECONDS) * 60
+
+    def busy(self, pending: int, now: Optional[float] = None) -> bool:
+        """Whether the next pass should come sooner than planned."""
+        now = now or time.monotonic()
+        if self.interval <= self.min_seconds:
+            return False  # already as tight as it goes
+        return pending >= self.busy_pending or self.event_rate(now) >= self.busy_events
+
+    def delay(self, now: Optional[float] = None) -> float:
+        """Seconds until the next pass is due."""
+        now = now or time.monotonic()
+        return max(0.0, self.last_pass + self.interval - now)
+
+    def record_pass(self, changed: int, pending: int, now: Optional[float] = None) -> float:
+        """Adjusts the interval after a pass and returns it."""
+        now = now or time.monotonic()
+        elapsed = now - self.last_pass
+
+        if changed == 0 and pending == 0 and self.events == 0:
+            self.idle_passes += 1
+            self.interval = min(self.max_seconds, self.interval * 2)
+        elif pending >= self.busy_pending or self.event_rate(now) >= self.busy_events:
+            self.interval = self.min_seconds
+        else:
+            self.interval = max(self.min_seconds, self.interval / 2)
+
+        self.passes += 1
+        self.avoided += max(0.0, elapsed / self.min_seconds - 1)
+        self.last_pass = now
+        self.events = 0
+        return self.interval
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "passes": self.passes,
+            "idle_passes": self.idle_passes,
+            "passes_avoided": int(self.avoided),
+        }
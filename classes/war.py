@@ -2,12 +2,36 @@ import uuid
 from datetime import datetime
 from typing import List, Dict, Any
 from classes.player import Player
+from classes.war_time import ASAP, expires_at, parse_hour, parse_start_time, to_timestamp, utc_now
 
+# Bump when the stored shape of a war changes; from_dict migrates older versions.
+# Version 0 is the legacy unversioned JSON billboard format.
+# Version 2 added status/opponent (older wars load as "open").
+# Version 3 made start_time a UTC timestamp and moved the raw "7PM"/"ASAP" text to search_label.
+SCHEMA_VERSION = 3
+
+STATUS_OPEN = "open"
+STATUS_ACCEPTED = "accepted"
 
 
 class War:
     """Represents a Mario Kart Wii war (match) configuration."""
 
+    __slots__ = (
+        "war_id",
+        "war_type",
+        "team_name",
+        "gathered",
+        "search_in_advance",
+        "start_time",
+        "last_updated",
+        "ally_count",
+        "lineup",
+        "status",
+        "opponent",
+        "search_label",
+    )
+
     def __init__(
         self,
         war_type: str,
@@ -19,19 +43,58 @@ class War:
         ally_count: int = 0,
         lineup: List[Player] = None,
         war_id: str = None,
+        status: str = STATUS_OPEN,
+        opponent: str = None,
+        search_label: str = None,
     ):
+        # Only new wars need "now"; loaded wars carry both timestamps
+        now = None if (start_time and last_updated) else utc_now()
+
         self.war_id = war_id or str(uuid.uuid4())
         self.war_type = war_type.upper()
         self.team_name = team_name
         self.gathered = gathered
         self.search_in_advance = search_in_advance
-        self.start_time = start_time or datetime.utcnow().isoformat()
-        self.last_updated = datetime.utcnow().isoformat()
+        self.start_time = start_time or to_timestamp(now)  # canonical UTC timestamp
+        self.last_updated = last_updated or to_timestamp(now)
         self.ally_count = ally_count
         self.lineup = lineup or []
+        self.status = status
+        self.opponent = opponent
+        self.search_label = search_label or (None if start_time else ASAP)  # what the creator typed
+
+    @property
+    def is_open(self) -> bool:
+        return self.status == STATUS_OPEN
+
+    def find_player(self, key: str):
+        for player in self.lineup:
+            if player.key == key:
+                return player
+        return None
+
+    def add_player(self, player: Player):
+        """Appends to the lineup, keeping ally_count in step."""
+        self.lineup.append(player)
+        self.ally_count = sum(1 for p in self.lineup if p.ally)
+
+    def remove_player(self, key: str):
+        """Removes a player by key; returns them, or None if they weren't in the lineup."""
+        player = self.find_player(key)
+        if player is not None:
+            self.lineup.remove(player)
+            self.ally_count = sum(1 for p in self.lineup if p.ally)
+        return player
+
+    def start_datetime(self) -> datetime:
+        return parse_start_time(self.start_time)
+
+    def expires_at(self) -> datetime:
+        return expires_at(self.start_datetime(), self.search_label)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
+            "schema_version": SCHEMA_VERSION,
             "war_id": self.war_id,
             "war_type": self.war_type,
             "team_name": self.team_name,
@@ -41,18 +104,42 @@ class War:
             "last_updated": self.last_updated,
             "ally_count": self.ally_count,
             "lineup": [p.to_dict() for p in self.lineup],
+            "status": self.status,
+            "opponent": self.opponent,
+            "search_label": self.search_label,
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "War":
-        lineup = [Player.from_dict(p) for p in data.get("lineup", [])]
+        version = data.get("schema_version", 0)
+        if version > SCHEMA_VERSION:
+            raise ValueError(
+                f"War {data.get('war_id')} has schema version {version}, "
+                f"newer than supported ({SCHEMA_VERSION})."
+            )
+
+        start_time = data.get("start_time")
+        search_label = data.get("search_label")
+        if version < 3:
+            # Legacy start_time held the raw search text; resolve it against when the war was saved
+            raw = (start_time or "").strip().upper()
+            if not raw or raw == ASAP:
+                search_label = ASAP
+            elif parse_hour(raw) is not None:
+                search_label = raw
+            start_time = to_timestamp(parse_start_time(start_time, data.get("last_updated")))
+
         return cls(
             war_type=data.get("war_type", "RT"),
             team_name=data.get("team_name", ""),
             gathered=data.get("gathered", False),
             search_in_advance=data.get("search_in_advance", False),
-            start_time=data.get("start_time"),
+            start_time=start_time,
+            last_updated=data.get("last_updated"),
             ally_count=data.get("ally_count", 0),
-            lineup=lineup,
+            lineup=[Player.from_dict(p) for p in data.get("lineup", [])],
             war_id=data.get("war_id"),
+            status=data.get("status", STATUS_OPEN),
+            opponent=data.get("opponent"),
+            search_label=search_label,
         )
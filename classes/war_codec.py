@@ -0,0 +1,77 @@
+import json
+from json.encoder import encode_basestring
+from typing import Any, Union
+from classes.player import Player
+from classes.war import SCHEMA_VERSION, War
+
+# orjson is optional: it's several times faster than the stdlib when installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def loads(raw: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _value(value: Any) -> str:
+    """One JSON scalar, written directly (the model only holds str/int/bool/None)."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if isinstance(value, int):
+        return int.__repr__(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _encode_player(player: Player) -> str:
+    return (
+        f'{{"player":{_value(player.player)},"role":{_value(player.role)},'
+        f'"ally":{_value(player.ally)},"user_id":{_value(player.user_id)}}}'
+    )
+
+
+def _encode_war_direct(war: War) -> str:
+    """Writes the JSON straight from the slots, without building War.to_dict first."""
+    return (
+        f'{{"schema_version":{SCHEMA_VERSION},"war_id":{_value(war.war_id)},"war_type":{_value(war.war_type)},'
+        f'"team_name":{_value(war.team_name)},"gathered":{_value(war.gathered)},'
+        f'"search_in_advance":{_value(war.search_in_advance)},"start_time":{_value(war.start_time)},'
+        f'"last_updated":{_value(war.last_updated)},"ally_count":{_value(war.ally_count)},'
+        f'"lineup":[{",".join([_encode_player(player) for player in war.lineup])}],'
+        f'"status":{_value(war.status)},"opponent":{_value(war.opponent)},"search_label":{_value(war.search_label)}}}'
+    )
+
+
+def encode_war(war: War) -> str:
+    """
+    War -> compact versioned JSON (the same document as War.to_dict).
+
+    Without orjson the JSON is written in one pass straight from the slots.
+    orjson encodes the to_dict() form faster than any pure-Python writer,
+    so it keeps that route when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(war.to_dict()).decode("utf-8")
+    return _encode_war_direct(war)
+
+
+def decode_war(raw: Union[str, bytes]) -> War:
+    """Compact JSON (any supported schema version) -> War."""
+    return War.from_dict(loads(raw))
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+
+class WarEvent:
+    """A single change to a stored war, published after it has been committed."""
+
+    CREATED = "war-created"
+    UPDATED = "war-updated"
+    DELETED = "war-deleted"
+
+    __slots__ = ("kind", "war_id", "war_type", "war", "reason")
+
+    def __init__(
+        self,
+        kind: str,
+        war_id: str,
+        war_type: str,
+        war: Optional[Dict[str, Any]] = None,
+        reason: Optional[str] = None,
+    ):
+        self.kind = kind
+        self.war_id = war_id
+        self.war_type = war_type.upper()
+        self.war = war  # war dict for created/updated, None for deleted
+        self.reason = reason  # optional detail, e.g. "joined" or "accepted"
+
+    def __repr__(self) -> str:
+        return f"WarEvent({self.kind}, {self.war_type}, {self.war_id})"
+
+
+class WarEventBus:
+    """
+    In-process fan-out of war changes.
+
+    Each subscriber gets its own unbounded queue, so a slow consumer never
+    blocks publishers or other consumers and events arrive in commit order.
+    """
+
+    def __init__(self):
+        self._subscribers: List[asyncio.Queue] = []
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def pending(self) -> int:
+        """Events published but not yet taken by their subscribers."""
+        return sum(queue.qsize() for queue in self._subscribers)
+
+    def publish(self, event: WarEvent):
+        for queue in self._subscribers:
+            queue.put_nowait(event)
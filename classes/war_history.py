@@ -0,0 +1,296 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from classes.war_codec import dumps, loads
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_HISTORY_DIR = os.path.join(BASE_DIR, "temp", "war-history")
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_SUFFIX = ".jsonl"
+
+# Lifecycle record kinds
+CREATED = "created"
+JOINED = "joined"
+LEFT = "left"
+ACCEPTED = "accepted"
+EXPIRED = "expired"
+DELETED = "deleted"
+
+
+class WarStats:
+    """
+    Running totals over the war history, updated one record at a time.
+
+    teams:   lowercased team name -> {"name", "posted", "matched", "unmatched"}
+    players: player key -> {"name", "wars"}
+    "matched" counts both sides of an accepted war; "unmatched" counts wars
+    that expired without an opponent.
+    """
+
+    __slots__ = ("teams", "players")
+
+    def __init__(self, teams: Optional[Dict[str, dict]] = None, players: Optional[Dict[str, dict]] = None):
+        self.teams = teams or {}
+        self.players = players or {}
+
+    def _team(self, name: str) -> dict:
+        key = (name or "").strip().lower()
+        entry = self.teams.get(key)
+        if entry is None:
+            entry = self.teams[key] = {"name": name, "posted": 0, "matched": 0, "unmatched": 0}
+        return entry
+
+    def _player(self, key: str, name: str) -> dict:
+        entry = self.players.get(key)
+        if entry is None:
+            entry = self.players[key] = {"name": name, "wars": 0}
+        entry["name"] = name or entry["name"]  # latest display name
+        return entry
+
+    def apply(self, record: Dict[str, Any]):
+        kind = record["kind"]
+        if kind == CREATED:
+            self._team(record["team"])["posted"] += 1
+            for key, name in record.get("players", ()):
+                self._player(key, name)["wars"] += 1
+        elif kind == JOINED:
+            for key, name in record["players"]:
+                self._player(key, name)["wars"] += 1
+        elif kind == LEFT:
+            for key, name in record["players"]:
+                entry = self._player(key, name)
+                entry["wars"] = max(0, entry["wars"] - 1)
+        elif kind == ACCEPTED:
+            self._team(record["team"])["matched"] += 1
+            if record.get("opponent"):
+                self._team(record["opponent"])["matched"] += 1
+        elif kind == EXPIRED and not record.get("matched"):
+            self._team(record["team"])["unmatched"] += 1
+
+    def team(self, name: str) -> Optional[dict]:
+        return self.teams.get((name or "").strip().lower())
+
+    def player(self, key: str) -> Optional[dict]:
+        return self.players.get(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "teams": {key: dict(entry) for key, entry in self.teams.items()},
+            "players": {key: dict(entry) for key, entry in self.players.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WarStats":
+        return cls(teams=data.get("teams"), players=data.get("players"))
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class WarLog:
+    """
+    Append-only, segmented log of war lifecycle records, with the WarStats
+    they add up to.
+
+    Records are JSON lines numbered by ``seq``. Appends update the stats
+    immediately and are group-written (one write + fsync per batch) on a
+    dedicated thread. Each segment file is named after its first seq; a new
+    one starts once the current one passes ``segment_bytes``, and on every
+    open, so a torn last line is never appended to.
+
+    Every ``snapshot_every`` records the stats are written to
+    snapshot.json together with the seq they cover, so a restart replays
+    only the segments after it. Segments wholly covered by the snapshot are
+    kept for ``retention_days`` as history, then deleted.
+
+    Tunables (env):
+      WAR_HISTORY_DIR             log directory (default temp/war-history)
+      WAR_HISTORY_SEGMENT_KB      segment size before rolling over (default 4096)
+      WAR_HISTORY_SNAPSHOT_EVERY  records between snapshots (default 5000)
+      WAR_HISTORY_RETENTION_DAYS  how long compacted segments are kept (default 90)
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        segment_bytes: Optional[int] = None,
+        snapshot_every: Optional[int] = None,
+        retention_days: Optional[float] = None,
+    ):
+        self.directory = directory or os.getenv("WAR_HISTORY_DIR") or DEFAULT_HISTORY_DIR
+        self.segment_bytes = segment_bytes or int(os.getenv("WAR_HISTORY_SEGMENT_KB", "4096")) * 1024
+        self.snapshot_every = snapshot_every or int(os.getenv("WAR_HISTORY_SNAPSHOT_EVERY", "5000"))
+        self.retention = (retention_days or float(os.getenv("WAR_HISTORY_RETENTION_DAYS", "90"))) * 86400
+
+        self.stats = WarStats()
+        self.seq = 0  # last seq appended
+        self.snapshot_seq = 0  # last seq covered by snapshot.json
+
+        self._file = None  # current segment (worker thread only)
+        self._file_size = 0
+        self._pending: List[str] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._snapshotting: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="war-history")
+        self._closed = False
+
+    # ---------------------------
+    # Disk layout (worker thread only)
+    # ---------------------------
+    def _segment_path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{first_seq:012d}{SEGMENT_SUFFIX}")
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        """(first seq, path) for every segment, oldest first."""
+        segments = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SEGMENT_SUFFIX) and name[: -len(SEGMENT_SUFFIX)].isdigit():
+                segments.append((int(name[: -len(SEGMENT_SUFFIX)]), os.path.join(self.directory, name)))
+        return sorted(segments)
+
+    def _load(self) -> Tuple[int, int, WarStats, int]:
+        """Reads the snapshot and replays newer records. Returns (seq, snapshot seq, stats, replayed)."""
+        os.makedirs(self.directory, exist_ok=True)
+
+        snapshot_seq, stats = 0, WarStats()
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_FILE), "rb") as f:
+                snapshot = loads(f.read())
+            snapshot_seq, stats = snapshot["seq"], WarStats.from_dict(snapshot["stats"])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ War history snapshot unreadable ({e}); replaying the whole log")
+
+        seq, replayed = snapshot_seq, 0
+        segments = self._segments()
+        for i, (first_seq, path) in enumerate(segments):
+            # Skip segments whose records all precede the snapshot
+            if i + 1 < len(segments) and segments[i + 1][0] <= snapshot_seq + 1:
+                continue
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                    except ValueError:
+                        continue  # torn write at the end of a segment
+                    if record["seq"] <= snapshot_seq:
+                        continue
+                    stats.apply(record)
+                    seq = max(seq, record["seq"])
+                    replayed += 1
+        return seq, snapshot_seq, stats, replayed
+
+    def _roll(self, first_seq: int):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._segment_path(first_seq), "ab")
+        self._file_size = self._file.tell()
+        if self._file_size:
+            self._file.write(b"\n")  # only reused after a torn first record; start on a fresh line
+            self._file_size += 1
+
+    def _write(self, lines: List[str], first_seq: int):
+        if self._file is None or self._file_size >= self.segment_bytes:
+            self._roll(first_seq)
+        data = "".join(lines).encode("utf-8")
+        self._file.write(data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file_size += len(data)
+
+    def _save_snapshot(self, seq: int, stats: Dict[str, Any]):
+        _write_atomic(os.path.join(self.directory, SNAPSHOT_FILE), dumps({"seq": seq, "stats": stats}).encode("utf-8"))
+
+        # Compaction: covered segments only linger for the retention window
+        cutoff = time.time() - self.retention
+        segments = self._segments()
+        for (first_seq, path), (next_seq, _) in zip(segments, segments[1:]):
+            if next_seq > seq + 1:
+                break
+            if self._file is not None and path == self._file.name:
+                continue
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    # ---------------------------
+    # Async API
+    # ---------------------------
+    async def open(self) -> int:
+        """Loads the snapshot and replays the tail. Returns how many records were replayed."""
+        loop = asyncio.get_running_loop()
+        self.seq, self.snapshot_seq, self.stats, replayed = await loop.run_in_executor(self._executor, self._load)
+        return replayed
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Numbers a record, counts it in ``stats`` and queues it for the next write."""
+        self.seq += 1
+        record = {"seq": self.seq, "at": int(time.time()), **record}
+        self.stats.apply(record)
+        self._pending.append(dumps(record) + "\n")
+
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush())
+        if self.seq - self.snapshot_seq >= self.snapshot_every and (
+            self._snapshotting is None or self._snapshotting.done()
+        ):
+            self._snapshotting = asyncio.create_task(self.snapshot())
+        return record
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def _flush(self):
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            lines, self._pending = self._pending, []
+            first_seq = self.seq - len(lines) + 1
+            try:
+                await loop.run_in_executor(self._executor, self._write, lines, first_seq)
+            except OSError as e:
+                print(f"❌ Failed to write {len(lines)} war history record(s): {e}")
+
+    async def snapshot(self):
+        """Writes the stats as of the last appended record, then compacts covered segments."""
+        # The snapshot must not cover records that aren't on disk yet
+        while self._flusher is not None and not self._flusher.done():
+            await self._flusher
+        seq, stats = self.seq, self.stats.to_dict()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._save_snapshot, seq, stats)
+            self.snapshot_seq = seq
+        except OSError as e:
+            print(f"❌ Failed to snapshot war history: {e}")
+
+    async def close(self):
+        """Writes a final snapshot and closes the segment. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.seq != self.snapshot_seq:
+            await self.snapshot()
+        elif self._flusher is not None:
+            await self._flusher
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_file)
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,177 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterator, List, Optional, Tuple
+from classes.matchmaking import MAX_LINEUP
+from classes.war import War
+from classes.war_events import WarEvent
+
+WAR_TYPES = ("RT", "CT")
+
+# Position in the listing order: (start timestamp, war_id)
+Cursor = Tuple[int, str]
+
+
+class ListedWar:
+    """What /list-wars shows for one open war."""
+
+    __slots__ = ("war_id", "war_type", "team_name", "start", "search_label", "lineup_size")
+
+    def __init__(self, war: War):
+        self.war_id = war.war_id
+        self.war_type = war.war_type
+        self.team_name = war.team_name or ""
+        self.start = int(war.start_datetime().timestamp())
+        self.search_label = war.search_label
+        self.lineup_size = len(war.lineup)
+
+    @property
+    def open_slots(self) -> int:
+        return max(0, MAX_LINEUP - self.lineup_size)
+
+    @property
+    def cursor(self) -> Cursor:
+        return (self.start, self.war_id)
+
+
+class WarListIndex:
+    """
+    Open wars in listing order (start time, then war_id), for /list-wars.
+
+    Wars are kept in sorted lists, one per (war type, open slots), so a
+    time window is a bisect and an open-slots filter just skips whole
+    lists; pages are merged lazily from those lists and stop after
+    ``limit`` results. Team name prefixes use a second sorted list per
+    war type; a query walks whichever of the two ranges is smaller (both
+    sizes are bisects). Pages continue from a cursor (the last war shown), so wars
+    added or removed meanwhile don't shift what comes next.
+    """
+
+    def __init__(self):
+        self._wars: Dict[str, ListedWar] = {}
+        self._by_time: Dict[Tuple[str, int], List[Cursor]] = {}  # (war_type, open slots) -> [(start, war_id)]
+        self._by_team: Dict[str, List[Tuple[str, int, str]]] = {}  # war_type -> [(team lower, start, war_id)]
+
+    def __len__(self) -> int:
+        return len(self._wars)
+
+    def get(self, war_id: str) -> Optional[ListedWar]:
+        return self._wars.get(war_id)
+
+    def add(self, war: War):
+        """Indexes a war, or drops it if it's no longer open."""
+        self.remove(war.war_id)
+        if not war.is_open:
+            return
+
+        entry = self._wars[war.war_id] = ListedWar(war)
+        insort(self._by_time.setdefault((entry.war_type, entry.open_slots), []), entry.cursor)
+        insort(self._by_team.setdefault(entry.war_type, []), (entry.team_name.lower(), *entry.cursor))
+
+    def remove(self, war_id: str):
+        entry = self._wars.pop(war_id, None)
+        if entry is None:
+            return
+
+        by_time = self._by_time[(entry.war_type, entry.open_slots)]
+        del by_time[bisect_left(by_time, entry.cursor)]
+        by_team = self._by_team[entry.war_type]
+        del by_team[bisect_left(by_team, (entry.team_name.lower(), *entry.cursor))]
+
+    def apply_event(self, event: WarEvent):
+        if event.kind == WarEvent.DELETED:
+            self.remove(event.war_id)
+        else:
+            self.add(War.from_dict(event.war))
+
+    def query(
+        self,
+        war_type: Optional[str] = None,
+        start_after: Optional[int] = None,
+        start_before: Optional[int] = None,
+        team_prefix: Optional[str] = None,
+        min_open_slots: int = 0,
+        after: Optional[Cursor] = None,
+        limit: int = 10,
+    ) -> Tuple[List[ListedWar], Optional[Cursor]]:
+        """
+        One page of open wars in listing order, starting after ``after``.
+        Returns the page and the cursor for the next one (None on the last page).
+        """
+        war_types = (war_type.upper(),) if war_type else WAR_TYPES
+        min_open_slots = max(0, min(min_open_slots, MAX_LINEUP))
+        lists = [
+            self._by_time[key]
+            for key in ((t, slots) for t in war_types for slots in range(min_open_slots, MAX_LINEUP + 1))
+            if key in self._by_time
+        ]
+        prefix = (team_prefix or "").lower()
+
+        # Walk whichever index narrows things down more: the prefix range or the time window
+        team_ranges = {t: self._prefix_range(t, prefix) for t in war_types} if prefix else None
+        if team_ranges and sum(hi - lo for lo, hi in team_ranges.values()) < self._window_size(
+            lists, start_after, start_before
+        ):
+            matches = self._team_matches(team_ranges, start_after, start_before, min_open_slots, after)
+            cursors = heapq.nsmallest(limit + 1, matches)
+        else:
+            cursors = []
+            for cursor in self._time_matches(lists, start_after, after):
+                if start_before is not None and cursor[0] >= start_before:
+                    break
+                if prefix and not self._wars[cursor[1]].team_name.lower().startswith(prefix):
+                    continue
+                cursors.append(cursor)
+                if len(cursors) > limit:
+                    break
+
+        page = [self._wars[war_id] for _, war_id in cursors[:limit]]
+        return page, (page[-1].cursor if len(cursors) > limit else None)
+
+    def _prefix_range(self, war_type: str, prefix: str) -> Tuple[int, int]:
+        entries = self._by_team.get(war_type, [])
+        return bisect_left(entries, (prefix,)), bisect_left(entries, (prefix + "\U0010ffff",))
+
+    @staticmethod
+    def _window_size(lists: List[List[Cursor]], start_after: Optional[int], start_before: Optional[int]) -> int:
+        size = 0
+        for entries in lists:
+            lo = bisect_left(entries, (start_after, "")) if start_after is not None else 0
+            hi = bisect_left(entries, (start_before, "")) if start_before is not None else len(entries)
+            size += hi - lo
+        return size
+
+    @staticmethod
+    def _time_matches(
+        lists: List[List[Cursor]],
+        start_after: Optional[int],
+        after: Optional[Cursor],
+    ) -> Iterator[Cursor]:
+        def tail(entries: List[Cursor]) -> Iterator[Cursor]:
+            i = bisect_left(entries, (start_after, "")) if start_after is not None else 0
+            if after is not None:
+                i = max(i, bisect_right(entries, after))
+            return (entries[j] for j in range(i, len(entries)))
+
+        return heapq.merge(*(tail(entries) for entries in lists))
+
+    def _team_matches(
+        self,
+        team_ranges: Dict[str, Tuple[int, int]],
+        start_after: Optional[int],
+        start_before: Optional[int],
+        min_open_slots: int,
+        after: Optional[Cursor],
+    ) -> Iterator[Cursor]:
+        for war_type, (lo, hi) in team_ranges.items():
+            entries = self._by_team[war_type] if hi > lo else ()
+            for i in range(lo, hi):
+                _, start, war_id = entries[i]
+                if start_after is not None and start < start_after:
+                    continue
+                if start_before is not None and start >= start_before:
+                    continue
+                if after is not None and (start, war_id) <= after:
+                    continue
+                if self._wars[war_id].open_slots < min_open_slots:
+                    continue
+                yield (start, war_id)
@@ -0,0 +1,587 @@
+import os
+import sys
+import json
+import asyncio
+import sqlite3
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from classes.metrics import STORE_BATCH_SIZE, STORE_SECONDS
+from classes.war import War
+from classes.war_codec import decode_war, encode_war
+from classes.war_time import to_timestamp, utc_now
+from classes.war_events import WarEvent, WarEventBus
+
+# ---------------------------
+# Paths
+# ---------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BILLBOARD_DIR = os.path.join(BASE_DIR, "temp", "billboard-data")
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, "temp", "war-store.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wars (
+    war_id       TEXT PRIMARY KEY,
+    war_type     TEXT NOT NULL,
+    start_time   TEXT,
+    last_updated TEXT,
+    data         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_wars_type_start ON wars (war_type, start_time);
+CREATE INDEX IF NOT EXISTS idx_wars_start ON wars (start_time);
+
+CREATE TABLE IF NOT EXISTS billboard_messages (
+    channel_id   INTEGER NOT NULL,
+    message_key  TEXT NOT NULL,
+    message_id   INTEGER NOT NULL,
+    content_hash TEXT,
+    PRIMARY KEY (channel_id, message_key)
+);
+
+-- Bumped in the same transaction as every write, one counter per war type
+CREATE TABLE IF NOT EXISTS war_revisions (
+    war_type     TEXT PRIMARY KEY,
+    revision     INTEGER NOT NULL,
+    pruned_below INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS war_tombstones (
+    war_id   TEXT PRIMARY KEY,
+    war_type TEXT NOT NULL,
+    revision INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_type_rev ON war_tombstones (war_type, revision);
+
+-- Which channel shows each guild's RT/CT billboard (a channel hosts at most one)
+CREATE TABLE IF NOT EXISTS guild_billboards (
+    guild_id   INTEGER NOT NULL,
+    war_type   TEXT NOT NULL,
+    channel_id INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, war_type)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_guild_billboards_channel ON guild_billboards (channel_id);
+"""
+
+# Deletions remembered per war type for incremental readers; older readers fall back to a full load
+TOMBSTONE_RETENTION = 1000
+
+# Most writes committed together in one transaction (see WarStore._write)
+WRITE_BATCH_MAX = 256
+
+
+class WarChanges:
+    """
+    Result of WarStore.changes_since: every war added or changed after a
+    revision, plus the IDs removed since then. ``full`` means ``wars`` is
+    the complete set (the reader had no revision, or fell too far behind).
+    """
+
+    __slots__ = ("revision", "wars", "removed", "full")
+
+    def __init__(self, revision: int, wars: List[War], removed: List[str], full: bool):
+        self.revision = revision
+        self.wars = wars
+        self.removed = removed
+        self.full = full
+
+
+class WarStore:
+    """
+    SQLite (WAL mode) storage for wars, shared by all cogs.
+
+    Every query runs on a single dedicated worker thread, so writes are
+    serialised and never block the event loop.
+
+    Writes are group-committed: every write queued while the previous batch
+    was on the disk goes out in the next single transaction (each in its own
+    savepoint, so one failing write doesn't undo the others). A burst of
+    /create-new-war calls costs one commit instead of one per war.
+
+    When an event bus is attached, every committed insert, update and delete
+    is published on it, so no handler can change a war without the billboard
+    hearing about it.
+
+    Tunables (env):
+      WAR_STORE_PATH          database file (default temp/war-store.sqlite3)
+      WAR_STORE_SYNCHRONOUS   SQLite synchronous mode (default NORMAL; FULL fsyncs every commit)
+    """
+
+    def __init__(self, path: Optional[str] = None, events: Optional[WarEventBus] = None):
+        self.path = path or os.getenv("WAR_STORE_PATH") or DEFAULT_DB_PATH
+        self.events = events
+        self._conn: Optional[sqlite3.Connection] = None
+
+        # Cached war_revisions, valid until we write or PRAGMA data_version says another connection did
+        self._revisions: Optional[Dict[str, Tuple[int, int]]] = None
+        self._data_version: Optional[int] = None
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="war-store")
+
+        # Group commit: (fn, args, future) waiting for the next batch, and the task flushing them
+        self._writes: List[tuple] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._in_batch = False  # worker thread only
+
+    # ---------------------------
+    # Connection / Transactions
+    # ---------------------------
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={os.getenv('WAR_STORE_SYNCHRONOUS', 'NORMAL').upper()}")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(wars)")}
+        if "revision" not in columns:
+            conn.execute("ALTER TABLE wars ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_wars_type_rev ON wars (war_type, revision)")
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        if self._in_batch:
+            # Inside a group commit: a savepoint, so a failure only undoes this write
+            conn.execute("SAVEPOINT write")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK TO write")
+                conn.execute("RELEASE write")
+                raise
+            else:
+                conn.execute("RELEASE write")
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        self._revisions = None
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            self._commit(conn)
+
+    @staticmethod
+    def _commit(conn: sqlite3.Connection):
+        """COMMIT, rolling back if it fails so the connection is never left inside a transaction."""
+        try:
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                try:
+                    conn.execute("ROLLBACK")
+                except sqlite3.Error:
+                    pass  # the original error is the one worth reporting
+            raise
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, war_type: str) -> int:
+        conn.execute(
+            "INSERT INTO war_revisions (war_type, revision) VALUES (?, 1) "
+            "ON CONFLICT (war_type) DO UPDATE SET revision = revision + 1",
+            (war_type,),
+        )
+        return conn.execute("SELECT revision FROM war_revisions WHERE war_type = ?", (war_type,)).fetchone()[0]
+
+    def _tombstone(self, conn: sqlite3.Connection, war_id: str, war_type: str):
+        revision = self._bump(conn, war_type)
+        conn.execute(
+            "INSERT OR REPLACE INTO war_tombstones (war_id, war_type, revision) VALUES (?, ?, ?)",
+            (war_id, war_type, revision),
+        )
+
+        floor = revision - TOMBSTONE_RETENTION
+        if floor > 0:
+            pruned = conn.execute(
+                "DELETE FROM war_tombstones WHERE war_type = ? AND revision < ?", (war_type, floor)
+            ).rowcount
+            if pruned:
+                conn.execute("UPDATE war_revisions SET pruned_below = ? WHERE war_type = ?", (floor, war_type))
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        with STORE_SECONDS.time(op=fn.__name__.lstrip("_")):
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _write(self, fn, *args):
+        """Queues a write for the next group commit and waits for it to be committed."""
+        future = asyncio.get_running_loop().create_future()
+        self._writes.append((fn, args, future))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_writes())
+        with STORE_SECONDS.time(op=fn.__name__.lstrip("_")):
+            return await future
+
+    async def _flush_writes(self):
+        loop = asyncio.get_running_loop()
+        while self._writes:
+            batch, self._writes = self._writes[:WRITE_BATCH_MAX], self._writes[WRITE_BATCH_MAX:]
+            STORE_BATCH_SIZE.observe(len(batch))
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._commit_batch, [(fn, args) for fn, args, _ in batch]
+                )
+            except Exception as e:
+                results = [(e, None)] * len(batch)  # the commit itself failed: nothing was saved
+
+            for (_, _, future), (error, result) in zip(batch, results):
+                if future.done():
+                    continue  # caller was cancelled; the write still happened
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _commit_batch(self, writes: List[tuple]) -> List[tuple]:
+        """Runs queued writes in one transaction. Returns (error, result) per write."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        self._revisions = None
+        self._in_batch = True
+        results = []
+        try:
+            for fn, args in writes:
+                try:
+                    results.append((None, fn(*args)))
+                except Exception as e:
+                    results.append((e, None))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            self._commit(conn)  # if this raises, _flush_writes fails every write in the batch
+        finally:
+            self._in_batch = False
+        return results
+
+    @staticmethod
+    def _row_values(war: War):
+        return (
+            war.war_id,
+            war.war_type,
+            war.start_time,
+            war.last_updated,
+            encode_war(war),
+        )
+
+    # ---------------------------
+    # Sync implementations (worker thread only)
+    # ---------------------------
+    def _insert_row(self, conn: sqlite3.Connection, war: War) -> bool:
+        if conn.execute("SELECT 1 FROM wars WHERE war_id = ?", (war.war_id,)).fetchone():
+            return False
+        conn.execute(
+            "INSERT INTO wars (war_id, war_type, start_time, last_updated, data, revision) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            self._row_values(war) + (self._bump(conn, war.war_type),),
+        )
+        conn.execute("DELETE FROM war_tombstones WHERE war_id = ?", (war.war_id,))
+        return True
+
+    def _insert(self, war: War) -> bool:
+        with self._transaction() as conn:
+            return self._insert_row(conn, war)
+
+    def _update(self, war: War) -> bool:
+        war_id, war_type, start_time, last_updated, data = self._row_values(war)
+        with self._transaction() as conn:
+            row = conn.execute("SELECT war_type FROM wars WHERE war_id = ?", (war_id,)).fetchone()
+            if row is None:
+                return False
+            if row[0] != war_type:
+                # Moved between billboards: readers of the old type must see it disappear
+                self._tombstone(conn, war_id, row[0])
+            conn.execute(
+                "UPDATE wars SET war_type = ?, start_time = ?, last_updated = ?, data = ?, revision = ? "
+                "WHERE war_id = ?",
+                (war_type, start_time, last_updated, data, self._bump(conn, war_type), war_id),
+            )
+            return True
+
+    def _delete(self, war_id: str) -> Optional[str]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT war_type FROM wars WHERE war_id = ?", (war_id,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("DELETE FROM wars WHERE war_id = ?", (war_id,))
+            self._tombstone(conn, war_id, row[0])
+            return row[0]
+
+    def _modify(self, war_id: str, mutate: Callable[[War], bool]) -> Optional[War]:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM wars WHERE war_id = ?", (war_id,)).fetchone()
+            if row is None:
+                return None
+            war = decode_war(row[0])
+            if not mutate(war):
+                return None
+            war.last_updated = to_timestamp(utc_now())
+            _, war_type, start_time, last_updated, data = self._row_values(war)
+            conn.execute(
+                "UPDATE wars SET war_type = ?, start_time = ?, last_updated = ?, data = ?, revision = ? "
+                "WHERE war_id = ?",
+                (war_type, start_time, last_updated, data, self._bump(conn, war_type), war_id),
+            )
+            return war
+
+    def _revision(self, war_type: str) -> Tuple[int, int]:
+        """(revision, pruned_below) for a war type; O(1) and usually served from memory."""
+        conn = self._connect()
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._revisions is None or data_version != self._data_version:
+            rows = conn.execute("SELECT war_type, revision, pruned_below FROM war_revisions").fetchall()
+            self._revisions = {t: (rev, floor) for t, rev, floor in rows}
+            self._data_version = data_version
+        return self._revisions.get(war_type, (0, 0))
+
+    def _changes_since(self, war_type: str, since: Optional[int]) -> WarChanges:
+        conn = self._connect()
+        conn.execute("BEGIN")  # one read snapshot for revision + rows
+        try:
+            self._revisions = None
+            revision, pruned_below = self._revision(war_type)
+
+            if since is None or since < pruned_below or since > revision:
+                rows = conn.execute(
+                    "SELECT data FROM wars WHERE war_type = ? ORDER BY start_time, war_id", (war_type,)
+                ).fetchall()
+                return WarChanges(revision, [decode_war(r[0]) for r in rows], [], full=True)
+
+            if since == revision:
+                return WarChanges(revision, [], [], full=False)
+
+            rows = conn.execute(
+                "SELECT data FROM wars WHERE war_type = ? AND revision > ? ORDER BY start_time, war_id",
+                (war_type, since),
+            ).fetchall()
+            removed = conn.execute(
+                "SELECT war_id FROM war_tombstones WHERE war_type = ? AND revision > ?", (war_type, since)
+            ).fetchall()
+            return WarChanges(revision, [decode_war(r[0]) for r in rows], [r[0] for r in removed], full=False)
+        finally:
+            conn.execute("COMMIT")
+
+    def _select(self, where: str = "", params: tuple = ()) -> List[War]:
+        rows = self._connect().execute(
+            f"SELECT data FROM wars {where} ORDER BY start_time, war_id", params
+        ).fetchall()
+        return [decode_war(row[0]) for row in rows]
+
+    def _import_json_dir(self, directory: str) -> int:
+        imported = 0
+        with self._transaction() as conn:
+            for war_type in ("rt", "ct"):
+                path = os.path.join(directory, f"{war_type}-billboard.json")
+                if not os.path.exists(path):
+                    continue
+
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except json.JSONDecodeError:
+                    print(f"⚠️ {war_type.upper()} billboard JSON is corrupted, skipping import.")
+                    continue
+
+                for raw in data if isinstance(data, list) else []:
+                    imported += self._insert_row(conn, War.from_dict(raw))
+        return imported
+
+    def _set_message(self, channel_id: int, key: str, message_id: int, content_hash: Optional[str]):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO billboard_messages (channel_id, message_key, message_id, content_hash) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (channel_id, message_key) DO UPDATE SET "
+                "message_id = excluded.message_id, content_hash = excluded.content_hash",
+                (channel_id, key, message_id, content_hash),
+            )
+
+    def _delete_message(self, channel_id: int, key: str):
+        with self._transaction() as conn:
+            conn.execute(
+                "DELETE FROM billboard_messages WHERE channel_id = ? AND message_key = ?",
+                (channel_id, key),
+            )
+
+    def _clear_messages(self, channel_id: int):
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM billboard_messages WHERE channel_id = ?", (channel_id,))
+
+    def _list_messages(self, channel_id: int) -> Dict[str, Tuple[int, Optional[str]]]:
+        rows = self._connect().execute(
+            "SELECT message_key, message_id, content_hash FROM billboard_messages WHERE channel_id = ?",
+            (channel_id,),
+        ).fetchall()
+        return {key: (message_id, content_hash) for key, message_id, content_hash in rows}
+
+    def _set_billboard(self, guild_id: int, war_type: str, channel_id: int) -> Optional[int]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT channel_id FROM guild_billboards WHERE guild_id = ? AND war_type = ?",
+                (guild_id, war_type),
+            ).fetchone()
+            # Moving a channel to another billboard frees it from the old one
+            conn.execute("DELETE FROM guild_billboards WHERE channel_id = ?", (channel_id,))
+            conn.execute(
+                "INSERT INTO guild_billboards (guild_id, war_type, channel_id) VALUES (?, ?, ?) "
+                "ON CONFLICT (guild_id, war_type) DO UPDATE SET channel_id = excluded.channel_id",
+                (guild_id, war_type, channel_id),
+            )
+        return row[0] if row else None
+
+    def _remove_billboard(self, guild_id: int, war_type: str) -> Optional[int]:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT channel_id FROM guild_billboards WHERE guild_id = ? AND war_type = ?",
+                (guild_id, war_type),
+            ).fetchone()
+            conn.execute("DELETE FROM guild_billboards WHERE guild_id = ? AND war_type = ?", (guild_id, war_type))
+        return row[0] if row else None
+
+    def _list_billboards(self) -> List[Tuple[int, str, int]]:
+        return self._connect().execute(
+            "SELECT guild_id, war_type, channel_id FROM guild_billboards ORDER BY guild_id, war_type"
+        ).fetchall()
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _publish(self, kind: str, war_id: str, war_type: str, war: Optional[War] = None, reason: Optional[str] = None):
+        if self.events is not None:
+            self.events.publish(WarEvent(kind, war_id, war_type, war.to_dict() if war else None, reason))
+
+    # ---------------------------
+    # Async API
+    # ---------------------------
+    async def insert(self, war: War) -> bool:
+        """Adds a new war. Returns False if a war with the same ID already exists."""
+        inserted = await self._write(self._insert, war)
+        if inserted:
+            self._publish(WarEvent.CREATED, war.war_id, war.war_type, war)
+        return inserted
+
+    async def update(self, war: War, reason: Optional[str] = None) -> bool:
+        """Replaces an existing war and bumps its last_updated. Returns False if it doesn't exist."""
+        war.last_updated = to_timestamp(utc_now())
+        updated = await self._write(self._update, war)
+        if updated:
+            self._publish(WarEvent.UPDATED, war.war_id, war.war_type, war, reason)
+        return updated
+
+    async def modify(self, war_id: str, mutate: Callable[[War], bool], reason: Optional[str] = None) -> Optional[War]:
+        """
+        Atomic read-modify-write of one war. ``mutate`` runs inside the write
+        transaction (on the store thread, so it must not await) and returns
+        False to leave the war untouched. Returns the saved war, or None if the
+        war doesn't exist or ``mutate`` declined.
+        """
+        war = await self._write(self._modify, war_id, mutate)
+        if war is not None:
+            self._publish(WarEvent.UPDATED, war.war_id, war.war_type, war, reason)
+        return war
+
+    async def delete(self, war_id: str, reason: Optional[str] = None) -> bool:
+        war_type = await self._write(self._delete, war_id)
+        if war_type is None:
+            return False
+        self._publish(WarEvent.DELETED, war_id, war_type, reason=reason)
+        return True
+
+    async def get(self, war_id: str) -> Optional[War]:
+        wars = await self._run(self._select, "WHERE war_id = ?", (war_id,))
+        return wars[0] if wars else None
+
+    async def list_by_type(self, war_type: str) -> List[War]:
+        return await self._run(self._select, "WHERE war_type = ?", (war_type.upper(),))
+
+    async def list_by_start_time(self, start: str, end: str, war_type: Optional[str] = None) -> List[War]:
+        """Wars with start_time in [start, end), optionally limited to one war type."""
+        if war_type:
+            return await self._run(
+                self._select,
+                "WHERE war_type = ? AND start_time >= ? AND start_time < ?",
+                (war_type.upper(), start, end),
+            )
+        return await self._run(self._select, "WHERE start_time >= ? AND start_time < ?", (start, end))
+
+    async def revision(self, war_type: str) -> int:
+        """
+        Change counter for one war type. Costs one PRAGMA when nothing has
+        changed, so idle pollers can skip loading entirely.
+        """
+        revision, _ = await self._run(self._revision, war_type.upper())
+        return revision
+
+    async def changes_since(self, war_type: str, since: Optional[int]) -> WarChanges:
+        """Wars added/changed and IDs removed after ``since`` (a full snapshot when ``since`` is None)."""
+        return await self._run(self._changes_since, war_type.upper(), since)
+
+    # ---------------------------
+    # Billboard message map
+    # ---------------------------
+    async def set_message(self, channel_id: int, key: str, message_id: int, content_hash: Optional[str] = None):
+        """Records which Discord message currently shows ``key`` and the content hash it was rendered from."""
+        await self._write(self._set_message, channel_id, key, message_id, content_hash)
+
+    async def delete_message(self, channel_id: int, key: str):
+        await self._write(self._delete_message, channel_id, key)
+
+    async def clear_messages(self, channel_id: int):
+        """Forgets every tracked message in a channel."""
+        await self._write(self._clear_messages, channel_id)
+
+    async def list_messages(self, channel_id: int) -> Dict[str, Tuple[int, Optional[str]]]:
+        """key -> (message_id, content_hash) for every tracked message in a channel."""
+        return await self._run(self._list_messages, channel_id)
+
+    # ---------------------------
+    # Per-guild billboard config
+    # ---------------------------
+    async def set_billboard(self, guild_id: int, war_type: str, channel_id: int) -> Optional[int]:
+        """Points a guild's RT/CT billboard at a channel. Returns the channel it replaced, if any."""
+        return await self._write(self._set_billboard, guild_id, war_type.upper(), channel_id)
+
+    async def remove_billboard(self, guild_id: int, war_type: str) -> Optional[int]:
+        """Unconfigures a guild's RT/CT billboard. Returns its channel, if it had one."""
+        return await self._write(self._remove_billboard, guild_id, war_type.upper())
+
+    async def list_billboards(self) -> List[Tuple[int, str, int]]:
+        """(guild_id, war_type, channel_id) for every configured billboard."""
+        return await self._run(self._list_billboards)
+
+    async def import_json_dir(self, directory: str = BILLBOARD_DIR) -> int:
+        """One-shot import of the legacy {rt,ct}-billboard.json files. Safe to re-run."""
+        return await self._run(self._import_json_dir, directory)
+
+    async def close(self):
+        if self._flusher is not None:
+            await self._flusher  # commit anything still queued
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+
+# ---------------------------
+# One-shot JSON importer
+#   python -m classes.war_store [billboard-dir]
+# ---------------------------
+async def _import_main(directory: str):
+    store = WarStore()
+    try:
+        imported = await store.import_json_dir(directory)
+        print(f"Imported {imported} wars from {directory} into {store.path}")
+    finally:
+        await store.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_import_main(sys.argv[1] if len(sys.argv) > 1 else BILLBOARD_DIR))
@@ -0,0 +1,112 @@
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+# Times are entered in ET (GMT-5), as /create-new-war documents
+ET = timezone(timedelta(hours=-5))
+
+ASAP = "ASAP"
+
+# How long a war stays on the billboard after its start time
+ASAP_TTL = timedelta(minutes=int(os.getenv("WAR_ASAP_TTL_MINUTES", "60")))
+SCHEDULED_GRACE = timedelta(minutes=int(os.getenv("WAR_EXPIRY_GRACE_MINUTES", "30")))
+
+_HOUR_12 = re.compile(r"(1[0-2]|[1-9])(AM|PM)")
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def to_timestamp(dt: datetime) -> str:
+    """Canonical stored form: second-precision ISO 8601 in UTC, so strings sort chronologically."""
+    return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def parse_hour(raw: str) -> Optional[int]:
+    """"19" / "7PM" / "11AM" -> hour of day (0-23); None if it isn't one of those formats."""
+    raw = raw.strip().upper()
+    if raw.isdigit():
+        hour = int(raw)
+        return hour if 0 <= hour <= 23 else None
+
+    match = _HOUR_12.fullmatch(raw)
+    if match:
+        hour = int(match.group(1)) % 12
+        return hour + 12 if match.group(2) == "PM" else hour
+    return None
+
+
+def parse_search_time(raw: Optional[str], now: Optional[datetime] = None) -> Tuple[datetime, str]:
+    """
+    Resolves a /create-new-war search time to (UTC start, display label).
+
+    An hour means its next occurrence in ET: today, or tomorrow if today's
+    would already be past its expiry grace (so the current hour still means
+    today for the first SCHEDULED_GRACE minutes). ASAP (or nothing) means now.
+    Raises ValueError for anything else.
+    """
+    now = now or utc_now()
+    label = (raw or ASAP).strip().upper()
+    if label == ASAP:
+        return now, ASAP
+
+    hour = parse_hour(label)
+    if hour is None:
+        raise ValueError(f"Invalid search time: {raw!r}")
+
+    local_now = now.astimezone(ET)
+    start = local_now.replace(hour=hour, minute=0, second=0, microsecond=0)
+    if start + SCHEDULED_GRACE <= local_now:
+        start += timedelta(days=1)
+    return start.astimezone(timezone.utc), label
+
+
+def parse_time_filter(raw: Optional[str], now: Optional[datetime] = None) -> datetime:
+    """
+    Resolves a /list-wars time filter to a UTC timestamp.
+
+    An hour means its occurrence in ET nearest to now, past or future: at
+    20:05 "19" is today's 19:00 (so tonight's later wars still match) while
+    "2" is tomorrow's 02:00. ASAP (or nothing) means now. Raises ValueError
+    for anything else.
+    """
+    now = now or utc_now()
+    label = (raw or ASAP).strip().upper()
+    if label == ASAP:
+        return now
+
+    hour = parse_hour(label)
+    if hour is None:
+        raise ValueError(f"Invalid search time: {raw!r}")
+
+    today = now.astimezone(ET).replace(hour=hour, minute=0, second=0, microsecond=0)
+    nearest = min((today + timedelta(days=d) for d in (-1, 0, 1)), key=lambda t: abs(t - now))
+    return nearest.astimezone(timezone.utc)
+
+
+def parse_start_time(value: Optional[str], reference: Optional[str] = None) -> datetime:
+    """
+    Stored start_time -> aware UTC datetime. Naive ISO values are UTC; legacy
+    labels ("ASAP", "19", "7PM") resolve relative to ``reference`` (usually
+    the war's last_updated).
+    """
+    if value:
+        try:
+            parsed = datetime.fromisoformat(value)
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+
+    ref = parse_start_time(reference) if reference else utc_now()
+    try:
+        start, _ = parse_search_time(value, now=ref)
+    except ValueError:
+        start = ref
+    return start
+
+
+def expires_at(start: datetime, label: str) -> datetime:
+    """When a war with this start time stops being worth showing."""
+    return start + (ASAP_TTL if label == ASAP else SCHEDULED_GRACE)
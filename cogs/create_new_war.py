@@ -1,10 +1,12 @@
-import json
 import os
-import re
 import interactions
 from typing import Optional
+from classes.lineup_index import LineupIndex
+from classes.metrics import timed
 from classes.player import Player
 from classes.war import War
+from classes.war_store import WarStore
+from classes.war_time import ASAP, parse_search_time, to_timestamp
 from interactions import (
     Extension,
     SlashContext,
@@ -23,14 +25,11 @@ DEV = PROJECT_ENV == "local"
 GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
 SCOPES = [GUILD_ID] if DEV else None
 
-RT_CHANNEL_ID = os.getenv("RT_WAR_ID")
-CT_CHANNEL_ID = os.getenv("CT_WAR_ID")
-
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
 class CreateNewWar(Extension):
-    def __init__(self, bot: interactions.Client):
+    def __init__(self, bot: interactions.Client, store: WarStore, lineups: LineupIndex):
         self.bot = bot
+        self.store = store
+        self.lineups = lineups  # maintained by the lineup extension
 
     @slash_command(
         name="create-new-war",
@@ -65,6 +64,7 @@ class CreateNewWar(Extension):
         required=False,
         opt_type=OptionType.BOOLEAN
     )
+    @timed("create-new-war")
     async def create_new_war(
         self,
         ctx: SlashContext,
@@ -76,42 +76,24 @@ class CreateNewWar(Extension):
 
         # Track type
         is_ct = (track_type or "RT").upper() == "CT"
-        target_channel_id = CT_CHANNEL_ID if is_ct else RT_CHANNEL_ID
         track_label = "CT" if is_ct else "RT"
 
         # Team name
         if not team_name:
             team_name = ctx.guild.name if ctx.guild else "Unknown Server"
 
-        # Search time
-        if not search_time:
-            search_time = "ASAP"
-        else:
-            raw_input = search_time.strip().upper()
-
-            if raw_input.isdigit():
-                hour = int(raw_input)
-                if hour < 0 or hour > 23:
-                    await ctx.send(
-                        "Invalid time. Please enter **0–23**, or **7PM / 11AM**.",
-                        ephemeral=True
-                    )
-                    return
-                else:
-                    search_time = raw_input
-
-            elif re.fullmatch(r"(1[0-2]|[1-9])(AM|PM)", raw_input):
-                search_time = raw_input
-
-            else:
-                await ctx.send(
-                    "Invalid time format.\n\n Valid examples:\n"
-                    "- `0` → `23`\n"
-                    "- `7PM`\n"
-                    "- `11AM`\n\nAll times are ET (GMT-5).",
-                    ephemeral=True
-                )
-                return
+        # Resolve the ET label to an absolute UTC start so the war can expire
+        try:
+            start, search_label = parse_search_time(search_time)
+        except ValueError:
+            await ctx.send(
+                "Invalid time format.\n\n Valid examples:\n"
+                "- `0` → `23`\n"
+                "- `7PM`\n"
+                "- `11AM`\n\nAll times are ET (GMT-5).",
+                ephemeral=True
+            )
+            return
 
         # Bagger flag
         if is_bagger is None:
@@ -119,53 +101,63 @@ class CreateNewWar(Extension):
 
         user_id = ctx.author.id
 
+        # Using display name for now, will likely link with lounge in the future
+        creation_player = Player(
+            ctx.author.display_name,
+            role="Bagger" if is_bagger else "Runner",
+            ally=False,
+            user_id=user_id,
+        )
+
+        # The creator goes straight into the lineup, so they can't already be booked then.
+        # Reserved like a join until the war is indexed, so a concurrent join can't slip in
+        if not self.lineups.reserve(creation_player.key):
+            return await ctx.send("Still processing your last join — try again in a moment.", ephemeral=True)
+
+        try:
+            clash = self.lineups.conflict(creation_player.key, start.timestamp())
+            if clash:
+                await ctx.send(
+                    f"You're already in war `{clash}` at that time — `/leave-war` it first.",
+                    ephemeral=True
+                )
+                return
+
+            creation_war = War(
+                war_type=track_label,
+                team_name=team_name,
+                start_time=to_timestamp(start),
+                search_label=search_label,
+                search_in_advance=search_label != ASAP,
+            )
+            creation_war.add_player(creation_player)
+
+            # Single atomic insert — concurrent creations can no longer overwrite each other
+            try:
+                inserted = await self.store.insert(creation_war)
+            except Exception as e:
+                print(f"❌ Failed to store new {track_label} war: {e}")
+                inserted = False
+            if not inserted:
+                await ctx.send("Couldn't create the war — please try again.", ephemeral=True)
+                return
+
+            self.lineups.add(creation_war)
+        finally:
+            self.lineups.release(creation_player.key)
+
+        print(f"Added {track_label} war {creation_war.war_id} to the war store")
+
         await ctx.send(
             f"Command received in **{team_name}**.\n"
             f"Track type: **{track_label}**\n"
             f"Bagger: **{is_bagger}**\n"
-            f"Search time: **{search_time}**\n"
+            f"Search time: **{search_label}**\n"
             f"Your user ID is `{user_id}`.",
             ephemeral=True
         )
 
 
-        print(search_time)
-
-        # Using display name for now, will likely link with lounge in the future
-        creation_player = Player(ctx.author.display_name, role="Bagger" if is_bagger else "Runner", ally=False)
-        creation_war = War(war_type=track_label, team_name=team_name, start_time=search_time, search_in_advance=False if search_time=="ASAP" else True)
-        creation_war.lineup.append(creation_player)
-        billboard_path = (os.path.join(BASE_DIR, 'temp', 'billboard-data','ct-billboard.json') if is_ct else os.path.join(BASE_DIR, 'temp', 'billboard-data', 'rt-billboard.json'))
-
-
-        # Load existing data (if any)
-        if os.path.exists(billboard_path):
-            with open(billboard_path, "r", encoding="utf-8") as f:
-                try:
-                    existing_data = json.load(f)
-                    if not isinstance(existing_data, list):
-                        existing_data = []
-                except json.JSONDecodeError:
-                    existing_data = []
-        else:
-            existing_data = []
-
-        # Append the new war dict
-        existing_data.append(creation_war.to_dict())
-
-        # Write back to JSON file
-        os.makedirs(os.path.dirname(billboard_path), exist_ok=True)
-        with open(billboard_path, "w", encoding="utf-8") as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
-
-        print(f"Added war to {billboard_path}")
-
-        # Post to the appropriate billboard channel
-        try:
-            channel = await self.bot.fetch_channel(target_channel_id)
-        except Exception as e:
-            print(f"Error sending to target channel {target_channel_id}: {e}")
-
-def setup(bot: interactions.Client):
-    CreateNewWar(bot)
+def setup(bot: interactions.Client, store: WarStore, lineups: LineupIndex):
+    CreateNewWar(bot, store, lineups)
 
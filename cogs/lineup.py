@@ -0,0 +1,199 @@
+import os
+import asyncio
+import interactions
+from typing import Optional
+from classes.lineup_index import LineupIndex
+from classes.matchmaking import MAX_LINEUP
+from classes.metrics import timed
+from classes.player import Player
+from classes.war_events import WarEventBus
+from classes.war_store import WarStore
+from interactions import (
+    Extension,
+    SlashContext,
+    slash_command,
+    slash_option,
+    listen,
+    OptionType,
+)
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+PROJECT_ENV = os.getenv("PROJECT_ENVIRONMENT", "local").lower()
+DEV = PROJECT_ENV == "local"
+
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
+SCOPES = [GUILD_ID] if DEV else None
+
+
+class Lineup(Extension):
+    def __init__(self, bot: interactions.Client, store: WarStore, events: WarEventBus, lineups: LineupIndex):
+        self.bot = bot
+        self.store = store
+
+        # Shared with /create-new-war; this extension keeps it up to date
+        self.lineups = lineups
+
+        self.event_bus = events
+        self.events = events.subscribe()
+        self.event_consumer = None
+
+    # ---------------------------
+    # Index maintenance
+    # ---------------------------
+    @listen()
+    async def on_startup(self):
+        for war_type in ("RT", "CT"):
+            changes = await self.store.changes_since(war_type, None)
+            for war in changes.wars:
+                self.lineups.add(war)
+
+        if self.event_consumer is None:
+            self.event_consumer = asyncio.create_task(self.consume_events())
+        print(f"✅ Lineup index ready ({len(self.lineups)} wars with players)")
+
+    async def consume_events(self):
+        while True:
+            event = await self.events.get()
+            try:
+                self.lineups.apply_event(event)
+            except Exception as e:
+                print(f"❌ Lineup index failed to apply {event}: {e}")
+
+    # ---------------------------
+    # Join War
+    # ---------------------------
+    @slash_command(
+        name="join-war",
+        description="Adds you to a war's lineup.",
+        scopes=SCOPES
+    )
+    @slash_option(
+        name="war_id",
+        description="ID of the war to join (shown on the billboard).",
+        required=True,
+        opt_type=OptionType.STRING
+    )
+    @slash_option(
+        name="is_bagger",
+        description="Whether you're joining as a bagger.",
+        required=False,
+        opt_type=OptionType.BOOLEAN
+    )
+    @slash_option(
+        name="is_ally",
+        description="Whether you're an ally (not on the team's roster).",
+        required=False,
+        opt_type=OptionType.BOOLEAN
+    )
+    @timed("join-war")
+    async def join_war(
+        self,
+        ctx: SlashContext,
+        war_id: str,
+        is_bagger: Optional[bool] = None,
+        is_ally: Optional[bool] = None,
+    ):
+        war_id = war_id.strip()
+        player = Player(
+            ctx.author.display_name,
+            role="Bagger" if is_bagger else "Runner",
+            ally=bool(is_ally),
+            user_id=ctx.author.id,
+        )
+
+        # Held until the join is indexed, so a quick second join or /create-new-war can't pass the check too
+        if not self.lineups.reserve(player.key):
+            return await ctx.send("Still processing your last join — try again in a moment.", ephemeral=True)
+
+        try:
+            war = await self.store.get(war_id)
+            if war is None:
+                return await ctx.send("That war no longer exists.", ephemeral=True)
+
+            clash = self.lineups.conflict(player.key, war.start_datetime().timestamp(), exclude_war=war_id)
+            if clash:
+                return await ctx.send(
+                    f"You're already in war `{clash}` at that time — `/leave-war` it first.",
+                    ephemeral=True,
+                )
+
+            outcome = {"reason": "missing"}
+
+            # Runs inside the store's write transaction, against the latest lineup
+            def join(war) -> bool:
+                if war.find_player(player.key):
+                    outcome["reason"] = "already"
+                    return False
+                if len(war.lineup) >= MAX_LINEUP:
+                    outcome["reason"] = "full"
+                    return False
+                war.add_player(player)
+                return True
+
+            war = await self.store.modify(war_id, join, reason="player-joined")
+            if war is None:
+                messages = {
+                    "missing": "That war no longer exists.",
+                    "already": "You're already in that war's lineup.",
+                    "full": f"That lineup is full ({MAX_LINEUP} players).",
+                }
+                return await ctx.send(messages[outcome["reason"]], ephemeral=True)
+
+            # Index now rather than waiting for the event, so an immediate second join is caught
+            self.lineups.add(war)
+        finally:
+            self.lineups.release(player.key)
+
+        print(f"➕ {player.player} joined {war.war_type} war {war_id}")
+        await ctx.send(
+            f"✅ Joined **{war.team_name}** ({war.war_type}) as {player.role}"
+            f"{' (ally)' if player.ally else ''} — lineup {len(war.lineup)}/{MAX_LINEUP}.",
+            ephemeral=True,
+        )
+
+    # ---------------------------
+    # Leave War
+    # ---------------------------
+    @slash_command(
+        name="leave-war",
+        description="Removes you from a war's lineup.",
+        scopes=SCOPES
+    )
+    @slash_option(
+        name="war_id",
+        description="ID of the war to leave.",
+        required=True,
+        opt_type=OptionType.STRING
+    )
+    @timed("leave-war")
+    async def leave_war(self, ctx: SlashContext, war_id: str):
+        war_id = war_id.strip()
+        key = str(ctx.author.id)
+
+        # Only by user ID: matching legacy (ID-less) entries by display name would let anyone
+        # who renames themselves remove that player
+        def leave(war) -> bool:
+            return war.remove_player(key) is not None
+
+        war = await self.store.modify(war_id, leave, reason="player-left")
+        if war is None:
+            return await ctx.send("You're not in that war's lineup.", ephemeral=True)
+
+        self.lineups.add(war)
+        print(f"➖ {ctx.author.display_name} left {war.war_type} war {war_id}")
+        await ctx.send(
+            f"✅ Left **{war.team_name}** ({war.war_type}) — lineup {len(war.lineup)}/{MAX_LINEUP}.",
+            ephemeral=True,
+        )
+
+    def drop(self):
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        self.event_bus.unsubscribe(self.events)
+        super().drop()
+
+
+def setup(bot: interactions.Client, store: WarStore, events: WarEventBus, lineups: LineupIndex):
+    Lineup(bot, store, events, lineups)
@@ -0,0 +1,242 @@
+import os
+import re
+import time
+import secrets
+import asyncio
+import interactions
+from collections import OrderedDict
+from typing import Optional
+from classes.matchmaking import MAX_LINEUP
+from classes.metrics import timed
+from classes.war_events import WarEventBus
+from classes.war_listing import WarListIndex
+from classes.war_store import WarStore
+from classes.war_time import ASAP, parse_time_filter
+from interactions import (
+    Extension,
+    SlashContext,
+    ComponentContext,
+    slash_command,
+    slash_option,
+    component_callback,
+    listen,
+    ActionRow,
+    Button,
+    ButtonStyle,
+    Embed,
+    OptionType,
+    SlashCommandChoice,
+)
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+PROJECT_ENV = os.getenv("PROJECT_ENVIRONMENT", "local").lower()
+DEV = PROJECT_ENV == "local"
+
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
+SCOPES = [GUILD_ID] if DEV else None
+
+# Wars per page (one embed description, well under Discord's 4096 chars)
+LIST_PAGE_SIZE = 10
+
+# Ephemeral replies can only be edited while the interaction token is valid (15 minutes)
+LIST_SESSION_SECONDS = 14 * 60
+LIST_SESSION_LIMIT = 1000
+
+# list_wars:<session>:<page>
+LIST_PAGE_PATTERN = re.compile(r"^list_wars:([0-9a-f]+):(\d+)$")
+
+
+class ListWars(Extension):
+    def __init__(self, bot: interactions.Client, store: WarStore, events: WarEventBus):
+        self.bot = bot
+        self.store = store
+        self.index = WarListIndex()
+
+        # Kept in sync from the event bus after a one-off load at startup
+        self.event_bus = events
+        self.events = events.subscribe()
+        self.event_consumer = None
+
+        # session token -> {"user_id", "filters", "cursors", "created"}; cursors[n] is where page n starts
+        self.sessions = OrderedDict()
+
+    # ---------------------------
+    # Index maintenance
+    # ---------------------------
+    @listen()
+    async def on_startup(self):
+        for war_type in ("RT", "CT"):
+            changes = await self.store.changes_since(war_type, None)
+            for war in changes.wars:
+                self.index.add(war)
+
+        if self.event_consumer is None:
+            self.event_consumer = asyncio.create_task(self.consume_events())
+        print(f"✅ War listing index ready ({len(self.index)} open wars)")
+
+    async def consume_events(self):
+        while True:
+            event = await self.events.get()
+            try:
+                self.index.apply_event(event)
+            except Exception as e:
+                print(f"❌ War listing failed to index {event}: {e}")
+
+    # ---------------------------
+    # Pages
+    # ---------------------------
+    def open_session(self, user_id: int, filters: dict) -> str:
+        now = time.monotonic()
+        while self.sessions:
+            token, session = next(iter(self.sessions.items()))
+            if len(self.sessions) < LIST_SESSION_LIMIT and now - session["created"] < LIST_SESSION_SECONDS:
+                break
+            del self.sessions[token]
+
+        token = secrets.token_hex(4)
+        self.sessions[token] = {"user_id": user_id, "filters": filters, "cursors": [None], "created": now}
+        return token
+
+    def render_page(self, token: str, page: int) -> dict:
+        session = self.sessions[token]
+        wars, next_cursor = self.index.query(
+            **session["filters"], after=session["cursors"][page], limit=LIST_PAGE_SIZE
+        )
+        cursors = session["cursors"]
+        del cursors[page + 1:]
+        if next_cursor is not None:
+            cursors.append(next_cursor)
+
+        if wars:
+            lines = [
+                f"`{war.war_id}` **{war.team_name}** ({war.war_type}) — "
+                f"{war.search_label if war.search_label == ASAP else f'<t:{war.start}:t>'} (<t:{war.start}:R>) — "
+                f"lineup {war.lineup_size}/{MAX_LINEUP}"
+                for war in wars
+            ]
+        else:
+            lines = ["No open wars match — try fewer filters, or `/create-new-war`."]
+
+        embed = Embed(title="Open wars", description="\n".join(lines), color=0x00AAFF)
+        embed.set_footer(text=f"Page {page + 1} · {len(self.index)} open wars in total")
+        buttons = ActionRow(
+            Button(
+                style=ButtonStyle.SECONDARY,
+                label="◀ Previous",
+                custom_id=f"list_wars:{token}:{max(page - 1, 0)}",
+                disabled=page == 0,
+            ),
+            Button(
+                style=ButtonStyle.SECONDARY,
+                label="Next ▶",
+                custom_id=f"list_wars:{token}:{page + 1}",
+                disabled=next_cursor is None,
+            ),
+        )
+        return {"embeds": [embed], "components": [buttons]}
+
+    # ---------------------------
+    # List Wars
+    # ---------------------------
+    @slash_command(
+        name="list-wars",
+        description="Lists open wars, soonest first.",
+        scopes=SCOPES
+    )
+    @slash_option(
+        name="track_type",
+        description="Only RT or only CT wars. Both if omitted.",
+        required=False,
+        opt_type=OptionType.STRING,
+        choices=[
+            SlashCommandChoice(name="RT", value="RT"),
+            SlashCommandChoice(name="CT", value="CT"),
+        ],
+    )
+    @slash_option(
+        name="starts_after",
+        description="Only wars starting at or after this time in ET (e.g. 19 or 7PM).",
+        required=False,
+        opt_type=OptionType.STRING
+    )
+    @slash_option(
+        name="within_hours",
+        description="Only wars starting within this many hours (of starts_after, or now).",
+        required=False,
+        opt_type=OptionType.INTEGER,
+        min_value=1,
+        max_value=48,
+    )
+    @slash_option(
+        name="team_prefix",
+        description="Only teams whose name starts with this.",
+        required=False,
+        opt_type=OptionType.STRING
+    )
+    @slash_option(
+        name="open_slots",
+        description="Only wars with at least this many free lineup spots (1-6).",
+        required=False,
+        opt_type=OptionType.INTEGER,
+        min_value=1,
+        max_value=6,
+    )
+    @timed("list-wars")
+    async def list_wars(
+        self,
+        ctx: SlashContext,
+        track_type: Optional[str] = None,
+        starts_after: Optional[str] = None,
+        within_hours: Optional[int] = None,
+        team_prefix: Optional[str] = None,
+        open_slots: Optional[int] = None,
+    ):
+        start_after = None
+        if starts_after:
+            try:
+                start = parse_time_filter(starts_after)
+            except ValueError:
+                return await ctx.send(
+                    "Invalid time. Use 'ASAP', a 24-hour value like '19', or a 12-hour value like '7PM'.",
+                    ephemeral=True,
+                )
+            start_after = int(start.timestamp())
+
+        start_before = None
+        if within_hours:
+            start_before = (start_after or int(time.time())) + within_hours * 3600
+
+        filters = {
+            "war_type": track_type,
+            "start_after": start_after,
+            "start_before": start_before,
+            "team_prefix": (team_prefix or "").strip() or None,
+            "min_open_slots": open_slots or 0,
+        }
+        token = self.open_session(ctx.author.id, filters)
+        await ctx.send(**self.render_page(token, 0), ephemeral=True)
+
+    @component_callback(LIST_PAGE_PATTERN)
+    @timed("list-wars-page")
+    async def list_wars_page(self, ctx: ComponentContext):
+        token, page = LIST_PAGE_PATTERN.match(ctx.custom_id).groups()
+        page = int(page)
+        session = self.sessions.get(token)
+        if session is None or page >= len(session["cursors"]):
+            return await ctx.send("This list has expired — run `/list-wars` again.", ephemeral=True)
+        if session["user_id"] != ctx.author.id:
+            return await ctx.send("Run `/list-wars` to page through your own list.", ephemeral=True)
+
+        await ctx.edit_origin(**self.render_page(token, page))
+
+    def drop(self):
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        self.event_bus.unsubscribe(self.events)
+        super().drop()
+
+
+def setup(bot: interactions.Client, store: WarStore, events: WarEventBus):
+    ListWars(bot, store, events)
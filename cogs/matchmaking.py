@@ -0,0 +1,185 @@
+import os
+import re
+import asyncio
+import interactions
+from typing import Optional
+from classes.matchmaking import MatchmakingIndex, start_bucket
+from classes.metrics import timed
+from classes.war import STATUS_ACCEPTED
+from classes.war_events import WarEventBus
+from classes.war_store import WarStore
+from classes.war_time import parse_search_time, to_timestamp
+from interactions import (
+    Extension,
+    SlashContext,
+    ComponentContext,
+    slash_command,
+    slash_option,
+    component_callback,
+    listen,
+    OptionType,
+    SlashCommandChoice,
+)
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+PROJECT_ENV = os.getenv("PROJECT_ENVIRONMENT", "local").lower()
+DEV = PROJECT_ENV == "local"
+
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
+SCOPES = [GUILD_ID] if DEV else None
+
+# Matches the custom_id emitted by PostWarBillboard.build_war_buttons
+ACCEPT_WAR_PATTERN = re.compile(r"^accept_war:(.+)$")
+
+
+class Matchmaking(Extension):
+    def __init__(self, bot: interactions.Client, store: WarStore, events: WarEventBus):
+        self.bot = bot
+        self.store = store
+        self.index = MatchmakingIndex()
+
+        # Kept in sync from the event bus after a one-off load at startup
+        self.event_bus = events
+        self.events = events.subscribe()
+        self.event_consumer = None
+
+    # ---------------------------
+    # Index maintenance
+    # ---------------------------
+    @listen()
+    async def on_startup(self):
+        for war_type in ("RT", "CT"):
+            changes = await self.store.changes_since(war_type, None)
+            for war in changes.wars:
+                self.index.add(war)
+
+        if self.event_consumer is None:
+            self.event_consumer = asyncio.create_task(self.consume_events())
+        print(f"✅ Matchmaking index ready ({len(self.index)} open wars)")
+
+    async def consume_events(self):
+        while True:
+            event = await self.events.get()
+            try:
+                self.index.apply_event(event)
+            except Exception as e:
+                print(f"❌ Matchmaking failed to index {event}: {e}")
+
+    # ---------------------------
+    # Accept War button
+    # ---------------------------
+    @component_callback(ACCEPT_WAR_PATTERN)
+    @timed("accept-war")
+    async def accept_war(self, ctx: ComponentContext):
+        war_id = ACCEPT_WAR_PATTERN.match(ctx.custom_id).group(1)
+        team_name = ctx.guild.name if ctx.guild else ctx.author.display_name
+        outcome = {"reason": "missing"}
+
+        # Runs inside the store's write transaction: only the first accept can see the war open
+        def accept(war) -> bool:
+            if not war.is_open:
+                outcome["reason"] = "taken"
+                return False
+            if (war.team_name or "").lower() == team_name.lower():
+                outcome["reason"] = "own"
+                return False
+            war.status = STATUS_ACCEPTED
+            war.opponent = team_name
+            return True
+
+        war = await self.store.modify(war_id, accept, reason="accepted")
+
+        if war is None:
+            messages = {
+                "missing": "That war no longer exists.",
+                "taken": "Too late — that war has already been accepted.",
+                "own": "You can't accept your own team's war.",
+            }
+            return await ctx.send(messages[outcome["reason"]], ephemeral=True)
+
+        self.index.remove(war_id)
+        print(f"🤝 {team_name} accepted {war.war_type} war {war_id} vs {war.team_name}")
+        await ctx.send(
+            f"✅ **{team_name}** accepted the {war.war_type} war against **{war.team_name}** "
+            f"({war.search_label or 'scheduled'} — <t:{int(war.start_datetime().timestamp())}:t>).",
+            ephemeral=False,
+        )
+
+    # ---------------------------
+    # Find War
+    # ---------------------------
+    @slash_command(
+        name="find-war",
+        description="Finds the best open war for your team.",
+        scopes=SCOPES
+    )
+    @slash_option(
+        name="track_type",
+        description="Track type (RT or CT). If omitted, defaults to RT.",
+        required=False,
+        opt_type=OptionType.STRING,
+        choices=[
+            SlashCommandChoice(name="RT", value="RT"),
+            SlashCommandChoice(name="CT", value="CT"),
+        ],
+    )
+    @slash_option(
+        name="search_time",
+        description="Time in ET (GMT-5). Defaults to ASAP.",
+        required=False,
+        opt_type=OptionType.STRING
+    )
+    @slash_option(
+        name="lineup_size",
+        description="How many players your team has ready (1-6). Defaults to 1.",
+        required=False,
+        opt_type=OptionType.INTEGER,
+        min_value=1,
+        max_value=6,
+    )
+    @timed("find-war")
+    async def find_war(
+        self,
+        ctx: SlashContext,
+        track_type: Optional[str] = None,
+        search_time: Optional[str] = None,
+        lineup_size: Optional[int] = None,
+    ):
+        team_name = ctx.guild.name if ctx.guild else ctx.author.display_name
+        try:
+            start, _ = parse_search_time(search_time)
+        except ValueError:
+            return await ctx.send(
+                "Invalid time. Use 'ASAP', a 24-hour value like '19', or a 12-hour value like '7PM'.",
+                ephemeral=True,
+            )
+
+        war_id = self.index.best_match(
+            track_type or "RT",
+            start_bucket(to_timestamp(start)),
+            lineup_size or 1,
+            exclude_team=team_name,
+        )
+
+        war = await self.store.get(war_id) if war_id else None
+        if war is None:
+            return await ctx.send("No compatible open wars right now — try `/create-new-war`.", ephemeral=True)
+
+        await ctx.send(
+            f"Best match: **{war.team_name}** ({war.war_type}) at <t:{int(war.start_datetime().timestamp())}:t>, "
+            f"{len(war.lineup)} player(s) so far.\n"
+            f"War ID: `{war.war_id}` — press **Accept War** on the billboard to take it.",
+            ephemeral=True,
+        )
+
+    def drop(self):
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        self.event_bus.unsubscribe(self.events)
+        super().drop()
+
+
+def setup(bot: interactions.Client, store: WarStore, events: WarEventBus):
+    Matchmaking(bot, store, events)
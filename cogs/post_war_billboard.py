@@ -1,55 +1,186 @@
 import os
-import json
+import time
+import asyncio
 import interactions
 from dotenv import load_dotenv
-from interactions import Task, IntervalTrigger, Extension, Client, listen, Button, ButtonStyle, ActionRow
+from classes.billboard_outbox import FAILED, BillboardOutbox
+from classes.digest_slots import DIGEST_KEY_PREFIX, MAX_EMBEDS_PER_MESSAGE, DigestSlots, digest_key
+from classes.discord_transport import DiscordTransport
+from classes.metrics import QUEUE_DEPTH, SYNC_INTERVAL_SECONDS, SYNC_SECONDS, timed
+from classes.render_cache import RenderCache, content_hash
+from classes.sharding import ShardPlan
+from classes.sync_schedule import SyncSchedule
+from classes.war import STATUS_ACCEPTED
+from classes.war_events import WarEvent, WarEventBus
+from classes.war_store import WarStore
+from classes.war_time import parse_start_time
+from interactions import (
+    Extension,
+    Client,
+    SlashContext,
+    listen,
+    slash_command,
+    slash_option,
+    Button,
+    ButtonStyle,
+    ActionRow,
+    OptionType,
+    SlashCommandChoice,
+    Permissions,
+)
 
 load_dotenv(".env.local")
 
+PROJECT_ENV = os.getenv("PROJECT_ENVIRONMENT", "local").lower()
+DEV = PROJECT_ENV == "local"
+
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
+SCOPES = [GUILD_ID] if DEV else None
+
 # ---------------------------
 # Channel IDs
+#   Billboards are configured per guild with /set-billboard; these legacy
+#   env vars seed the config for GUILD_ID on first start
 # ---------------------------
 RT_CHANNEL_ID = int(os.getenv("RT_WAR_ID")) if os.getenv("RT_WAR_ID") else None
 CT_CHANNEL_ID = int(os.getenv("CT_WAR_ID")) if os.getenv("CT_WAR_ID") else None
 
-# ---------------------------
-# Paths
-# ---------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-BILLBOARD_DIR = os.path.join(BASE_DIR, "temp", "billboard-data")
+# Billboards brought up at once during startup (each is still paced by its channel's bucket)
+GUILD_SYNC_CONCURRENCY = int(os.getenv("BILLBOARD_GUILD_SYNC_CONCURRENCY", "4"))
+
+# Changes arrive through the event bus; the periodic pass only catches drift.
+# Passes adapt to activity (see classes/sync_schedule.py); this is the longest gap when idle
+RECONCILE_MINUTES = int(os.getenv("BILLBOARD_RECONCILE_MINUTES", "10"))
+
+# Bump whenever format_war / build_war_buttons change, so warm restarts re-render every message
+RENDER_VERSION = 3
+
+# Rendered Embed/ActionRow payloads kept around, keyed by war content hash
+RENDER_CACHE_SIZE = int(os.getenv("BILLBOARD_RENDER_CACHE_SIZE", "1024"))
+
+# Parallel requests per billboard channel while seeding (still paced by the rate-limit bucket)
+SEED_CONCURRENCY = int(os.getenv("BILLBOARD_SEED_CONCURRENCY", "3"))
+
+# Discord only bulk-deletes messages younger than 14 days (minus a safety margin)
+BULK_DELETE_MAX_AGE_MS = (14 * 24 * 60 * 60 - 60) * 1000
+DISCORD_EPOCH_MS = 1420070400000
+
+# "single": one message per war. "digest": up to BILLBOARD_DIGEST_PAGE_SIZE wars (and
+# Discord's 6000 embed characters) per message, each in a stable slot, so a change
+# edits only the message holding it
+BILLBOARD_LAYOUT = os.getenv("BILLBOARD_LAYOUT", "single").lower()
+DIGEST_PAGE_SIZE = int(os.getenv("BILLBOARD_DIGEST_PAGE_SIZE", str(MAX_EMBEDS_PER_MESSAGE)))
+BUTTONS_PER_ROW = 5
+BUTTON_LABEL_MAX = 80
+
+PLACEHOLDER_KEY = "placeholder"
+PLACEHOLDERS = {
+    "rt": "Placeholder for RT War",
+    "ct": "Placeholder for CT War",
+}
+
+
+def snowflake_age_ms(snowflake: int) -> int:
+    return int(time.time() * 1000) - ((int(snowflake) >> 22) + DISCORD_EPOCH_MS)
+
+
+class Billboard:
+    """Sync state for one guild's RT or CT billboard channel."""
+
+    __slots__ = ("guild_id", "war_type", "channel_id", "wars", "revision", "last_sync_seconds", "failures")
+
+    def __init__(self, guild_id: int, war_type: str, channel_id: int):
+        self.guild_id = guild_id
+        self.war_type = war_type.lower()
+        self.channel_id = channel_id
+
+        # war_id -> { "data": war_dict, "hash": content_hash }
+        # (message IDs are owned by the outbox, which decides send vs edit)
+        self.wars = {}
+
+        # Last store revision this billboard has fully applied (None = never loaded)
+        self.revision = None
+
+        # Last reconcile pass duration (queue + Discord calls) and failed passes since startup
+        self.last_sync_seconds = None
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"{self.war_type.upper()} billboard for guild {self.guild_id} (#{self.channel_id})"
 
 
 class PostWarBillboard(Extension):
-    def __init__(self, bot: Client):
+    def __init__(self, bot: Client, store: WarStore, events: WarEventBus, shards: ShardPlan):
         self.bot = bot
+        self.store = store
+
+        # Every shard runs in this process, so it syncs every guild's billboards
+        self.shards = shards
+
+        # Subscribe straight away so nothing committed during startup is missed
+        self.event_bus = events
+        self.events = events.subscribe()
+        self.event_consumer = None
 
-        # ✅ In-memory cache:
-        # war_id -> { "data": war_dict, "message_id": int }
-        self.rt_wars = {}
-        self.ct_wars = {}
+        # ✅ Every billboard this process syncs: channel_id -> Billboard
+        self.billboards = {}
 
         # ✅ Prevents startup race-condition deletes
         self.ready = False
 
-    # ---------------------------
-    # JSON Loader
-    # ---------------------------
-    def load_json(self, war_type: str):
-        path = os.path.join(BILLBOARD_DIR, f"{war_type}-billboard.json")
+        # Serialises event handling and reconciliation per war type (across all guilds)
+        self.locks = {"rt": asyncio.Lock(), "ct": asyncio.Lock()}
+
+        # Holds resolved channel objects and counts Discord calls per channel
+        self.transport = DiscordTransport(bot)
+
+        # Rate-limit-aware, coalescing queue for every billboard message;
+        # each confirmed send/edit/delete is written back to the store
+        self.outbox = BillboardOutbox(
+            self.transport,
+            on_message=self.persist_message,
+            concurrency=SEED_CONCURRENCY,
+        )
+        QUEUE_DEPTH.set_function(self.outbox_backlog, queue="billboard_outbox")
+
+        # Reconcile passes back off while idle and tighten when changes pile up
+        self.schedule = SyncSchedule(max_seconds=RECONCILE_MINUTES * 60)
+        SYNC_INTERVAL_SECONDS.set_function(lambda: self.schedule.interval)
+        self.sync_wakeup = asyncio.Event()
+        self.sync_loop = None
 
-        if not os.path.exists(path):
-            return []
+        # Memoised format_war/build_war_buttons output
+        self.render_cache = RenderCache(RENDER_CACHE_SIZE)
 
+        # Digest layout: channel_id -> DigestSlots
+        self.digest = BILLBOARD_LAYOUT == "digest"
+        self.slots = {}
+
+        # Startup phase timing
+        self.startup_started = None
+        self.first_billboard_at = None
+
+    def outbox_backlog(self) -> int:
+        return sum(len(queue.pending) for queue in self.outbox.channels.values())
+
+    def boards(self, war_type: str):
+        """Every billboard showing one war type."""
+        war_type = war_type.lower()
+        return [board for board in self.billboards.values() if board.war_type == war_type]
+
+    # ---------------------------
+    # War Loader
+    # ---------------------------
+    async def load_changes(self, war_type: str, since=None):
+        """
+        Returns a WarChanges diff since a revision (a full snapshot for None),
+        or None if the store couldn't be read.
+        """
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except json.JSONDecodeError:
-            print(f"⚠️ {war_type.upper()} billboard JSON is corrupted.")
-            return []
+            return await self.store.changes_since(war_type, since)
         except Exception as e:
             print(f"❌ Failed to load {war_type} billboard: {e}")
-            return []
+            return None
 
     # ---------------------------
     # Embed Formatter
@@ -66,19 +197,25 @@ class PostWarBillboard(Extension):
         else:
             lineup_text = "No players yet."
 
-        # Color by war type
+        # Color by war type (grey once accepted)
         war_type = war.get("war_type", "RT").upper()
-        color = 0x2ECC71 if war_type == "RT" else 0x9B59B6
+        opponent = war.get("opponent")
+        accepted = war.get("status") == STATUS_ACCEPTED
+        color = 0x95A5A6 if accepted else 0x2ECC71 if war_type == "RT" else 0x9B59B6
 
+        status = f"vs {opponent}" if accepted else "searching"
         embed = interactions.Embed(
-            title=f"{war.get('team_name', 'Unknown Team')} searching ({war_type})",
+            title=f"{war.get('team_name', 'Unknown Team')} {status} ({war_type})",
             description=f"**War ID:** `{war.get('war_id')}`",
             color=color
         )
 
+        # Discord renders <t:...> in each viewer's own timezone
+        start = parse_start_time(war.get("start_time"), war.get("last_updated"))
+        label = war.get("search_label") or "Scheduled"
         embed.add_field(
             name="⏰ Time Searching For",
-            value=f"`{war.get('start_time', 'Unknown')}`",
+            value=f"`{label}` — <t:{int(start.timestamp())}:t> (<t:{int(start.timestamp())}:R>)",
             inline=False
         )
 
@@ -92,18 +229,36 @@ class PostWarBillboard(Extension):
 
         return embed
 
-    # Create buttons used to accept or deny wars. For now just a placeholder.
-    def build_war_buttons(self, war_id: str):
-        button = Button(
-            style=ButtonStyle.SUCCESS,
-            label="Accept War (Placeholder)",
+    # Create buttons used to accept wars (handled by the matchmaking extension)
+    def build_war_button(self, war_id: str, accepted: bool = False, label: str = None) -> Button:
+        return Button(
+            style=ButtonStyle.SECONDARY if accepted else ButtonStyle.SUCCESS,
+            label=(label or ("War Accepted" if accepted else "Accept War"))[:BUTTON_LABEL_MAX],
             custom_id=f"accept_war:{war_id}",  # unique per war
-            disabled=False
+            disabled=accepted
         )
 
-        return ActionRow(button)
+    def build_war_buttons(self, war_id: str, accepted: bool = False):
+        return ActionRow(self.build_war_button(war_id, accepted))
+
+    # Digest page: one embed and one labelled button per war, in slot order
+    def render_page(self, entries: list) -> dict:
+        embeds = []
+        buttons = []
+        for entry in entries:
+            war = entry["data"]
+            accepted = war.get("status") == STATUS_ACCEPTED
+            team = war.get("team_name", "Unknown Team")
+            embeds.append(self.render(war, entry["hash"])["embeds"])
+            buttons.append(self.build_war_button(
+                war["war_id"],
+                accepted,
+                label=f"{team} — Accepted" if accepted else f"Accept {team}",
+            ))
+
+        rows = [ActionRow(*buttons[i:i + BUTTONS_PER_ROW]) for i in range(0, len(buttons), BUTTONS_PER_ROW)]
+        return {"embeds": embeds, "components": rows}
 
-        
 
     # ---------------------------
     # Startup Sync
@@ -111,103 +266,600 @@ class PostWarBillboard(Extension):
     @listen()
     async def on_startup(self):
         print("✅ Billboard system starting...")
+        self.startup_started = time.perf_counter()
+
+        await self.seed_legacy_config()
+        for guild_id, war_type, channel_id in await self.store.list_billboards():
+            self.billboards[channel_id] = Billboard(guild_id, war_type, channel_id)
+
+        if not self.billboards:
+            print("No billboards configured — use /set-billboard in a server.")
+
+        # One snapshot per war type, shared by every guild's billboard
+        snapshots = {}
+        for war_type in ("rt", "ct"):
+            if self.boards(war_type):
+                snapshots[war_type] = await self.load_changes(war_type)
 
-        if RT_CHANNEL_ID:
-            await self.initial_sync("rt", RT_CHANNEL_ID, self.rt_wars)
+        # Billboards reconcile side by side (bounded); one failing doesn't stop the others
+        limit = asyncio.Semaphore(GUILD_SYNC_CONCURRENCY)
 
-        if CT_CHANNEL_ID:
-            await self.initial_sync("ct", CT_CHANNEL_ID, self.ct_wars)
+        async def bounded_sync(board: Billboard):
+            async with limit:
+                await self.initial_sync(board, snapshots[board.war_type])
+
+        boards = list(self.billboards.values())
+        for board, result in zip(boards, await asyncio.gather(*map(bounded_sync, boards), return_exceptions=True)):
+            if isinstance(result, Exception):
+                print(f"❌ Initial sync failed for {board}: {result}")
+
+        print(
+            f"⏱️ {len(boards)} billboards ready in {time.perf_counter() - self.startup_started:.2f}s "
+            f"({self.shards})"
+        )
 
         # ✅ Unlock deletion after initial sync completes
         self.ready = True
 
-        if not self.sync_billboards.running:
-            self.sync_billboards.start()
-            print("✅ Billboard diff-sync task running")
+        if self.event_consumer is None:
+            self.event_consumer = asyncio.create_task(self.consume_events())
+            print("✅ Billboard event consumer running")
+
+        if self.sync_loop is None:
+            self.sync_loop = asyncio.create_task(self.run_sync_loop())
+            print(
+                f"✅ Billboard reconciliation running (every {self.schedule.min_seconds:.0f}s–{RECONCILE_MINUTES} min, "
+                f"{BILLBOARD_LAYOUT} layout)"
+            )
+
+    async def seed_legacy_config(self):
+        """Carries the RT_WAR_ID/CT_WAR_ID env channels over as GUILD_ID's billboards."""
+        configured = {(guild_id, war_type) for guild_id, war_type, _ in await self.store.list_billboards()}
+        for war_type, channel_id in (("RT", RT_CHANNEL_ID), ("CT", CT_CHANNEL_ID)):
+            if channel_id and (GUILD_ID, war_type) not in configured:
+                await self.store.set_billboard(GUILD_ID, war_type, channel_id)
+                print(f"Configured {war_type} billboard for guild {GUILD_ID} from env (#{channel_id})")
+
+    async def initial_sync(self, board: Billboard, changes, purge: bool = True):
+        """
+        Warm-restart reconciliation: reuse the messages recorded in the store
+        and only send, edit or delete what differs from the stored wars.
+        ``purge=False`` skips clearing untracked messages (for a channel that
+        was only just configured and holds nothing of the billboard's yet).
+        """
+        war_type, channel_id, cache = board.war_type, board.channel_id, board.wars
+        started = time.perf_counter()
+
+        persisted = await self.store.list_messages(channel_id)
+        for key, (message_id, _) in persisted.items():
+            self.outbox.track(channel_id, key, message_id)
+
+        if purge:
+            await self.purge_untracked(channel_id, {message_id for message_id, _ in persisted.values()})
+        purged_at = time.perf_counter()
+        wars = [war.to_dict() for war in changes.wars] if changes else []
+        unchanged = 0
+
+        async with self.locks[war_type]:
+            self.post_placeholder(channel_id, war_type, unless_hash=persisted.get(PLACEHOLDER_KEY, (None, None))[1])
+
+            if self.digest:
+                # Fill slots in start order; only pages whose content changed are edited
+                slots = self.slots_for(channel_id)
+                for war in sorted(wars, key=lambda w: (w.get("start_time") or "", w["war_id"])):
+                    war_hash = content_hash(war, RENDER_VERSION)
+                    cache[war["war_id"]] = {"data": war, "hash": war_hash}
+                    slots.assign(war["war_id"], len(self.render(war, war_hash)["embeds"]))
+
+                live = set()
+                for page in slots.pages():
+                    live.add(digest_key(page))
+                    stored = persisted.get(digest_key(page))
+                    if not self.refresh_page(channel_id, cache, page, unless_hash=stored[1] if stored else None):
+                        unchanged += 1
+                messages = len(live)
+            else:
+                for war in wars:
+                    war_hash = content_hash(war, RENDER_VERSION)
+                    stored = persisted.get(war["war_id"])
+                    if stored and stored[1] == war_hash:
+                        cache[war["war_id"]] = {"data": war, "hash": war_hash}
+                        unchanged += 1
+                    else:
+                        self.post_war(channel_id, cache, war, war_hash)
+                live = {war["war_id"] for war in wars}
+                messages = len(wars)
+
+            # Messages for wars (or pages) that disappeared while the bot was offline. If the
+            # store couldn't be read, nothing is known to be gone: keep them all, and leave the
+            # revision unset so the next reconcile pass loads everything again
+            if changes is not None:
+                for key in persisted:
+                    if key != PLACEHOLDER_KEY and key not in live:
+                        self.outbox.delete(channel_id, key)
+                board.revision = changes.revision
+
+        await self.outbox.join(channel_id)
+        SYNC_SECONDS.observe(time.perf_counter() - started, war_type=war_type, phase="initial")
+        print(
+            f"✅ Initial sync of {board} "
+            f"({len(wars)} wars in {messages} messages: {unchanged} unchanged, {messages - unchanged} posted/edited) — "
+            f"purge {purged_at - started:.2f}s, "
+            f"seed {time.perf_counter() - purged_at:.2f}s"
+        )
 
-    async def initial_sync(self, war_type: str, channel_id: int, cache: dict):
-        channel = await self.bot.fetch_channel(channel_id)
-        wars = self.load_json(war_type)
+    async def purge_untracked(self, channel_id: int, keep: set):
+        """
+        Deletes recent messages the bot posted in the channel that the
+        billboard no longer tracks (e.g. from a lost map). Other authors'
+        messages are never touched.
+        """
+        try:
+            channel = await self.transport.channel(channel_id)
+        except Exception as e:
+            print(f"Error fetching channel {channel_id}: {e}")
+            return
 
-        for war in wars:
-            embed = self.format_war(war)
-            components = self.build_war_buttons(war["war_id"])
-            msg = await channel.send(embeds=embed, components=components)
+        cleared = 0
+        try:
+            self.transport.record(channel_id, "fetch_messages")
+            recent = await channel.fetch_messages(limit=100)
+            bot_id = self.bot.user.id
+            stale = [msg for msg in recent if msg.author.id == bot_id and msg.id not in keep]
+
+            # One bulk request for everything young enough, single deletes for the rest
+            bulk = [msg for msg in stale if snowflake_age_ms(msg.id) < BULK_DELETE_MAX_AGE_MS]
+            if len(bulk) >= 2:
+                try:
+                    self.transport.record(channel_id, "bulk_delete")
+                    await channel.delete_messages(bulk)
+                    cleared += len(bulk)
+                    stale = [msg for msg in stale if msg not in bulk]
+                except interactions.LibraryException as e:
+                    print(f"Bulk delete failed in #{channel.name}, falling back to single deletes: {e}")
+
+            for msg in stale:
+                try:
+                    self.transport.record(channel_id, "delete")
+                    await msg.delete()
+                    cleared += 1
+                except interactions.LibraryException:
+                    pass
+            print(f"Cleared {cleared} untracked messages in #{channel.name}")
+        except Exception as e:
+            print(f"Error clearing #{channel.name}: {e}")
 
-            cache[war["war_id"]] = {
-                "data": war,
-                "message_id": msg.id
-            }
+    async def persist_message(self, channel_id: int, key: str, message_id, tag):
+        if tag == FAILED:
+            self.forget_failed(channel_id, key)
+            return
 
-        print(f"✅ Initial {war_type.upper()} billboard synced")
+        if message_id is not None and self.first_billboard_at is None and self.startup_started is not None:
+            self.first_billboard_at = time.perf_counter()
+            print(f"⏱️ First billboard message live {self.first_billboard_at - self.startup_started:.2f}s after startup")
+
+        try:
+            if message_id is None:
+                await self.store.delete_message(channel_id, key)
+            else:
+                await self.store.set_message(channel_id, key, message_id, tag)
+        except Exception as e:
+            print(f"❌ Failed to persist billboard message for {key}: {e}")
+
+    def forget_failed(self, channel_id: int, key: str):
+        """
+        The outbox gave up on a message: forget what the billboard thinks is
+        live behind it, so the next reconcile pass (a full one) sends it again.
+        """
+        board = self.billboards.get(channel_id)
+        if board is None:
+            return
+
+        if key.startswith(DIGEST_KEY_PREFIX):
+            war_ids = self.slots_for(channel_id).wars_on(int(key[len(DIGEST_KEY_PREFIX):]))
+        else:
+            war_ids = [key]
+        for war_id in war_ids:
+            if war_id in board.wars:
+                board.wars[war_id]["hash"] = None
+
+        board.revision = None
+        self.sync_wakeup.set()
+        print(f"⚠️ {board}: {key} will be re-sent on the next reconcile pass")
 
     # ---------------------------
-    # Diff-Based Live Sync
+    # Message Helpers
     # ---------------------------
-    @Task.create(IntervalTrigger(seconds=30))
+    def post_placeholder(self, channel_id: int, war_type: str, unless_hash: str = None):
+        placeholder = {"content": PLACEHOLDERS[war_type]}
+        placeholder_hash = content_hash(placeholder, RENDER_VERSION)
+        if placeholder_hash != unless_hash:
+            self.outbox.upsert(channel_id, PLACEHOLDER_KEY, placeholder, tag=placeholder_hash)
+
+    def render(self, war: dict, war_hash: str) -> dict:
+        return self.render_cache.get_or_render(
+            war_hash,
+            lambda: {
+                "embeds": self.format_war(war),
+                "components": self.build_war_buttons(war["war_id"], war.get("status") == STATUS_ACCEPTED),
+            },
+        )
+
+    def slots_for(self, channel_id: int) -> DigestSlots:
+        if channel_id not in self.slots:
+            self.slots[channel_id] = DigestSlots(DIGEST_PAGE_SIZE)
+        return self.slots[channel_id]
+
+    def refresh_page(self, channel_id: int, cache: dict, page: int, unless_hash: str = None) -> bool:
+        """
+        Queues the digest message for ``page`` (or its deletion once empty).
+        Returns False if the page already matches ``unless_hash``.
+        """
+        war_ids = self.slots_for(channel_id).wars_on(page)
+        if not war_ids:
+            self.outbox.delete(channel_id, digest_key(page))
+            return True
+
+        entries = [cache[war_id] for war_id in war_ids]
+        page_hash = content_hash({"page": page, "wars": [entry["hash"] for entry in entries]}, RENDER_VERSION)
+        if page_hash == unless_hash:
+            return False
+
+        # Rapid changes to wars on the same page coalesce into one edit in the outbox
+        self.outbox.upsert(channel_id, digest_key(page), self.render_page(entries), tag=page_hash)
+        return True
+
+    def place_war(self, channel_id: int, cache: dict, war: dict, war_hash: str):
+        """Gives a war a digest slot sized to its embed and refreshes the page(s) that changed."""
+        slots = self.slots_for(channel_id)
+        before = slots.page_of(war["war_id"])
+        page = slots.assign(war["war_id"], len(self.render(war, war_hash)["embeds"]))
+        if before is not None and before != page:
+            self.refresh_page(channel_id, cache, before)  # outgrew its page
+        self.refresh_page(channel_id, cache, page)
+
+    def post_war(self, channel_id: int, cache: dict, war: dict, war_hash: str):
+        cache[war["war_id"]] = {"data": war, "hash": war_hash}
+        if self.digest:
+            self.place_war(channel_id, cache, war, war_hash)
+            return
+        self.outbox.upsert(channel_id, war["war_id"], self.render(war, war_hash), tag=war_hash)
+
+    def update_war(self, channel_id: int, cache: dict, war: dict, war_hash: str):
+        # Same queue entry as a post: the outbox edits the existing message in place
+        entry = cache[war["war_id"]]
+        self.render_cache.invalidate(entry["hash"])
+        entry["data"] = war
+        entry["hash"] = war_hash
+        if self.digest:
+            self.place_war(channel_id, cache, war, war_hash)
+            return
+        self.outbox.upsert(channel_id, war["war_id"], self.render(war, war_hash), tag=war_hash)
+
+    def remove_war(self, channel_id: int, cache: dict, war_id: str):
+        self.render_cache.invalidate(cache.pop(war_id)["hash"])
+        if self.digest:
+            page = self.slots_for(channel_id).release(war_id)
+            if page is not None:
+                self.refresh_page(channel_id, cache, page)
+            return
+        self.outbox.delete(channel_id, war_id)
+
+    # ---------------------------
+    # Event-Driven Sync
+    # ---------------------------
+    async def consume_events(self):
+        while True:
+            event = await self.events.get()
+            try:
+                await self.apply_event(event)
+            except Exception as e:
+                print(f"❌ Failed to apply {event}: {e}")
+
+            self.schedule.note_event()
+            if self.schedule.busy(self.outbox_backlog()):
+                self.sync_wakeup.set()
+
+    async def apply_event(self, event: WarEvent):
+        war_type = event.war_type.lower()
+        boards = self.boards(war_type)
+        if not boards:
+            return
+
+        # Hashed (and rendered, via the shared cache) once however many guilds show it
+        war_hash = content_hash(event.war, RENDER_VERSION) if event.war else None
+        touched = 0
+
+        async with self.locks[war_type]:
+            for board in boards:
+                channel_id, cache = board.channel_id, board.wars
+                if event.kind == WarEvent.DELETED:
+                    if event.war_id in cache:
+                        self.remove_war(channel_id, cache, event.war_id)
+                        touched += 1
+                    continue
+
+                # Created and updated are handled alike, so replays are harmless
+                if event.war_id not in cache:
+                    self.post_war(channel_id, cache, event.war, war_hash)
+                    touched += 1
+                elif cache[event.war_id]["hash"] != war_hash:
+                    self.update_war(channel_id, cache, event.war, war_hash)
+                    touched += 1
+
+        if touched:
+            action = {WarEvent.CREATED: "🆕 New", WarEvent.DELETED: "❌ Deleted"}.get(event.kind, "🔁 Updated")
+            print(f"{action} {war_type.upper()} war {event.war_id} on {touched} billboard(s)")
+
+    # ---------------------------
+    # Diff-Based Reconciliation (safety net)
+    # ---------------------------
+    async def run_sync_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self.sync_wakeup.wait(), timeout=self.schedule.delay())
+            except asyncio.TimeoutError:
+                pass
+
+            if self.sync_wakeup.is_set():
+                # Woken early by a burst of changes: still keep the minimum gap between passes
+                self.sync_wakeup.clear()
+                await asyncio.sleep(self.schedule.last_pass + self.schedule.min_seconds - time.monotonic())
+
+            try:
+                await self.sync_billboards()
+            except Exception as e:
+                print(f"❌ Billboard reconcile pass failed: {e}")
+
     async def sync_billboards(self):
-        await self.sync_one("rt", RT_CHANNEL_ID, self.rt_wars)
-        await self.sync_one("ct", CT_CHANNEL_ID, self.ct_wars)
+        # RT and CT (and every guild's billboard) reconcile side by side; a slow
+        # or broken channel only holds up its own worker
+        changed = 0
+        for result in await asyncio.gather(self.sync_type("rt"), self.sync_type("ct"), return_exceptions=True):
+            if isinstance(result, Exception):
+                print(f"❌ Billboard reconcile failed: {result}")
+            else:
+                changed += result
+
+        interval = self.schedule.record_pass(changed, self.outbox_backlog())
+        print(f"📊 Billboard sync schedule: {self.schedule.stats()} — next pass in {interval:.0f}s")
+
+        print(f"📊 Billboard outbox: {self.outbox.stats()}")
+        print(f"📊 Billboard render cache: {self.render_cache.stats()}")
+        for board in self.billboards.values():
+            print(f"📊 {board}: {self.billboard_stats(board)}")
+
+    def billboard_stats(self, board: Billboard) -> dict:
+        return {
+            "wars": len(board.wars),
+            "revision": board.revision,
+            "last_sync_seconds": board.last_sync_seconds,
+            "failures": board.failures,
+            "api_calls": self.transport.api_calls(board.channel_id),
+        }
+
+    async def sync_type(self, war_type: str) -> int:
+        """Reconciles every billboard of one war type. Returns how many messages it changed."""
+        # Diffs are applied under the lock (queueing only); the Discord calls
+        # are awaited after it's released so events keep flowing meanwhile
+        started = {}
+        changed = 0
+        async with self.locks[war_type]:
+            boards = self.boards(war_type)
+            if not boards:
+                return 0
+
+            # Idle pass: one revision check, no rows read, nothing decoded
+            current = await self.store.revision(war_type)
+            behind = {}
+            for board in boards:
+                if board.revision != current:
+                    behind.setdefault(board.revision, []).append(board)
+
+            # Billboards at the same revision share one diff (normally there's just one group)
+            for since, group in behind.items():
+                changes = await self.load_changes(war_type, since)
+                if changes is None:
+                    continue
+                wars = [war.to_dict() for war in changes.wars]
+                wars = [(war, content_hash(war, RENDER_VERSION)) for war in wars]
+                for board in group:
+                    started[board] = time.perf_counter()
+                    try:
+                        changed += self.sync_board(board, changes, wars)
+                    except Exception as e:
+                        board.failures += 1
+                        print(f"❌ Failed to reconcile {board}: {e}")
 
-    async def sync_one(self, war_type: str, channel_id: int, cache: dict):
-        if not channel_id:
+        await asyncio.gather(*(self.finish_sync(board, at) for board, at in started.items()))
+        return changed
+
+    async def finish_sync(self, board: Billboard, started: float):
+        """Waits for one billboard's queued calls to go out and records how long the pass took."""
+        try:
+            await self.outbox.join(board.channel_id)
+        except Exception as e:
+            board.failures += 1
+            print(f"❌ Failed to flush {board}: {e}")
             return
+        board.last_sync_seconds = round(time.perf_counter() - started, 3)
+        SYNC_SECONDS.observe(board.last_sync_seconds, war_type=board.war_type, phase="reconcile")
 
-        channel = await self.bot.fetch_channel(channel_id)
-        latest_wars = self.load_json(war_type)
-        latest_by_id = {w["war_id"]: w for w in latest_wars}
+    def sync_board(self, board: Billboard, changes, wars: list) -> int:
+        channel_id, cache = board.channel_id, board.wars
+        added = changed = 0
 
         # ---------------------------
         # NEW or UPDATED wars
         # ---------------------------
-        for war_id, war in latest_by_id.items():
+        for war, war_hash in wars:
+            war_id = war["war_id"]
 
             # ✅ NEW WAR → create message
             if war_id not in cache:
-                embed = self.format_war(war)
-                components = self.build_war_buttons(war["war_id"])
-                msg = await channel.send(embeds=embed, components=components)
-
-                cache[war_id] = {
-                    "data": war,
-                    "message_id": msg.id
-                }
-
-                print(f"🆕 New {war_type.upper()} war {war_id}")
+                self.post_war(channel_id, cache, war, war_hash)
+                added += 1
                 continue
 
             # 🔁 UPDATED WAR → edit message
-            old_data = cache[war_id]["data"]
-            if war != old_data:
-                try:
-                    msg = await channel.fetch_message(cache[war_id]["message_id"])
-                    embed = self.format_war(war)
-                    components = self.build_war_buttons(war["war_id"])
-                    msg = await channel.send(embeds=embed, components=components)
-
-                    cache[war_id]["data"] = war
-                    print(f"🔁 Updated {war_type.upper()} war {war_id}")
-                except Exception as e:
-                    print(f"❌ Failed to edit war {war_id}: {e}")
+            if war_hash != cache[war_id]["hash"]:
+                self.update_war(channel_id, cache, war, war_hash)
+                changed += 1
 
         # ---------------------------
         # DELETED wars → delete message
         # ---------------------------
-        if self.ready and latest_by_id:
-            for war_id in list(cache.keys()):
-                if war_id not in latest_by_id:
-                    try:
-                        msg = await channel.fetch_message(cache[war_id]["message_id"])
-                        await msg.delete()
-                        print(f"❌ Deleted {war_type.upper()} war {war_id}")
-                    except Exception:
-                        pass
+        removed = changes.removed
+        if changes.full:
+            live = {war.war_id for war in changes.wars}
+            removed = [war_id for war_id in cache if war_id not in live]
+
+        removed_count = 0
+        if self.ready:
+            for war_id in removed:
+                if war_id in cache:
+                    self.remove_war(channel_id, cache, war_id)
+                    removed_count += 1
+
+        if changes.full and self.ready:
+            # Messages still up with nothing behind them (e.g. a delete the outbox gave up on)
+            tracked = self.outbox.tracked(channel_id)
+            for key in tracked:
+                if key == PLACEHOLDER_KEY:
+                    continue
+                if key.startswith(DIGEST_KEY_PREFIX):
+                    orphaned = not self.slots_for(channel_id).wars_on(int(key[len(DIGEST_KEY_PREFIX):]))
+                else:
+                    orphaned = key not in cache
+                if orphaned:
+                    self.outbox.delete(channel_id, key)
+                    removed_count += 1
+            if PLACEHOLDER_KEY not in tracked:
+                self.post_placeholder(channel_id, board.war_type)
+
+        board.revision = changes.revision
+
+        if added or changed or removed_count:
+            print(
+                f"🔄 Reconciled {board} at revision {changes.revision}: "
+                f"+{added} ~{changed} -{removed_count}"
+            )
+        return added + changed + removed_count
+
+    # ---------------------------
+    # Per-guild configuration
+    # ---------------------------
+    @slash_command(
+        name="set-billboard",
+        description="Shows this server's RT or CT war billboard in a channel.",
+        scopes=SCOPES,
+        default_member_permissions=Permissions.MANAGE_GUILD,
+        dm_permission=False,
+    )
+    @slash_option(
+        name="track_type",
+        description="Which billboard to set.",
+        required=True,
+        opt_type=OptionType.STRING,
+        choices=[
+            SlashCommandChoice(name="RT", value="RT"),
+            SlashCommandChoice(name="CT", value="CT"),
+        ],
+    )
+    @slash_option(
+        name="channel",
+        description="Channel to post the billboard in (the bot clears messages it doesn't own).",
+        required=True,
+        opt_type=OptionType.CHANNEL,
+    )
+    @timed("set-billboard")
+    async def set_billboard(self, ctx: SlashContext, track_type: str, channel: interactions.GuildText):
+        await ctx.defer(ephemeral=True)
+        replaced = await self.store.set_billboard(ctx.guild_id, track_type, channel.id)
+
+        current = self.billboards.get(channel.id)
+        if replaced == channel.id and current is not None and current.war_type == track_type.lower():
+            # Already shown here: keep the messages and just bring them up to date
+            current.revision = None
+            await self.sync_type(current.war_type)
+            return await ctx.send(f"✅ {track_type} billboard resynced in {channel.mention}.", ephemeral=True)
+
+        if replaced and replaced != channel.id:
+            await self.detach(replaced)
+        if current is not None:
+            # The channel showed the other billboard: let its deletes finish and forget its
+            # messages, or the new board would find them in the store and not post its own
+            await self.detach(channel.id)
+            await self.outbox.join(channel.id)
+            await self.store.clear_messages(channel.id)
+
+        board = Billboard(ctx.guild_id, track_type, channel.id)
+        self.billboards[channel.id] = board
+        # A newly chosen channel may be any guild channel: post into it, clear nothing
+        await self.initial_sync(board, await self.load_changes(board.war_type), purge=replaced == channel.id)
+
+        await ctx.send(f"✅ {track_type} billboard will be shown in {channel.mention}.", ephemeral=True)
+
+    @slash_command(
+        name="remove-billboard",
+        description="Stops showing this server's RT or CT war billboard.",
+        scopes=SCOPES,
+        default_member_permissions=Permissions.MANAGE_GUILD,
+        dm_permission=False,
+    )
+    @slash_option(
+        name="track_type",
+        description="Which billboard to remove.",
+        required=True,
+        opt_type=OptionType.STRING,
+        choices=[
+            SlashCommandChoice(name="RT", value="RT"),
+            SlashCommandChoice(name="CT", value="CT"),
+        ],
+    )
+    @timed("remove-billboard")
+    async def remove_billboard(self, ctx: SlashContext, track_type: str):
+        channel_id = await self.store.remove_billboard(ctx.guild_id, track_type)
+        if channel_id is None:
+            return await ctx.send(f"This server has no {track_type} billboard.", ephemeral=True)
+
+        await self.detach(channel_id)
+        await ctx.send(f"✅ {track_type} billboard removed.", ephemeral=True)
+
+    async def detach(self, channel_id: int):
+        """Stops syncing a channel and deletes the billboard messages it holds."""
+        board = self.billboards.pop(channel_id, None)
+        if board is None:
+            return
 
-                    del cache[war_id]
+        async with self.locks[board.war_type]:
+            # Keys still queued but never sent are dropped by the outbox rather than deleted
+            keys = set(self.outbox.tracked(channel_id)) | {PLACEHOLDER_KEY}
+            slots = self.slots.pop(channel_id, None)
+            if slots:
+                keys.update(digest_key(page) for page in slots.pages())
+            else:
+                keys.update(board.wars)
+
+            for entry in board.wars.values():
+                self.render_cache.invalidate(entry["hash"])
+            board.wars.clear()
+            for key in keys:
+                self.outbox.delete(channel_id, key)
+        print(f"🗑️ Detached {board}")
+
+    def drop(self):
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        if self.sync_loop is not None:
+            self.sync_loop.cancel()
+        self.event_bus.unsubscribe(self.events)
+        asyncio.ensure_future(self.outbox.close())
+        super().drop()
 
 
 # ---------------------------
 # Extension Loader
 # ---------------------------
-def setup(bot: Client):
-    PostWarBillboard(bot)
+def setup(bot: Client, store: WarStore, events: WarEventBus, shards: ShardPlan):
+    PostWarBillboard(bot, store, events, shards)
@@ -1,9 +1,15 @@
 import os
 import re
+import time
+import asyncio
+import hashlib
 import aiohttp
 import interactions
-from io import BytesIO  # ✅ NEW
+from typing import Optional
 from dotenv import load_dotenv
+from classes.http_client import SharedHttpClient
+from classes.metrics import QUEUE_DEPTH, timed
+from classes.pen_queue import DuplicateJobError, PenaltyJob, PenaltyQueue, PermanentJobError
 from interactions import (
     Extension,
     SlashContext,
@@ -14,6 +20,7 @@ from interactions import (
     Attachment,
     Embed,
     File,
+    listen,
 )
 
 load_dotenv(".env.local")
@@ -24,6 +31,107 @@ MAX_FILE_SIZE_BYTES = 25 * 1024 * 1024
 # Allowed video/image extensions for penalties
 ALLOWED_EXTENSIONS = {".mp4", ".mov", ".gif"}
 
+# The CDN response is read in chunks of this size, so only one chunk is held at a time
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+# Downloaded chunks are written to disk (off the event loop) once this much has arrived
+DOWNLOAD_FLUSH_BYTES = 1024 * 1024
+
+# Interaction tokens last 15 minutes; after that the result is sent by DM instead
+FOLLOWUP_WINDOW_SECONDS = 14 * 60
+
+# Top-level QuickTime atoms that can open a .mov without an ftyp box
+QUICKTIME_ATOMS = {b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot"}
+
+
+class PenaltyFileError(PermanentJobError):
+    """The attachment can't be submitted; the message is shown to the user."""
+
+
+def too_large_message(size: int) -> str:
+    mb = round(size / (1024 * 1024), 2)
+    limit_mb = round(MAX_FILE_SIZE_BYTES / (1024 * 1024), 2)
+    return (
+        f"That file is too large ({mb} MB).\n"
+        f"The current limit is {limit_mb} MB. "
+        "Please compress/trim the video or upload a smaller file."
+    )
+
+
+def sniff_media_type(head: bytes) -> Optional[str]:
+    """Identifies MP4/MOV/GIF from the first bytes of a file. Returns the extension or None."""
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return ".gif"
+    if head[4:8] == b"ftyp":
+        return ".mov" if head[8:12] == b"qt  " else ".mp4"
+    if head[4:8] in QUICKTIME_ATOMS:
+        return ".mov"
+    return None
+
+
+async def download_to_file(session: aiohttp.ClientSession, url: str, path: str) -> str:
+    """
+    Streams an attachment to ``path`` and returns its content hash.
+
+    The file type is checked as soon as the first bytes arrive and the size
+    limit is enforced while streaming, so bad uploads stop early and at
+    most DOWNLOAD_FLUSH_BYTES is held in memory. Disk writes happen on a
+    worker thread. The file only appears at ``path`` once it's complete.
+    CDN errors worth retrying raise RuntimeError.
+    """
+    async with session.get(url) as resp:
+        if resp.status == 429 or resp.status >= 500:
+            raise RuntimeError(f"Discord CDN returned HTTP {resp.status}")
+        if resp.status != 200:
+            raise PenaltyFileError(
+                f"Failed to download the attachment from Discord (HTTP {resp.status})."
+            )
+        if resp.content_length and resp.content_length > MAX_FILE_SIZE_BYTES:
+            raise PenaltyFileError(too_large_message(resp.content_length))
+
+        digest = hashlib.blake2b(digest_size=16)
+        tmp_path = f"{path}.tmp"
+        f = None
+        try:
+            f = await asyncio.to_thread(open, tmp_path, "wb")
+            head = b""
+            size = 0
+            pending = bytearray()
+            async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                if len(head) < 12:
+                    head += chunk[: 12 - len(head)]
+                    if len(head) >= 12 and sniff_media_type(head) is None:
+                        raise PenaltyFileError(
+                            "That file doesn't look like an MP4, MOV or GIF. "
+                            "Please upload the original video/GIF."
+                        )
+
+                size += len(chunk)
+                if size > MAX_FILE_SIZE_BYTES:
+                    raise PenaltyFileError(too_large_message(size))
+                digest.update(chunk)
+                pending += chunk
+                if len(pending) >= DOWNLOAD_FLUSH_BYTES:
+                    await asyncio.to_thread(f.write, bytes(pending))
+                    pending.clear()
+
+            await asyncio.to_thread(f.write, bytes(pending))
+            await asyncio.to_thread(f.close)
+
+            if sniff_media_type(head) is None:
+                raise PenaltyFileError("The uploaded file is empty or not a supported video/GIF.")
+
+            await asyncio.to_thread(os.replace, tmp_path, path)
+            return digest.hexdigest()
+        except BaseException:
+            try:
+                if f is not None:
+                    f.close()
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
 
 def slugify_filename(title: str, fallback: str) -> str:
     """Create a safe-ish filename from the title, falling back to original name. Removing spaces and any other chars that may
@@ -41,8 +149,21 @@ def slugify_filename(title: str, fallback: str) -> str:
 
 
 class PenSubmit(Extension):
-    def __init__(self, bot: interactions.Client):
+    def __init__(self, bot: interactions.Client, http: SharedHttpClient):
         self.bot = bot
+        self.http = http
+
+        # Submissions are spooled to disk and delivered by a small worker pool
+        self.queue = PenaltyQueue(self.deliver, self.report)
+        QUEUE_DEPTH.set_function(self.queue.backlog, queue="penalty_submissions")
+
+        # job_id -> (ctx, queued_at) for follow-ups while the interaction token is still valid
+        self.contexts = {}
+
+    @listen()
+    async def on_startup(self):
+        await self.queue.start()
+        print(f"✅ Penalty queue running ({self.queue.workers} workers)")
 
     @slash_command(
         name="submit_pen",
@@ -70,6 +191,7 @@ class PenSubmit(Extension):
         required=True,
         opt_type=OptionType.ATTACHMENT,
     )
+    @timed("submit_pen")
     async def submitpen(
         self,
         ctx: SlashContext,
@@ -80,11 +202,8 @@ class PenSubmit(Extension):
         await ctx.defer(ephemeral=True)
 
         # Channel / role IDs from env
-        spec_channel_id = (
-            int(os.getenv("SCRIM_PEN_CHANNEL"))
-            if type == "scrim"
-            else int(os.getenv("GSC_PEN_CHANNEL"))
-        )
+        spec_channel_env = os.getenv("SCRIM_PEN_CHANNEL" if type == "scrim" else "GSC_PEN_CHANNEL")
+        spec_channel_id = int(spec_channel_env) if spec_channel_env else None
         ref_role_id = os.getenv("REF_ID")
 
         if not spec_channel_id:
@@ -99,83 +218,113 @@ class PenSubmit(Extension):
                 ephemeral=True,
             )
 
-        channel = await self.bot.fetch_channel(spec_channel_id)
-        if not channel:
+        # Size check if present
+        size = getattr(video, "size", None)
+        if size is not None and size > MAX_FILE_SIZE_BYTES:
+            return await ctx.send(too_large_message(size), ephemeral=True)
+
+        # Extension check
+        filename = video.filename or "penalty.mp4" # Backup file name if not safe
+        _, ext = os.path.splitext(filename)
+        ext = ext.lower()
+        if ALLOWED_EXTENSIONS and ext not in ALLOWED_EXTENSIONS:
+            allowed_pretty = ", ".join(sorted(ALLOWED_EXTENSIONS))
             return await ctx.send(
-                "Unable to locate the referee channel.", ephemeral=True
+                f"Unsupported file type `{ext or 'unknown'}`.\n"
+                f"Allowed types: {allowed_pretty}",
+                ephemeral=True,
             )
 
-        embed = Embed(
+        # Get Discord CDN URL for the attachment
+        file_url = getattr(video, "url", None)
+        if not file_url:
+            return await ctx.send(
+                "Couldn't resolve the attachment URL from Discord.",
+                ephemeral=True,
+            )
+
+        job = PenaltyJob(
+            match_type=type,
             title=title,
-            description=f"Submitted by: {ctx.author.mention}",
-            color=0x00FF00,
+            channel_id=spec_channel_id,
+            user_id=int(ctx.author.id),
+            filename=filename,
+            url=file_url,
         )
 
         try:
-            # Size check if present
-            size = getattr(video, "size", None)
-            if size is not None and size > MAX_FILE_SIZE_BYTES:
-                mb = round(size / (1024 * 1024), 2)
-                limit_mb = round(MAX_FILE_SIZE_BYTES / (1024 * 1024), 2)
-                return await ctx.send(
-                    f"That file is too large ({mb} MB).\n"
-                    f"The current limit is {limit_mb} MB. "
-                    "Please compress/trim the video or upload a smaller file.",
-                    ephemeral=True,
-                )
-
-            # Extension check
-            filename = video.filename or "penalty.mp4" # Backup file name if not safe
-            _, ext = os.path.splitext(filename)
-            ext = ext.lower()
-            if ALLOWED_EXTENSIONS and ext not in ALLOWED_EXTENSIONS:
-                allowed_pretty = ", ".join(sorted(ALLOWED_EXTENSIONS))
-                return await ctx.send(
-                    f"Unsupported file type `{ext or 'unknown'}`.\n"
-                    f"Allowed types: {allowed_pretty}",
-                    ephemeral=True,
-                )
-
-            # Get Discord CDN URL for the attachment
-            file_url = getattr(video, "url", None)
-            if not file_url:
-                return await ctx.send(
-                    "Couldn't resolve the attachment URL from Discord.",
-                    ephemeral=True,
-                )
-
-            # Download from CDN with aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(file_url) as resp:
-                    if resp.status != 200:
-                        return await ctx.send(
-                            f"Failed to download the attachment from Discord (HTTP {resp.status}).",
-                            ephemeral=True,
-                        )
-                    file_bytes = await resp.read()
-
-            auto_name = slugify_filename(title, filename)
-
-            penalty_file = File(
-                BytesIO(file_bytes),  # Used to make the file bytes act like an object (needed for sending)
-                file_name=auto_name,
-            )
-
-            await channel.send(
-                content=f"<@&{ref_role_id}>",
-                embeds=[embed],
-                files=[penalty_file],
-            )
-
-            await ctx.send("Penalty submitted successfully!", ephemeral=True)
-
+            await self.queue.submit(job)
         except Exception as e:
             print("SubmitPen Error:", repr(e))
-            await ctx.send(
+            return await ctx.send(
                 "Something went wrong when submitting your penalty!",
                 ephemeral=True,
             )
 
+        self.contexts[job.job_id] = (ctx, time.monotonic())
+        backlog = self.queue.backlog()
+        await ctx.send(
+            "📨 Penalty received — you'll get a confirmation once the referees have it."
+            + (f" ({backlog} submissions ahead of yours.)" if backlog > 1 else ""),
+            ephemeral=True,
+        )
+
+    # ---------------------------
+    # Queue worker callbacks
+    # ---------------------------
+    async def deliver(self, job: PenaltyJob):
+        """Downloads the attachment (once) and posts it to the referee channel. Raises to retry."""
+        path = self.queue.blob_path(job)
+        if job.content_hash is None or not os.path.exists(path):
+            # Stream from CDN over the shared pool (type + size checked while downloading)
+            job.content_hash = await download_to_file(self.http.session, job.url, path)
+            await self.queue.save(job)
+
+        earlier = await self.queue.claim(job)
+        if earlier is not None:
+            raise DuplicateJobError("That clip has already been submitted to the referees.")
+
+        channel = await self.bot.fetch_channel(job.channel_id)
+        if not channel:
+            raise RuntimeError(f"Unable to locate the referee channel {job.channel_id}.")
+
+        embed = Embed(
+            title=job.title,
+            description=f"Submitted by: <@{job.user_id}>",
+            color=0x00FF00,
+        )
+        penalty_file = File(
+            path,  # read back from the spool on disk, never fully loaded into memory
+            file_name=slugify_filename(job.title, job.filename),
+        )
+        await channel.send(
+            content=f"<@&{os.getenv('REF_ID')}>",
+            embeds=[embed],
+            files=[penalty_file],
+        )
+
+    async def report(self, job: PenaltyJob, error: Optional[str]):
+        message = (
+            f"✅ Penalty **{job.title}** submitted successfully!"
+            if error is None
+            else f"❌ Penalty **{job.title}** wasn't submitted: {error}"
+        )
+
+        ctx, queued_at = self.contexts.pop(job.job_id, (None, 0.0))
+        if ctx is not None and time.monotonic() - queued_at < FOLLOWUP_WINDOW_SECONDS:
+            try:
+                return await ctx.send(message, ephemeral=True)
+            except Exception as e:
+                print(f"⚠️ Follow-up for penalty job {job.job_id} failed, falling back to DM: {e!r}")
+
+        user = await self.bot.fetch_user(job.user_id)
+        if user is not None:
+            await user.send(message)
+
+    def drop(self):
+        asyncio.ensure_future(self.queue.close())
+        super().drop()
+
 
-def setup(bot: interactions.Client):
-    PenSubmit(bot)
+def setup(bot: interactions.Client, http: SharedHttpClient):
+    PenSubmit(bot, http)
@@ -0,0 +1,69 @@
+import asyncio
+import interactions
+from classes.expiry import ExpiryScheduler
+from classes.metrics import QUEUE_DEPTH
+from classes.war import War
+from classes.war_events import WarEvent, WarEventBus
+from classes.war_store import WarStore
+from interactions import Extension, listen
+
+
+class WarExpiry(Extension):
+    """
+    Deletes wars once their start time (plus grace) has passed.
+
+    Deadlines live in a heap fed by the event bus, so nothing scans the
+    store on a timer. The delete goes through the store like any other, so
+    the billboard and matchmaking index drop the war via their own events.
+    """
+
+    def __init__(self, bot: interactions.Client, store: WarStore, events: WarEventBus):
+        self.bot = bot
+        self.store = store
+        self.scheduler = ExpiryScheduler(self.expire)
+        QUEUE_DEPTH.set_function(lambda: len(self.scheduler), queue="war_expiry")
+
+        self.event_bus = events
+        self.events = events.subscribe()
+        self.event_consumer = None
+
+    @listen()
+    async def on_startup(self):
+        for war_type in ("RT", "CT"):
+            changes = await self.store.changes_since(war_type, None)
+            for war in changes.wars:
+                self.schedule(war)
+
+        self.scheduler.start()
+        if self.event_consumer is None:
+            self.event_consumer = asyncio.create_task(self.consume_events())
+        print(f"✅ War expiry tracking {len(self.scheduler)} wars")
+
+    def schedule(self, war: War):
+        self.scheduler.schedule(war.war_id, war.expires_at().timestamp())
+
+    async def consume_events(self):
+        while True:
+            event = await self.events.get()
+            try:
+                if event.kind == WarEvent.DELETED:
+                    self.scheduler.cancel(event.war_id)
+                else:
+                    self.schedule(War.from_dict(event.war))
+            except Exception as e:
+                print(f"❌ War expiry failed to handle {event}: {e}")
+
+    async def expire(self, war_id: str):
+        await self.store.delete(war_id, reason="expired")
+        print(f"⌛ Expired war {war_id}")
+
+    def drop(self):
+        self.scheduler.stop()
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        self.event_bus.unsubscribe(self.events)
+        super().drop()
+
+
+def setup(bot: interactions.Client, store: WarStore, events: WarEventBus):
+    WarExpiry(bot, store, events)
@@ -0,0 +1,179 @@
+import os
+import asyncio
+import interactions
+from typing import Dict, List, Optional
+from classes.metrics import QUEUE_DEPTH, timed
+from classes.war import STATUS_ACCEPTED, War
+from classes.war_events import WarEvent, WarEventBus
+from classes.war_history import ACCEPTED, CREATED, DELETED, EXPIRED, JOINED, LEFT, WarLog
+from classes.war_store import WarStore
+from interactions import (
+    Extension,
+    SlashContext,
+    slash_command,
+    slash_option,
+    OptionType,
+)
+from dotenv import load_dotenv
+
+load_dotenv(".env.local")
+
+PROJECT_ENV = os.getenv("PROJECT_ENVIRONMENT", "local").lower()
+DEV = PROJECT_ENV == "local"
+
+GUILD_ID = int(os.getenv("GUILD_ID")) if os.getenv("GUILD_ID") else 1436538029316636705
+SCOPES = [GUILD_ID] if DEV else None
+
+
+class WarHistory(Extension):
+    """
+    Keeps a history of every war's lifecycle (created, joined, left,
+    accepted, expired) after it leaves the store, and answers /war-stats
+    from totals kept up to date as records are appended.
+    """
+
+    def __init__(self, bot: interactions.Client, store: WarStore, events: WarEventBus, log: WarLog):
+        self.bot = bot
+        self.store = store
+        self.log = log  # owned by main, which closes it on shutdown
+        QUEUE_DEPTH.set_function(self.log.pending, queue="war_history")
+
+        # What the history last saw of each live war: war_id -> {"team", "players", "accepted"},
+        # so updates can be turned into joins/leaves and deletes still know the team
+        self.live: Dict[str, dict] = {}
+
+        self.event_bus = events
+        self.events = events.subscribe()
+
+        # Started at load rather than on_startup, so the log and the store snapshot are read
+        # while the bot is still logging in, ahead of commands and the startup expiry sweep;
+        # every change from then on waits in the queue above
+        self.event_consumer = asyncio.create_task(self.consume_events())
+
+    async def load(self):
+        replayed = await self.log.open()
+        for war_type in ("RT", "CT"):
+            changes = await self.store.changes_since(war_type, None)
+            for war in changes.wars:
+                self.live[war.war_id] = self.describe(war.to_dict())
+        print(
+            f"✅ War history at record {self.log.seq} "
+            f"({replayed} replayed since the snapshot, {len(self.live)} live wars)"
+        )
+
+    # ---------------------------
+    # Events -> lifecycle records
+    # ---------------------------
+    @staticmethod
+    def describe(war: dict) -> dict:
+        return {
+            "team": war.get("team_name"),
+            "players": {player.key: player.player for player in War.from_dict(war).lineup},
+            "accepted": war.get("status") == STATUS_ACCEPTED,
+        }
+
+    def records_for(self, event: WarEvent) -> List[dict]:
+        base = {"war_id": event.war_id, "war_type": event.war_type}
+
+        if event.kind == WarEvent.DELETED:
+            seen = self.live.pop(event.war_id, None)
+            if seen is None:
+                return []
+            kind = EXPIRED if event.reason == "expired" else DELETED
+            return [{**base, "kind": kind, "team": seen["team"], "matched": seen["accepted"]}]
+
+        current = self.describe(event.war)
+        seen = self.live.get(event.war_id)
+        self.live[event.war_id] = current
+        if seen is None or event.kind == WarEvent.CREATED:
+            # An insert is always a new war, even if the startup snapshot already showed it
+            players = [[key, name] for key, name in current["players"].items()]
+            return [{**base, "kind": CREATED, "team": current["team"], "players": players}]
+
+        # Plain edits land here too: only differences are recorded
+        records = []
+        joined = [[key, name] for key, name in current["players"].items() if key not in seen["players"]]
+        left = [[key, name] for key, name in seen["players"].items() if key not in current["players"]]
+        if joined:
+            records.append({**base, "kind": JOINED, "players": joined})
+        if left:
+            records.append({**base, "kind": LEFT, "players": left})
+        if current["accepted"] and not seen["accepted"]:
+            records.append({**base, "kind": ACCEPTED, "team": current["team"], "opponent": event.war.get("opponent")})
+        return records
+
+    async def consume_events(self):
+        try:
+            await self.load()
+        except Exception as e:
+            # Appending without the replayed seq would reuse record numbers
+            print(f"❌ War history failed to load, not recording: {e}")
+            return
+
+        while True:
+            event = await self.events.get()
+            try:
+                for record in self.records_for(event):
+                    self.log.append(record)
+            except Exception as e:
+                print(f"❌ War history failed to record {event}: {e}")
+
+    # ---------------------------
+    # War Stats
+    # ---------------------------
+    @slash_command(
+        name="war-stats",
+        description="Shows how many wars a team has posted and played, and a player's war count.",
+        scopes=SCOPES
+    )
+    @slash_option(
+        name="team_name",
+        description="Team to look up. Defaults to this server's name.",
+        required=False,
+        opt_type=OptionType.STRING
+    )
+    @slash_option(
+        name="player",
+        description="Player to look up. Defaults to you.",
+        required=False,
+        opt_type=OptionType.USER
+    )
+    @timed("war-stats")
+    async def war_stats(
+        self,
+        ctx: SlashContext,
+        team_name: Optional[str] = None,
+        player: Optional[interactions.User] = None,
+    ):
+        team_name = team_name or (ctx.guild.name if ctx.guild else None)
+        player = player or ctx.author
+        stats = self.log.stats
+
+        lines = []
+        team = stats.team(team_name) if team_name else None
+        if team:
+            lines.append(
+                f"**{team['name']}** — {team['posted']} posted, {team['matched']} played, "
+                f"{team['unmatched']} expired unmatched"
+            )
+        elif team_name:
+            lines.append(f"No wars recorded for **{team_name}** yet.")
+
+        entry = stats.player(str(player.id))
+        if entry:
+            lines.append(f"{player.mention} — in {entry['wars']} war lineup(s)")
+        else:
+            lines.append(f"{player.mention} hasn't joined any wars yet.")
+
+        await ctx.send("\n".join(lines), ephemeral=True)
+
+    def drop(self):
+        if self.event_consumer is not None:
+            self.event_consumer.cancel()
+        self.event_bus.unsubscribe(self.events)
+        asyncio.ensure_future(self.log.close())
+        super().drop()
+
+
+def setup(bot: interactions.Client, store: WarStore, events: WarEventBus, log: WarLog):
+    WarHistory(bot, store, events, log)
@@ -1,12 +1,21 @@
 import os
+import asyncio
 from dotenv import load_dotenv
-from google.cloud import secretmanager
-from google.api_core.exceptions import NotFound, PermissionDenied
 
 import interactions  # interactions.py
+from classes.cache_policy import cache_kwargs, cache_report, gateway_intents
+from classes.http_client import SharedHttpClient
+from classes.lineup_index import LineupIndex
+from classes.loop_monitor import LoopLagMonitor
+from classes.metrics import QUEUE_DEPTH, MetricsExporter, timed
+from classes.secret_provider import SecretProvider
+from classes.sharding import ShardPlan
+from classes.war_events import WarEventBus
+from classes.war_history import WarLog
+from classes.war_store import WarStore
 
 # ---------------------------
-# Env & Google Secret Manager
+# Env & Secrets
 # ---------------------------
 load_dotenv(".env.local")
 
@@ -20,61 +29,31 @@ DEV = PROJECT_ENV == "local"
 print("Environment:", PROJECT_ENV)
 print("DEV MODE:", DEV)
 
-# ---------------------------
-# Secrets Helpers
-# ---------------------------
-def decode_and_normalise_secret(raw: bytes) -> str:
-    """
-    Try UTF-8 first, then UTF-16 (handles BOM), then 'latin-1'.
-    Strip BOM, nulls, and trailing whitespace/newlines.
-    """
-    try:
-        text = raw.decode("utf-8")
-    except UnicodeDecodeError:
-        try:
-            text = raw.decode("utf-16")
-        except UnicodeDecodeError:
-            text = raw.decode("latin-1")
-
-    text = text.replace("\ufeff", "").replace("\x00", "")
-    return text.strip()
-
-
-def get_secret(secret_id: str, version_id: str = "latest") -> str:
-    """Fetches a secret string from Google Secret Manager and normalises it."""
-    client = secretmanager.SecretManagerServiceClient()
-    name = f"projects/{PROJECT_SECRET_ID}/secrets/{secret_id}/versions/{version_id}"
-    try:
-        resp = client.access_secret_version(request={"name": name})
-        secret_text = decode_and_normalise_secret(resp.payload.data)
-
-        # sanity check: Discord bot tokens are three dot-separated parts.
-        if secret_id.startswith("discord_"):
-            if secret_text.count(".") != 2:
-                raise RuntimeError(
-                    f"Secret '{secret_id}' does not look like a Discord bot token "
-                    "(expected three dot-separated parts)."
-                )
-        return secret_text
-    except PermissionDenied:
-        raise RuntimeError(f"No access to secret '{secret_id}'. Check IAM permissions.")
-    except NotFound:
-        raise RuntimeError(f"Secret or version not found: {name}")
-
-
 # ---------------------------
 # Fetch the Discord bot token
 # ---------------------------
-token = get_secret("discord_key_local" if DEV else "discord_key_prod")
+# Env vars / encrypted cache first; the Google SDK is only imported if they miss
+secrets = SecretProvider.from_env(PROJECT_SECRET_ID)
+token = secrets.get("discord_key_local" if DEV else "discord_key_prod")
+print(f"🔑 Bot token resolved via {secrets.last_backend} in {secrets.last_duration * 1000:.0f} ms")
 
 
 # ---------------------------
 # interactions.py Client
 # ---------------------------
-bot = interactions.Client(
+# Only the intents and caches the cogs use (see classes/cache_policy.py), so
+# memory doesn't grow with every member and message of every guild.
+# Large deployments shard the gateway (see classes/sharding.py).
+shards = ShardPlan.from_env()
+client_class = interactions.AutoShardedClient if shards.auto else interactions.Client
+print(f"Gateway: {shards}")
+
+bot = client_class(
     token=token,
-    intents=interactions.Intents.DEFAULT,
+    intents=gateway_intents(),
     send_command_tracebacks=False,
+    **shards.client_kwargs(),
+    **cache_kwargs(),
 )
 
 
@@ -86,6 +65,9 @@ GUILD_ID = int(GUILD_ID_ENV) if GUILD_ID_ENV else 1436538029316636705
 
 SCOPES = [GUILD_ID] if DEV else None
 
+# Warns when something blocks the event loop (and the gateway heartbeat with it)
+loop_monitor = LoopLagMonitor()
+
 
 # ---------------------------
 # Slash Commands
@@ -99,6 +81,19 @@ async def hello(ctx: interactions.SlashContext):
     await ctx.send(f"Hello, {ctx.author.display_name}! 👋", ephemeral=False)
 
 
+@interactions.slash_command(
+    name="memory-report",
+    description="Shows gateway cache sizes, memory use and event loop lag.",
+    scopes=SCOPES,
+)
+@timed("memory-report")
+async def memory_report(ctx: interactions.SlashContext):
+    report = cache_report(bot)
+    report.update({f"loop_lag_{name}": value for name, value in loop_monitor.stats().items()})
+    lines = "\n".join(f"{name}: {value}" for name, value in report.items())
+    await ctx.send(f"```\n{lines}\n```", ephemeral=True)
+
+
 # ---------------------------
 # Ready Event
 # ---------------------------
@@ -112,58 +107,55 @@ async def on_startup():
     else:
         print("🌍 PROD MODE: Slash commands registered globally (may take up to 1 hour)")
 
-    rt_war_channel_id = int(os.getenv("RT_WAR_ID")) if os.getenv("RT_WAR_ID") else None
-    ct_war_channel_id = int(os.getenv("CT_WAR_ID")) if os.getenv("CT_WAR_ID") else None
-
-    async def clear_and_post(channel_id: int, placeholder: str):
-        if not channel_id:
-            print("Channel ID missing.")
-            return
-
-        try:
-            channel = await bot.fetch_channel(channel_id)
-            if channel is None:
-                print(f"Channel {channel_id} not found — check permissions.")
-                return
-        except Exception as e:
-            print(f"Error fetching channel {channel_id}: {e}")
-            return
-
-        cleared = 0
-        try:
-            recent = await channel.fetch_messages(limit=100)
-            for msg in recent:
-                try:
-                    await msg.delete()
-                    cleared += 1
-                except interactions.LibraryException:
-                    pass
-            print(f"Cleared {cleared} messages in #{channel.name}")
-        except Exception as e:
-            print(f"Error clearing #{channel.name}: {e}")
-
-        try:
-            await channel.send(placeholder)
-            print(f"Sent placeholder in #{channel.name}")
-        except Exception as e:
-            print(f"Error sending to #{channel.name}: {e}")
-
-    if rt_war_channel_id:
-        await clear_and_post(rt_war_channel_id, "Placeholder for RT War")
-    else:
-        print("RT war channel not configured — set RT_WAR_ID in env.")
+    # Billboard channels are reconciled (not wiped) by the post_war_billboard extension
 
-    if ct_war_channel_id:
-        await clear_and_post(ct_war_channel_id, "Placeholder for CT War")
-    else:
-        print("CT war channel not configured — set CT_WAR_ID in env.")
+    print(f"🧠 Gateway caches at startup: {cache_report(bot)}")
 
 
 # ---------------------------
 # Run
 # ---------------------------
+async def main():
+    # One store shared by every cog that reads or writes wars; committed
+    # changes are pushed to the billboard through the event bus.
+    war_events = WarEventBus()
+    war_store = WarStore(events=war_events)
+
+    # One pooled HTTP session for every extension that downloads/uploads
+    http_client = SharedHttpClient()
+    await http_client.start()
+
+    # Player -> wars index shared by /create-new-war and /join-war (kept current by cogs.lineup)
+    lineups = LineupIndex()
+
+    # Append-only war history behind /war-stats (filled by cogs.war_history)
+    war_log = WarLog()
+
+    # Prometheus endpoint / textfile, when METRICS_PORT or METRICS_TEXTFILE is set
+    QUEUE_DEPTH.set_function(war_events.pending, queue="war_events")
+    metrics = MetricsExporter()
+    await metrics.start()
+    loop_monitor.start()
+
+    bot.load_extension("cogs.create_new_war", store=war_store, lineups=lineups)
+    bot.load_extension("cogs.submit_pen", http=http_client)
+    bot.load_extension("cogs.post_war_billboard", store=war_store, events=war_events, shards=shards)
+    bot.load_extension("cogs.matchmaking", store=war_store, events=war_events)
+    bot.load_extension("cogs.list_wars", store=war_store, events=war_events)
+    bot.load_extension("cogs.war_expiry", store=war_store, events=war_events)
+    bot.load_extension("cogs.lineup", store=war_store, events=war_events, lineups=lineups)
+    bot.load_extension("cogs.war_history", store=war_store, events=war_events, log=war_log)
+
+    try:
+        await bot.astart()
+    finally:
+        print(f"HTTP pool stats: {http_client.stats()}")
+        await loop_monitor.stop()
+        await metrics.close()
+        await http_client.close()
+        await war_log.close()
+        await war_store.close()
+
+
 if __name__ == "__main__":
-    bot.load_extension("cogs.create_new_war")
-    bot.load_extension("cogs.submit_pen")
-    bot.load_extension("cogs.post_war_billboard")
-    bot.start()
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+import unittest
+from classes.billboard_outbox import FAILED, BillboardOutbox, FakeTransport, RateLimited
+
+CHANNEL = 1
+
+
+class FlakyTransport(FakeTransport):
+    """FakeTransport whose next ``failures`` calls raise ``error`` (a network-style error by default)."""
+
+    def __init__(self, failures: int, error: Exception = None, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.error = error or ConnectionError("connection reset")
+
+    async def _call(self, method: str, channel_id: int):
+        if self.failures > 0:
+            self.failures -= 1
+            self.calls.append((method, channel_id))
+            raise self.error
+        return await super()._call(method, channel_id)
+
+
+class BillboardOutboxTest(unittest.IsolatedAsyncioTestCase):
+    def make_outbox(self, transport, **kwargs):
+        self.notified = []
+        outbox = BillboardOutbox(
+            transport,
+            on_message=lambda *args: self.notified.append(args),
+            retry_base=0.01,
+            retry_max=0.02,
+            **kwargs,
+        )
+        self.addAsyncCleanup(outbox.close)
+        return outbox
+
+    async def test_updates_coalesce_into_one_send(self):
+        transport = FakeTransport()
+        outbox = self.make_outbox(transport)
+
+        for n in range(5):
+            outbox.upsert(CHANNEL, "war", {"content": f"v{n}"}, tag=n)
+        await outbox.join(CHANNEL)
+
+        self.assertEqual(transport.calls, [("send", CHANNEL)])
+        self.assertEqual(list(transport.messages[CHANNEL].values()), [{"content": "v4"}])
+        self.assertEqual(outbox.counters["coalesced"], 4)
+        self.assertEqual(self.notified, [(CHANNEL, "war", 1, 4)])
+
+    async def test_upsert_then_delete_never_reaches_discord(self):
+        transport = FakeTransport()
+        outbox = self.make_outbox(transport)
+
+        outbox.upsert(CHANNEL, "war", {"content": "v1"})
+        outbox.delete(CHANNEL, "war")
+        await outbox.join(CHANNEL)
+
+        self.assertEqual(transport.calls, [])
+        self.assertEqual(outbox.tracked(CHANNEL), {})
+
+    async def test_rate_limited_op_is_requeued(self):
+        transport = FlakyTransport(failures=1, error=RateLimited(0.01))
+        outbox = self.make_outbox(transport, max_retries=0)
+
+        for n in range(3):
+            outbox.upsert(CHANNEL, f"war-{n}", {"content": str(n)})
+        await outbox.join(CHANNEL)
+
+        # 429s don't use up retries (there are none here) and the op goes out first once the wait is over
+        self.assertEqual(outbox.counters["rate_limited"], 1)
+        self.assertEqual(outbox.counters["failed"], 0)
+        self.assertEqual(outbox.counters["sent"], 3)
+        self.assertEqual(transport.messages[CHANNEL][1], {"content": "0"})
+        self.assertEqual(sorted(outbox.tracked(CHANNEL)), ["war-0", "war-1", "war-2"])
+        self.assertEqual(len(transport.messages[CHANNEL]), 3)
+
+    async def test_failed_op_is_retried(self):
+        transport = FlakyTransport(failures=2)
+        outbox = self.make_outbox(transport, max_retries=3)
+
+        outbox.upsert(CHANNEL, "war", {"content": "v1"}, tag="hash")
+        await outbox.join(CHANNEL)
+
+        self.assertEqual(outbox.counters["errors"], 2)
+        self.assertEqual(outbox.counters["retried"], 2)
+        self.assertEqual(outbox.counters["failed"], 0)
+        self.assertEqual(outbox.tracked(CHANNEL), {"war": 1})
+        self.assertEqual(self.notified, [(CHANNEL, "war", 1, "hash")])
+
+    async def test_exhausted_retries_are_reported(self):
+        transport = FlakyTransport(failures=10)
+        outbox = self.make_outbox(transport, max_retries=2)
+
+        outbox.upsert(CHANNEL, "war", {"content": "v1"}, tag="hash")
+        await outbox.join(CHANNEL)
+
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(outbox.counters["failed"], 1)
+        self.assertEqual(outbox.tracked(CHANNEL), {})
+        self.assertEqual(self.notified, [(CHANNEL, "war", None, FAILED)])
+
+    async def test_failed_delete_keeps_message_tracked(self):
+        transport = FlakyTransport(failures=0)
+        outbox = self.make_outbox(transport, max_retries=1)
+        outbox.upsert(CHANNEL, "war", {"content": "v1"})
+        await outbox.join(CHANNEL)
+
+        transport.failures = 10
+        outbox.delete(CHANNEL, "war")
+        await outbox.join(CHANNEL)
+
+        self.assertEqual(outbox.tracked(CHANNEL), {"war": 1})
+        self.assertEqual(self.notified[-1], (CHANNEL, "war", 1, FAILED))
+
+
+if __name__ == "__main__":
+    unittest.main()
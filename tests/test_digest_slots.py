@@ -0,0 +1,80 @@
+import unittest
+from classes.digest_slots import DigestSlots
+
+
+class DigestSlotsTest(unittest.TestCase):
+    def test_wars_fill_pages_in_order(self):
+        slots = DigestSlots(page_size=2)
+        pages = [slots.assign(f"war-{n}") for n in range(5)]
+
+        self.assertEqual(pages, [0, 0, 1, 1, 2])
+        self.assertEqual(slots.pages(), [0, 1, 2])
+        self.assertEqual(slots.wars_on(1), ["war-2", "war-3"])
+
+    def test_assignment_is_stable(self):
+        slots = DigestSlots(page_size=2)
+        for n in range(4):
+            slots.assign(f"war-{n}")
+
+        self.assertEqual(slots.assign("war-2"), 1)
+        self.assertEqual(slots.release("war-0"), 0)
+        # Releasing a war doesn't shift the others
+        self.assertEqual([slots.page_of(f"war-{n}") for n in (1, 2, 3)], [0, 1, 1])
+        self.assertEqual(slots.wars_on(0), ["war-1"])
+
+    def test_freed_slot_is_reused_lowest_first(self):
+        slots = DigestSlots(page_size=2)
+        for n in range(6):
+            slots.assign(f"war-{n}")
+        slots.release("war-4")
+        slots.release("war-1")
+
+        self.assertEqual(slots.assign("new-a"), 0)
+        self.assertEqual(slots.wars_on(0), ["war-0", "new-a"])
+        self.assertEqual(slots.assign("new-b"), 2)
+
+    def test_empty_pages_disappear(self):
+        slots = DigestSlots(page_size=2)
+        for n in range(3):
+            slots.assign(f"war-{n}")
+        slots.release("war-2")
+
+        self.assertEqual(slots.pages(), [0])
+        self.assertIsNone(slots.release("war-2"))
+        self.assertNotIn("war-2", slots)
+        self.assertEqual(len(slots), 2)
+
+    def test_pages_are_capped_by_rendered_size(self):
+        slots = DigestSlots(page_size=10, page_chars=100)
+        self.assertEqual(slots.assign("big", 70), 0)
+        self.assertEqual(slots.assign("medium", 40), 1)  # 110 chars won't fit on page 0
+        self.assertEqual(slots.assign("small", 30), 0)
+        self.assertEqual(slots.wars_on(0), ["big", "small"])
+
+    def test_war_that_outgrows_its_page_moves(self):
+        slots = DigestSlots(page_size=10, page_chars=100)
+        slots.assign("a", 40)
+        slots.assign("b", 40)
+
+        self.assertEqual(slots.assign("b", 50), 0)  # still fits
+        self.assertEqual(slots.assign("b", 70), 1)
+        self.assertEqual(slots.wars_on(0), ["a"])
+        self.assertEqual(slots.assign("c", 60), 0)  # b's old room is free again
+
+    def test_oversized_war_gets_a_page_of_its_own(self):
+        slots = DigestSlots(page_size=10, page_chars=100)
+        slots.assign("a", 10)
+
+        self.assertEqual(slots.assign("huge", 150), 1)
+        self.assertEqual(slots.assign("huge", 200), 1)
+        self.assertEqual(slots.assign("b", 10), 0)
+
+    def test_page_size_is_bounded_by_discord(self):
+        with self.assertRaises(ValueError):
+            DigestSlots(page_size=11)
+        with self.assertRaises(ValueError):
+            DigestSlots(page_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
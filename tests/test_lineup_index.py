@@ -0,0 +1,75 @@
+import unittest
+from classes.lineup_index import WAR_DURATION_SECONDS, LineupIndex
+from classes.player import Player
+from classes.war import War
+from classes.war_events import WarEvent
+
+START = "2026-01-01T20:00:00+00:00"
+START_UNIX = 1767297600.0  # START as a unix timestamp
+
+
+def make_war(*user_ids: int, start_time: str = START) -> War:
+    war = War("RT", "Alpha", start_time=start_time, last_updated=START)
+    for user_id in user_ids:
+        war.add_player(Player(f"player-{user_id}", "Runner", user_id=user_id))
+    return war
+
+
+class LineupIndexTest(unittest.TestCase):
+    def test_conflict_within_war_duration(self):
+        index = LineupIndex()
+        war = make_war(1, 2)
+        index.add(war)
+
+        self.assertEqual(index.conflict("1", START_UNIX + WAR_DURATION_SECONDS - 1), war.war_id)
+        self.assertEqual(index.conflict("2", START_UNIX - WAR_DURATION_SECONDS + 1), war.war_id)
+        self.assertIsNone(index.conflict("1", START_UNIX + WAR_DURATION_SECONDS))
+        self.assertIsNone(index.conflict("3", START_UNIX))
+        self.assertIsNone(index.conflict("1", START_UNIX, exclude_war=war.war_id))
+
+    def test_lineup_change_replaces_old_entries(self):
+        index = LineupIndex()
+        war = make_war(1, 2)
+        index.add(war)
+
+        war.remove_player("1")
+        index.add(war)
+        self.assertIsNone(index.conflict("1", START_UNIX))
+        self.assertEqual(index.wars_for("2"), {war.war_id})
+
+        war.remove_player("2")
+        index.add(war)  # empty lineup: nothing left to index
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.wars_for("2"), set())
+
+    def test_events_keep_the_index_current(self):
+        index = LineupIndex()
+        war = make_war(1)
+        index.apply_event(WarEvent(WarEvent.CREATED, war.war_id, "RT", war.to_dict()))
+        self.assertEqual(index.wars_for("1"), {war.war_id})
+
+        index.apply_event(WarEvent(WarEvent.DELETED, war.war_id, "RT"))
+        self.assertEqual(index.wars_for("1"), set())
+        self.assertIsNone(index.conflict("1", START_UNIX))
+
+    def test_reserve_blocks_a_second_booking_until_released(self):
+        index = LineupIndex()
+        self.assertTrue(index.reserve("1"))
+        self.assertFalse(index.reserve("1"))
+        self.assertTrue(index.reserve("2"))
+
+        index.release("1")
+        self.assertTrue(index.reserve("1"))
+        index.release("3")  # never reserved: no-op
+
+    def test_legacy_entries_are_keyed_by_name(self):
+        index = LineupIndex()
+        war = make_war()
+        war.add_player(Player("OldTimer", "Runner"))
+        index.add(war)
+
+        self.assertEqual(index.wars_for("oldtimer"), {war.war_id})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+from classes.pen_queue import DuplicateJobError, PenaltyJob, PenaltyQueue, PermanentJobError
+
+
+def make_job(**kwargs) -> PenaltyJob:
+    fields = {
+        "match_type": "RT",
+        "title": "Penalty",
+        "channel_id": 1,
+        "user_id": 2,
+        "filename": "clip.mp4",
+        "url": "https://cdn.example/clip.mp4",
+    }
+    fields.update(kwargs)
+    return PenaltyJob(**fields)
+
+
+class PenaltyQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.finished = {}  # job_id -> error
+        self.done = asyncio.Event()
+        self.expected = 1
+        self.failures = {}  # job_id -> exceptions process() raises before succeeding
+        self.processed = []
+
+    def make_queue(self, **kwargs) -> PenaltyQueue:
+        async def process(job: PenaltyJob):
+            self.processed.append(job.job_id)
+            pending = self.failures.get(job.job_id)
+            if pending:
+                raise pending.pop(0)
+            job.content_hash = job.content_hash or hashlib.sha256(job.url.encode()).hexdigest()
+            holder = await queue.claim(job)
+            if holder is not None:
+                raise DuplicateJobError(f"Already submitted as {holder}")
+
+        async def on_finished(job: PenaltyJob, error):
+            self.finished[job.job_id] = error
+            if len(self.finished) >= self.expected:
+                self.done.set()
+
+        options = {"workers": 2, "max_attempts": 3, "backoff_base": 0.01, "dedup_ttl": 60}
+        options.update(kwargs)
+        queue = PenaltyQueue(process, on_finished, directory=self.tmp.name, **options)
+        self.addAsyncCleanup(queue.close)
+        return queue
+
+    async def wait_finished(self):
+        await asyncio.wait_for(self.done.wait(), timeout=5)
+
+    async def test_failed_job_is_retried_until_delivered(self):
+        queue = self.make_queue()
+        await queue.start()
+        job = make_job()
+        self.failures[job.job_id] = [ConnectionError("reset"), ConnectionError("reset")]
+
+        await queue.submit(job)
+        await self.wait_finished()
+
+        self.assertEqual(self.finished, {job.job_id: None})
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(queue.counters["retried"], 2)
+        self.assertEqual(queue.counters["delivered"], 1)
+        self.assertEqual(os.listdir(queue.jobs_dir), [])
+        self.assertEqual(queue.backlog(), 0)
+
+    async def test_job_gives_up_after_max_attempts(self):
+        queue = self.make_queue(max_attempts=2)
+        await queue.start()
+        job = make_job()
+        self.failures[job.job_id] = [ConnectionError("reset")] * 5
+
+        await queue.submit(job)
+        await self.wait_finished()
+
+        self.assertEqual(self.processed, [job.job_id] * 2)
+        self.assertIsNotNone(self.finished[job.job_id])
+        self.assertEqual(queue.counters["failed"], 1)
+        self.assertEqual(os.listdir(queue.jobs_dir), [])
+
+    async def test_permanent_error_is_not_retried(self):
+        queue = self.make_queue()
+        await queue.start()
+        job = make_job()
+        self.failures[job.job_id] = [PermanentJobError("That file isn't a video.")]
+
+        await queue.submit(job)
+        await self.wait_finished()
+
+        self.assertEqual(self.processed, [job.job_id])
+        self.assertEqual(self.finished[job.job_id], "That file isn't a video.")
+
+    async def test_pending_jobs_resume_after_restart(self):
+        stopped = self.make_queue()
+        job = make_job()
+        await stopped.submit(job)  # never started: the job only exists on disk now
+        await stopped.close()
+
+        queue = self.make_queue()
+        await queue.start()
+        await self.wait_finished()
+
+        self.assertEqual(self.finished, {job.job_id: None})
+        self.assertEqual(os.listdir(queue.jobs_dir), [])
+
+    async def test_same_content_to_same_channel_is_delivered_once(self):
+        queue = self.make_queue()
+        await queue.start()
+        first = make_job()
+        await queue.submit(first)
+        await self.wait_finished()
+
+        self.done.clear()
+        self.expected = 3
+        again = make_job()
+        elsewhere = make_job(channel_id=9)
+        await queue.submit(again)
+        await queue.submit(elsewhere)
+        await self.wait_finished()
+
+        self.assertEqual(self.finished[again.job_id], f"Already submitted as {first.job_id}")
+        self.assertIsNone(self.finished[elsewhere.job_id])
+        self.assertEqual(queue.counters["duplicates"], 1)
+
+    async def test_concurrent_duplicates_only_deliver_once(self):
+        queue = self.make_queue()
+        self.expected = 2
+        jobs = [make_job(), make_job()]
+        for job in jobs:
+            await queue.submit(job)
+        await queue.start()
+        await self.wait_finished()
+
+        delivered = [job for job in jobs if self.finished[job.job_id] is None]
+        self.assertEqual(len(delivered), 1)
+        duplicate = next(job for job in jobs if job is not delivered[0])
+        self.assertEqual(self.finished[duplicate.job_id], f"Already submitted as {delivered[0].job_id}")
+        self.assertEqual(queue.counters["delivered"], 1)
+
+    async def test_delivered_content_is_remembered_across_restarts(self):
+        first_run = self.make_queue()
+        await first_run.start()
+        first = make_job()
+        await first_run.submit(first)
+        await self.wait_finished()
+        await first_run.close()
+
+        self.done.clear()
+        self.expected = 2
+        queue = self.make_queue()
+        await queue.start()
+        again = make_job()
+        await queue.submit(again)
+        await self.wait_finished()
+
+        self.assertEqual(self.finished[again.job_id], f"Already submitted as {first.job_id}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from classes.sync_schedule import RATE_WINDOW_SECONDS, SyncSchedule
+
+T0 = 1000.0  # monotonic time of the previous pass
+
+
+def make_schedule(**kwargs) -> SyncSchedule:
+    options = {"max_seconds": 240, "min_seconds": 30, "busy_events": 30, "busy_pending": 50}
+    options.update(kwargs)
+    schedule = SyncSchedule(**options)
+    schedule.last_pass = T0
+    return schedule
+
+
+class SyncScheduleTest(unittest.TestCase):
+    def test_idle_passes_back_off_to_the_max(self):
+        schedule = make_schedule()
+        now = T0
+        intervals = []
+        for _ in range(5):
+            now += schedule.interval
+            intervals.append(schedule.record_pass(changed=0, pending=0, now=now))
+
+        self.assertEqual(intervals, [60, 120, 240, 240, 240])
+        self.assertEqual(schedule.idle_passes, 5)
+        self.assertEqual(schedule.delay(now=now + 40), 200)
+
+    def test_some_activity_halves_the_interval(self):
+        schedule = make_schedule()
+        schedule.interval = 240
+        self.assertEqual(schedule.record_pass(changed=1, pending=0, now=T0 + 240), 120)
+        self.assertEqual(schedule.record_pass(changed=1, pending=0, now=T0 + 360), 60)
+        self.assertEqual(schedule.record_pass(changed=1, pending=0, now=T0 + 420), 30)
+        self.assertEqual(schedule.record_pass(changed=1, pending=0, now=T0 + 450), 30)
+
+    def test_busy_period_drops_straight_to_the_min(self):
+        schedule = make_schedule()
+        schedule.interval = 240
+        self.assertEqual(schedule.record_pass(changed=5, pending=50, now=T0 + 240), 30)
+
+        schedule.interval = 240
+        for _ in range(60):
+            schedule.note_event()
+        self.assertEqual(schedule.record_pass(changed=5, pending=0, now=T0 + 300), 30)
+
+    def test_events_after_a_pass_are_not_a_burst(self):
+        schedule = make_schedule()
+        schedule.interval = 240
+        schedule.note_event()
+
+        # One event a second after the pass is one event per minute, not sixty
+        self.assertEqual(schedule.event_rate(T0 + 1), 60 / RATE_WINDOW_SECONDS)
+        self.assertFalse(schedule.busy(pending=0, now=T0 + 1))
+
+        for _ in range(29):
+            schedule.note_event()
+        self.assertTrue(schedule.busy(pending=0, now=T0 + 1))
+
+    def test_rate_averages_over_longer_gaps(self):
+        schedule = make_schedule()
+        schedule.interval = 240
+        for _ in range(30):
+            schedule.note_event()
+        self.assertEqual(schedule.event_rate(T0 + 120), 15)
+        self.assertFalse(schedule.busy(pending=0, now=T0 + 120))
+
+    def test_busy_backlog_cuts_a_long_wait_short(self):
+        schedule = make_schedule()
+        schedule.interval = 240
+        self.assertTrue(schedule.busy(pending=50, now=T0 + 10))
+        self.assertFalse(schedule.busy(pending=49, now=T0 + 10))
+
+        schedule.interval = 30  # already as tight as it goes
+        self.assertFalse(schedule.busy(pending=500, now=T0 + 10))
+
+    def test_skipped_passes_are_counted(self):
+        schedule = make_schedule()
+        schedule.record_pass(changed=0, pending=0, now=T0 + 120)  # a fixed 30s interval would have run 4
+
+        self.assertEqual(schedule.stats()["passes_avoided"], 3)
+        self.assertEqual(schedule.stats()["passes"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import json
+import unittest
+from unittest import mock
+from classes import war_codec
+from classes.player import Player
+from classes.war import STATUS_ACCEPTED, War
+from classes.war_codec import _encode_war_direct, decode_war, encode_war
+
+
+def make_war() -> War:
+    war = War(
+        war_type="CT",
+        team_name='Team "Ωmega" \\ 東京\n',
+        start_time="2025-12-07T19:00:00+00:00",
+        last_updated="2025-12-07T17:39:39+00:00",
+        search_label="7PM",
+        ally_count=1,
+    )
+    war.add_player(Player("Bagger 1", "Bagger", user_id=123456789012345678))
+    war.add_player(Player("legacy", "Runner", ally=True))  # saved before user IDs were recorded
+    war.status = STATUS_ACCEPTED
+    war.opponent = None
+    return war
+
+
+class WarCodecTest(unittest.TestCase):
+    def test_direct_encoder_writes_the_to_dict_document(self):
+        war = make_war()
+        self.assertEqual(json.loads(_encode_war_direct(war)), war.to_dict())
+
+    def test_direct_encoder_is_compact(self):
+        self.assertNotIn(", ", _encode_war_direct(War(war_type="RT", team_name="a, b")).replace('"a, b"', ""))
+
+    def test_round_trip(self):
+        war = make_war()
+        for raw in (encode_war(war), _encode_war_direct(war)):
+            decoded = decode_war(raw)
+            self.assertEqual(decoded.to_dict(), war.to_dict())
+            self.assertEqual(decoded.lineup[0].user_id, 123456789012345678)
+
+    def test_stdlib_fallback_uses_the_direct_encoder(self):
+        war = make_war()
+        with mock.patch.object(war_codec, "orjson", None):
+            self.assertEqual(encode_war(war), _encode_war_direct(war))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import tempfile
+import time
+import unittest
+from classes.war_history import (
+    ACCEPTED,
+    CREATED,
+    EXPIRED,
+    JOINED,
+    LEFT,
+    SEGMENT_SUFFIX,
+    SNAPSHOT_FILE,
+    WarLog,
+    WarStats,
+)
+
+
+def created(team: str = "Alpha", *players) -> dict:
+    return {"kind": CREATED, "war_id": "w", "war_type": "RT", "team": team, "players": [list(p) for p in players]}
+
+
+class WarStatsTest(unittest.TestCase):
+    def test_lifecycle_totals(self):
+        stats = WarStats()
+        stats.apply(created("Alpha", ("1", "One")))
+        stats.apply({"kind": JOINED, "players": [["2", "Two"]]})
+        stats.apply({"kind": LEFT, "players": [["1", "One"]]})
+        stats.apply({"kind": ACCEPTED, "team": "Alpha", "opponent": "beta"})
+        stats.apply(created("alpha"))
+        stats.apply({"kind": EXPIRED, "team": "Alpha", "matched": False})
+        stats.apply({"kind": EXPIRED, "team": "Alpha", "matched": True})
+
+        self.assertEqual(stats.team(" ALPHA "), {"name": "Alpha", "posted": 2, "matched": 1, "unmatched": 1})
+        self.assertEqual(stats.team("Beta")["matched"], 1)
+        self.assertEqual(stats.player("1"), {"name": "One", "wars": 0})
+        self.assertEqual(stats.player("2"), {"name": "Two", "wars": 1})
+
+    def test_round_trips_through_a_dict(self):
+        stats = WarStats()
+        stats.apply(created("Alpha", ("1", "One")))
+        self.assertEqual(WarStats.from_dict(stats.to_dict()).to_dict(), stats.to_dict())
+
+
+class WarLogTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_log(self, **kwargs) -> WarLog:
+        log = WarLog(directory=self.tmp.name, **kwargs)
+        self.addAsyncCleanup(log.close)
+        return log
+
+    def segments(self):
+        return sorted(name for name in os.listdir(self.tmp.name) if name.endswith(SEGMENT_SUFFIX))
+
+    async def append_flushed(self, log: WarLog, record: dict):
+        log.append(record)
+        await log._flusher
+
+    async def crash(self, log: WarLog):
+        """Stops a log without its final snapshot, like a killed process."""
+        await log._flusher
+        log._closed = True
+        log._close_file()
+        log._executor.shutdown(wait=True)
+
+    async def test_records_survive_a_restart(self):
+        log = self.make_log()
+        self.assertEqual(await log.open(), 0)
+        for n in range(3):
+            log.append(created(f"Team {n}"))
+        await log.close()
+
+        reopened = self.make_log()
+        await reopened.open()
+        self.assertEqual(reopened.seq, 3)
+        self.assertEqual(reopened.stats.to_dict(), log.stats.to_dict())
+        self.assertEqual(reopened.append(created())["seq"], 4)
+
+    async def test_segments_roll_over_by_size(self):
+        log = self.make_log(segment_bytes=200)
+        await log.open()
+        for n in range(6):
+            await self.append_flushed(log, created(f"Team {n}", ("1", "One")))
+
+        segments = self.segments()
+        self.assertGreater(len(segments), 1)
+        self.assertEqual(segments[0], f"{1:012d}{SEGMENT_SUFFIX}")  # named after their first seq
+
+        # Each segment starts where the previous one ended
+        first_seqs = [int(name[: -len(SEGMENT_SUFFIX)]) for name in segments]
+        self.assertEqual(first_seqs, sorted(set(first_seqs)))
+        await self.crash(log)
+
+        reopened = self.make_log()
+        self.assertEqual(await reopened.open(), 6)  # no snapshot: every segment is replayed
+        self.assertEqual(reopened.stats.team("team 5")["posted"], 1)
+
+    async def test_restart_replays_only_records_after_the_snapshot(self):
+        log = self.make_log(segment_bytes=200, snapshot_every=4)
+        await log.open()
+        for n in range(4):
+            await self.append_flushed(log, created(f"Team {n}"))
+        await log._snapshotting
+        self.assertEqual(log.snapshot_seq, 4)
+        for n in range(4, 6):
+            await self.append_flushed(log, created(f"Team {n}"))
+
+        # The last two records are only in the segments
+        await self.crash(log)
+
+        reopened = self.make_log()
+        self.assertEqual(await reopened.open(), 2)
+        self.assertEqual(reopened.seq, 6)
+        self.assertEqual(reopened.stats.to_dict(), log.stats.to_dict())
+
+    async def test_torn_last_line_is_skipped(self):
+        log = self.make_log()
+        await log.open()
+        log.append(created("Alpha"))
+        await log.close()
+        with open(os.path.join(self.tmp.name, self.segments()[-1]), "ab") as f:
+            f.write(b'{"seq": 2, "kind": "crea')
+
+        reopened = self.make_log()
+        await reopened.open()
+        self.assertEqual(reopened.seq, 1)
+        await self.append_flushed(reopened, created("Beta"))
+        await reopened.close()
+
+        # Every open starts a new segment, so the torn line is never appended to
+        third = self.make_log()
+        await third.open()
+        self.assertEqual(third.seq, 2)
+        self.assertEqual(third.stats.team("beta")["posted"], 1)
+
+    async def test_compaction_drops_old_covered_segments(self):
+        log = self.make_log(segment_bytes=100, retention_days=1)
+        await log.open()
+        for n in range(4):
+            await self.append_flushed(log, created(f"Team {n}"))
+        old = time.time() - 2 * 86400
+        for name in self.segments():
+            os.utime(os.path.join(self.tmp.name, name), (old, old))
+
+        await log.snapshot()
+
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, SNAPSHOT_FILE)))
+        self.assertEqual(len(self.segments()), 1)  # only the segment still being written
+        await log.close()
+
+        reopened = self.make_log()
+        self.assertEqual(await reopened.open(), 0)
+        self.assertEqual(reopened.stats.to_dict(), log.stats.to_dict())
+
+    async def test_close_is_idempotent(self):
+        log = self.make_log()
+        await log.open()
+        log.append(created())
+        await log.close()
+        await log.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
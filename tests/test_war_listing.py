@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from classes.matchmaking import MAX_LINEUP
+from classes.player import Player
+from classes.war import STATUS_ACCEPTED, War
+from classes.war_events import WarEvent
+from classes.war_listing import WarListIndex
+
+BASE = datetime(2026, 1, 1, 18, tzinfo=timezone.utc)
+
+
+def make_war(hour: int, team: str = "Alpha", war_type: str = "RT", players: int = 0, **kwargs) -> War:
+    start = (BASE + timedelta(hours=hour)).isoformat()
+    war = War(war_type, team, start_time=start, last_updated=start, **kwargs)
+    for n in range(players):
+        war.add_player(Player(f"p{n}", "Runner", user_id=n + 1))
+    return war
+
+
+def at(hour: int) -> int:
+    return int((BASE + timedelta(hours=hour)).timestamp())
+
+
+def walk(index: WarListIndex, limit: int = 2, **filters):
+    """Every page of a query, as lists of team names."""
+    pages, cursor = [], None
+    while True:
+        page, cursor = index.query(after=cursor, limit=limit, **filters)
+        pages.append([war.team_name for war in page])
+        if cursor is None:
+            return pages
+
+
+class WarListIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = WarListIndex()
+        for hour, team in enumerate(["Alpha", "Bravo", "Charlie", "Delta", "Echo"]):
+            self.index.add(make_war(hour, team))
+
+    def test_pages_follow_start_order(self):
+        self.assertEqual(walk(self.index), [["Alpha", "Bravo"], ["Charlie", "Delta"], ["Echo"]])
+
+    def test_last_full_page_has_no_cursor(self):
+        page, cursor = self.index.query(limit=5)
+        self.assertEqual(len(page), 5)
+        self.assertIsNone(cursor)
+
+    def test_changes_between_pages_dont_shift_the_next_one(self):
+        page, cursor = self.index.query(limit=2)
+        self.assertEqual([w.team_name for w in page], ["Alpha", "Bravo"])
+
+        self.index.remove(page[0].war_id)
+        self.index.add(make_war(0, "Early bird"))  # sorts before the cursor
+        page, _ = self.index.query(after=cursor, limit=2)
+        self.assertEqual([w.team_name for w in page], ["Charlie", "Delta"])
+
+    def test_time_window(self):
+        self.assertEqual(
+            walk(self.index, start_after=at(1), start_before=at(4)),
+            [["Bravo", "Charlie"], ["Delta"]],
+        )
+
+    def test_type_and_open_slot_filters(self):
+        self.index.add(make_war(1, "Cobalt", war_type="CT"))
+        self.index.add(make_war(2, "Full", players=MAX_LINEUP))
+        self.index.add(make_war(3, "Almost", players=MAX_LINEUP - 1))
+
+        self.assertEqual(walk(self.index, war_type="ct"), [["Cobalt"]])
+        self.assertEqual(
+            set(walk(self.index, limit=10, min_open_slots=1)[0]),
+            {"Alpha", "Bravo", "Cobalt", "Charlie", "Almost", "Delta", "Echo"},
+        )
+        self.assertEqual(walk(self.index, limit=10, min_open_slots=2, start_after=at(3)), [["Delta", "Echo"]])
+
+    def test_team_prefix_pages_like_the_time_index(self):
+        for hour in range(6):
+            self.index.add(make_war(hour, f"Zulu {hour}"))
+
+        # Few matches: walked from the team index; lots: from the time index. Same pages either way
+        self.assertEqual(walk(self.index, team_prefix="zulu"), [["Zulu 0", "Zulu 1"], ["Zulu 2", "Zulu 3"], ["Zulu 4", "Zulu 5"]])
+        self.assertEqual(walk(self.index, team_prefix="CH"), [["Charlie"]])
+        self.assertEqual(walk(self.index, team_prefix="zulu", start_after=at(4)), [["Zulu 4", "Zulu 5"]])
+
+    def test_closed_and_deleted_wars_drop_out(self):
+        page, _ = self.index.query(limit=1)
+        accepted = make_war(0, "Alpha", war_id=page[0].war_id, status=STATUS_ACCEPTED)
+        self.index.add(accepted)
+        bravo = self.index.query(limit=1)[0][0]
+        self.index.apply_event(WarEvent(WarEvent.DELETED, bravo.war_id, "RT"))
+
+        self.assertEqual(walk(self.index, limit=10), [["Charlie", "Delta", "Echo"]])
+        self.assertEqual(len(self.index), 3)
+
+    def test_lineup_change_moves_between_slot_lists(self):
+        war = make_war(5, "Foxtrot")
+        self.index.add(war)
+        for n in range(MAX_LINEUP):
+            war.add_player(Player(f"p{n}", "Runner", user_id=n + 1))
+        self.index.apply_event(WarEvent(WarEvent.UPDATED, war.war_id, "RT", war.to_dict()))
+
+        self.assertEqual(self.index.get(war.war_id).open_slots, 0)
+        self.assertNotIn("Foxtrot", walk(self.index, limit=10, min_open_slots=1)[0])
+        self.assertIn("Foxtrot", walk(self.index, limit=10)[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,268 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from classes import war_store
+from classes.player import Player
+from classes.war import War
+from classes.war_events import WarEvent, WarEventBus
+from classes.war_store import WarStore
+
+
+def make_war(war_type: str = "RT", team_name: str = "Alpha", **kwargs) -> War:
+    war = War(war_type=war_type, team_name=team_name, **kwargs)
+    war.add_player(Player("p1", "Runner", user_id=1))
+    return war
+
+
+class FailingCommit:
+    """Wraps the store's connection so the next COMMIT fails like a full disk would."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.fail_next = True
+
+    def execute(self, sql, *args):
+        if sql == "COMMIT" and self.fail_next:
+            self.fail_next = False
+            raise sqlite3.OperationalError("database or disk is full")
+        return self.conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+class WarStoreTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.events = WarEventBus()
+        self.store = WarStore(path=os.path.join(self.tmp.name, "wars.sqlite3"), events=self.events)
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        self.tmp.cleanup()
+
+
+class CrudTest(WarStoreTestCase):
+    async def test_insert_get_update_delete(self):
+        war = make_war()
+        self.assertTrue(await self.store.insert(war))
+        self.assertFalse(await self.store.insert(war))  # same ID
+
+        stored = await self.store.get(war.war_id)
+        self.assertEqual(stored.to_dict(), war.to_dict())
+
+        war.team_name = "Renamed"
+        self.assertTrue(await self.store.update(war))
+        self.assertEqual((await self.store.get(war.war_id)).team_name, "Renamed")
+
+        self.assertTrue(await self.store.delete(war.war_id))
+        self.assertFalse(await self.store.delete(war.war_id))
+        self.assertIsNone(await self.store.get(war.war_id))
+        self.assertFalse(await self.store.update(war))
+
+    async def test_modify_is_skipped_when_mutate_declines(self):
+        war = make_war()
+        await self.store.insert(war)
+
+        def join(w: War) -> bool:
+            w.add_player(Player("p2", "Second", user_id=2))
+            return True
+
+        self.assertIsNone(await self.store.modify(war.war_id, lambda w: False))
+        self.assertIsNone(await self.store.modify("missing", join))
+        saved = await self.store.modify(war.war_id, join)
+
+        self.assertEqual(len(saved.lineup), 2)
+        self.assertEqual(len((await self.store.get(war.war_id)).lineup), 2)
+
+    async def test_listing_by_type_and_start_time(self):
+        early = make_war(start_time="2026-01-01T18:00:00+00:00", last_updated="2026-01-01T00:00:00+00:00")
+        late = make_war(start_time="2026-01-01T22:00:00+00:00", last_updated="2026-01-01T00:00:00+00:00")
+        ct = make_war(war_type="ct", start_time="2026-01-01T19:00:00+00:00", last_updated="2026-01-01T00:00:00+00:00")
+        for war in (late, ct, early):
+            await self.store.insert(war)
+
+        self.assertEqual([w.war_id for w in await self.store.list_by_type("rt")], [early.war_id, late.war_id])
+        window = await self.store.list_by_start_time("2026-01-01T18:00:00+00:00", "2026-01-01T22:00:00+00:00")
+        self.assertEqual([w.war_id for w in window], [early.war_id, ct.war_id])
+        rt_window = await self.store.list_by_start_time(
+            "2026-01-01T18:00:00+00:00", "2026-01-01T22:00:00+00:00", war_type="RT"
+        )
+        self.assertEqual([w.war_id for w in rt_window], [early.war_id])
+
+    async def test_committed_changes_are_published(self):
+        queue = self.events.subscribe()
+        war = make_war()
+        await self.store.insert(war)
+        await self.store.update(war, reason="joined")
+        await self.store.modify(war.war_id, lambda w: False)  # declined: nothing to publish
+        await self.store.delete(war.war_id, reason="cancelled")
+        await self.store.delete(war.war_id)  # already gone
+
+        events = [queue.get_nowait() for _ in range(queue.qsize())]
+        self.assertEqual(
+            [(e.kind, e.war_id, e.reason) for e in events],
+            [
+                (WarEvent.CREATED, war.war_id, None),
+                (WarEvent.UPDATED, war.war_id, "joined"),
+                (WarEvent.DELETED, war.war_id, "cancelled"),
+            ],
+        )
+        self.assertEqual(events[0].war["team_name"], "Alpha")
+        self.assertIsNone(events[2].war)
+
+    async def test_billboard_config_and_message_map(self):
+        self.assertIsNone(await self.store.set_billboard(1, "rt", 10))
+        self.assertEqual(await self.store.set_billboard(1, "RT", 11), 10)
+        await self.store.set_billboard(1, "CT", 12)
+        self.assertEqual(sorted(await self.store.list_billboards()), [(1, "CT", 12), (1, "RT", 11)])
+        self.assertEqual(await self.store.remove_billboard(1, "ct"), 12)
+
+        await self.store.set_message(11, "war-a", 100, "hash-a")
+        await self.store.set_message(11, "war-b", 101)
+        await self.store.delete_message(11, "war-b")
+        self.assertEqual(await self.store.list_messages(11), {"war-a": (100, "hash-a")})
+        await self.store.clear_messages(11)
+        self.assertEqual(await self.store.list_messages(11), {})
+
+
+class ChangesSinceTest(WarStoreTestCase):
+    async def test_revision_counts_writes_per_type(self):
+        self.assertEqual(await self.store.revision("RT"), 0)
+        war = make_war()
+        await self.store.insert(war)
+        await self.store.update(war)
+        await self.store.insert(make_war(war_type="CT"))
+
+        self.assertEqual(await self.store.revision("rt"), 2)
+        self.assertEqual(await self.store.revision("CT"), 1)
+
+    async def test_full_snapshot_without_a_revision(self):
+        first, second = make_war(team_name="First"), make_war(team_name="Second")
+        await self.store.insert(first)
+        await self.store.insert(second)
+        await self.store.delete(first.war_id)
+
+        changes = await self.store.changes_since("RT", None)
+        self.assertTrue(changes.full)
+        self.assertEqual(changes.revision, 3)
+        self.assertEqual([w.war_id for w in changes.wars], [second.war_id])
+        self.assertEqual(changes.removed, [])
+
+    async def test_incremental_changes_and_tombstones(self):
+        kept, dropped = make_war(team_name="Kept"), make_war(team_name="Dropped")
+        await self.store.insert(kept)
+        await self.store.insert(dropped)
+        since = await self.store.revision("RT")
+
+        unchanged = await self.store.changes_since("RT", since)
+        self.assertFalse(unchanged.full)
+        self.assertEqual((unchanged.wars, unchanged.removed), ([], []))
+
+        added = make_war(team_name="Added")
+        await self.store.insert(added)
+        await self.store.delete(dropped.war_id)
+
+        changes = await self.store.changes_since("RT", since)
+        self.assertFalse(changes.full)
+        self.assertEqual(changes.revision, since + 2)
+        self.assertEqual([w.war_id for w in changes.wars], [added.war_id])
+        self.assertEqual(changes.removed, [dropped.war_id])
+
+    async def test_war_moved_between_types_is_removed_from_the_old_one(self):
+        war = make_war()
+        await self.store.insert(war)
+        rt_since, ct_since = await self.store.revision("RT"), await self.store.revision("CT")
+
+        war.war_type = "CT"
+        await self.store.update(war)
+
+        self.assertEqual((await self.store.changes_since("RT", rt_since)).removed, [war.war_id])
+        self.assertEqual([w.war_id for w in (await self.store.changes_since("CT", ct_since)).wars], [war.war_id])
+
+    async def test_reinserted_war_loses_its_tombstone(self):
+        war = make_war()
+        await self.store.insert(war)
+        since = await self.store.revision("RT")
+        await self.store.delete(war.war_id)
+        await self.store.insert(war)
+
+        changes = await self.store.changes_since("RT", since)
+        self.assertEqual([w.war_id for w in changes.wars], [war.war_id])
+        self.assertEqual(changes.removed, [])
+
+    async def test_reader_behind_pruned_tombstones_gets_a_full_snapshot(self):
+        survivor = make_war(team_name="Survivor")
+        await self.store.insert(survivor)
+        since = await self.store.revision("RT")
+
+        with mock.patch.object(war_store, "TOMBSTONE_RETENTION", 2):
+            for n in range(4):
+                war = make_war(team_name=f"Short-lived {n}")
+                await self.store.insert(war)
+                await self.store.delete(war.war_id)
+
+        changes = await self.store.changes_since("RT", since)
+        self.assertTrue(changes.full)
+        self.assertEqual([w.war_id for w in changes.wars], [survivor.war_id])
+
+    async def test_revision_from_the_future_gets_a_full_snapshot(self):
+        await self.store.insert(make_war())
+        changes = await self.store.changes_since("RT", 99)
+        self.assertTrue(changes.full)
+        self.assertEqual(len(changes.wars), 1)
+
+
+class GroupCommitTest(WarStoreTestCase):
+    async def test_failing_write_only_undoes_itself(self):
+        doomed = make_war(team_name="Doomed")
+
+        def insert_then_fail():
+            with self.store._transaction() as conn:
+                self.store._insert_row(conn, doomed)
+                raise ValueError("boom")
+
+        first, second = make_war(team_name="First"), make_war(team_name="Second")
+        results = await asyncio.gather(
+            self.store.insert(first),
+            self.store._write(insert_then_fail),
+            self.store.insert(second),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(results[0], True)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(results[2], True)
+        self.assertIsNotNone(await self.store.get(first.war_id))
+        self.assertIsNotNone(await self.store.get(second.war_id))
+        self.assertIsNone(await self.store.get(doomed.war_id))
+
+    async def test_failed_commit_fails_the_batch_and_rolls_back(self):
+        await self.store.insert(make_war())  # opens the connection
+        self.store._conn = FailingCommit(self.store._conn)
+
+        lost = make_war(team_name="Lost")
+        with self.assertRaises(sqlite3.OperationalError):
+            await self.store.insert(lost)
+
+        # The connection isn't stuck inside the failed transaction: later writes still work
+        kept = make_war(team_name="Kept")
+        self.assertTrue(await self.store.insert(kept))
+        self.assertIsNone(await self.store.get(lost.war_id))
+        self.assertIsNotNone(await self.store.get(kept.war_id))
+
+    async def test_failed_commit_outside_a_batch_rolls_back(self):
+        await self.store.insert(make_war())
+        self.store._conn = FailingCommit(self.store._conn)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            await self.store._run(self.store._set_billboard, 1, "RT", 10)
+        self.assertFalse(self.store._conn.in_transaction)
+        self.assertIsNone(await self.store._run(self.store._set_billboard, 1, "RT", 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
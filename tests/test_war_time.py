@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from classes.war_time import ASAP, ET, SCHEDULED_GRACE, expires_at, parse_search_time, parse_time_filter
+
+
+def et(hour: int, minute: int = 0, day: int = 7) -> datetime:
+    return datetime(2025, 12, day, hour, minute, tzinfo=ET)
+
+
+class ParseSearchTimeTest(unittest.TestCase):
+    def test_later_hour_is_today(self):
+        start, label = parse_search_time("19", now=et(18, 40))
+        self.assertEqual(start, et(19))
+        self.assertEqual(label, "19")
+
+    def test_earlier_hour_is_tomorrow(self):
+        start, _ = parse_search_time("7PM", now=et(20, 5))
+        self.assertEqual(start, et(19, day=8))
+
+    def test_current_hour_within_grace_is_today(self):
+        now = et(18, 10)
+        start, label = parse_search_time("18", now=now)
+        self.assertEqual(start, et(18))
+        self.assertGreater(expires_at(start, label), now)
+
+    def test_current_hour_past_grace_rolls_over(self):
+        # 18:40 with a 30 minute grace: today's 18:00 war would expire at 18:30, before it's even posted
+        now = et(18) + SCHEDULED_GRACE + timedelta(minutes=10)
+        start, label = parse_search_time("18", now=now)
+        self.assertEqual(start, et(18, day=8))
+        self.assertGreater(expires_at(start, label), now)
+
+    def test_asap_is_now(self):
+        now = datetime(2025, 12, 7, 23, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_search_time(None, now=now), (now, ASAP))
+        self.assertEqual(parse_search_time("asap", now=now), (now, ASAP))
+
+    def test_invalid_time(self):
+        with self.assertRaises(ValueError):
+            parse_search_time("25", now=et(12))
+
+
+class ParseTimeFilterTest(unittest.TestCase):
+    def test_hour_earlier_tonight_stays_today(self):
+        # Unlike a search time, the filter doesn't roll over: tonight's 21:00 wars are still "after 19"
+        self.assertEqual(parse_time_filter("19", now=et(20, 5)), et(19))
+
+    def test_later_hour_is_today(self):
+        self.assertEqual(parse_time_filter("11PM", now=et(20, 5)), et(23))
+
+    def test_small_hours_are_tonight(self):
+        self.assertEqual(parse_time_filter("2", now=et(20, 5)), et(2, day=8))
+
+    def test_late_hour_just_after_midnight_is_yesterday(self):
+        self.assertEqual(parse_time_filter("23", now=et(0, 30, day=8)), et(23))
+
+    def test_asap_is_now(self):
+        now = datetime(2025, 12, 7, 23, 0, tzinfo=timezone.utc)
+        self.assertEqual(parse_time_filter("ASAP", now=now), now)
+
+    def test_invalid_time(self):
+        with self.assertRaises(ValueError):
+            parse_time_filter("7:30PM", now=et(12))
+
+
+if __name__ == "__main__":
+    unittest.main()